@@ -2,7 +2,7 @@ from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
-from pg_db import metadata
+from pg_db import metadata, SYNC_DATABASE_URL
 
 from alembic import context
 import os
@@ -61,11 +61,19 @@ def run_migrations_online() -> None:
     and associate a connection with the context.
 
     """
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        # pg_db.create_schema(): migrate on its connection, inside its transaction
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section, {}),
         prefix="sqlalchemy.",
         poolclass=pool.NullPool,
-        url=os.getenv("SYNC_DATABASE_URL") or None,
+        url=os.getenv("SYNC_DATABASE_URL") or SYNC_DATABASE_URL,   # Settings: SYNC_DATABASE_URL or derived from DATABASE_URL
     )
 
     with connectable.connect() as connection:
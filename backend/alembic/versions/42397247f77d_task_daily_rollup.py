@@ -0,0 +1,136 @@
+"""task daily rollup
+
+Revision ID: 42397247f77d
+Revises: 18639a434352
+Create Date: 2026-10-17 09:12:31.418260
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '42397247f77d'
+down_revision: Union[str, Sequence[str], None] = '18639a434352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+KEY = "project_id, employees_id, task_date"
+COUNTERS = [
+    "task_completed", "task_inprogress", "task_reworked",
+    "task_approved", "task_rejected", "task_reviewed", "hours_logged",
+]
+
+SUMS = ", ".join(f"SUM({c})" for c in COUNTERS)
+ADD_EXCLUDED = ",\n          ".join(f"{c} = r.{c} + EXCLUDED.{c}" for c in COUNTERS)
+SUBTRACT = ",\n          ".join(f"{c} = r.{c} - d.{c}" for c in COUNTERS)
+INSERT_COLS = f"{KEY}, {', '.join(COUNTERS)}, entry_count"
+POSITIVE = ", ".join(COUNTERS)
+NEGATIVE = ", ".join(f"-{c}" for c in COUNTERS)
+
+
+def upgrade():
+    # 1) Rollup table (pg_db.metadata.create_all may already have created it)
+    if not sa.inspect(op.get_bind()).has_table("task_daily_rollup"):
+        op.create_table(
+            "task_daily_rollup",
+            sa.Column("project_id", sa.Integer, primary_key=True),
+            sa.Column("employees_id", sa.String(36), primary_key=True),
+            sa.Column("task_date", sa.Date, primary_key=True),
+            *[sa.Column(c, sa.BigInteger, nullable=False, server_default="0") for c in COUNTERS[:-1]],
+            sa.Column("hours_logged", sa.Numeric(12, 2), nullable=False, server_default="0.00"),
+            sa.Column("entry_count", sa.Integer, nullable=False, server_default="0"),
+        )
+
+    # 2) Statement-level trigger function; transition tables keep bulk writes to one upsert per statement
+    op.execute(f"""
+    CREATE OR REPLACE FUNCTION apply_task_daily_rollup()
+    RETURNS TRIGGER AS $$
+    BEGIN
+      IF TG_OP = 'INSERT' THEN
+        INSERT INTO task_daily_rollup AS r ({INSERT_COLS})
+        SELECT {KEY}, {SUMS}, COUNT(*)
+        FROM new_rows
+        GROUP BY {KEY}
+        ON CONFLICT ({KEY}) DO UPDATE SET
+          {ADD_EXCLUDED},
+          entry_count = r.entry_count + EXCLUDED.entry_count;
+      ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO task_daily_rollup AS r ({INSERT_COLS})
+        SELECT {KEY}, {SUMS}, SUM(n)
+        FROM (
+          SELECT {KEY}, {POSITIVE}, 1 AS n FROM new_rows
+          UNION ALL
+          SELECT {KEY}, {NEGATIVE}, -1 AS n FROM old_rows
+        ) d
+        GROUP BY {KEY}
+        ON CONFLICT ({KEY}) DO UPDATE SET
+          {ADD_EXCLUDED},
+          entry_count = r.entry_count + EXCLUDED.entry_count;
+      ELSE
+        UPDATE task_daily_rollup AS r SET
+          {SUBTRACT},
+          entry_count = r.entry_count - d.entry_count
+        FROM (
+          SELECT {KEY}, {', '.join(f'SUM({c}) AS {c}' for c in COUNTERS)}, COUNT(*) AS entry_count
+          FROM old_rows
+          GROUP BY {KEY}
+        ) d
+        WHERE r.project_id = d.project_id
+          AND r.employees_id = d.employees_id
+          AND r.task_date = d.task_date;
+      END IF;
+
+      IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        DELETE FROM task_daily_rollup AS r
+        USING (SELECT DISTINCT {KEY} FROM old_rows) o
+        WHERE r.project_id = o.project_id
+          AND r.employees_id = o.employees_id
+          AND r.task_date = o.task_date
+          AND r.entry_count <= 0;
+      END IF;
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+
+    # 3) One trigger per event (each can only declare the transition tables it has)
+    op.execute("DROP TRIGGER IF EXISTS trg_task_monitors_rollup_ins ON task_monitors;")
+    op.execute("""
+    CREATE TRIGGER trg_task_monitors_rollup_ins
+    AFTER INSERT ON task_monitors
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_task_daily_rollup();
+    """)
+    op.execute("DROP TRIGGER IF EXISTS trg_task_monitors_rollup_upd ON task_monitors;")
+    op.execute("""
+    CREATE TRIGGER trg_task_monitors_rollup_upd
+    AFTER UPDATE ON task_monitors
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_task_daily_rollup();
+    """)
+    op.execute("DROP TRIGGER IF EXISTS trg_task_monitors_rollup_del ON task_monitors;")
+    op.execute("""
+    CREATE TRIGGER trg_task_monitors_rollup_del
+    AFTER DELETE ON task_monitors
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION apply_task_daily_rollup();
+    """)
+
+    # 4) Backfill from existing rows
+    op.execute("TRUNCATE task_daily_rollup;")
+    op.execute(f"""
+    INSERT INTO task_daily_rollup ({INSERT_COLS})
+    SELECT {KEY}, {SUMS}, COUNT(*)
+    FROM task_monitors
+    GROUP BY {KEY};
+    """)
+
+
+def downgrade():
+    for suffix in ("ins", "upd", "del"):
+        op.execute(f"DROP TRIGGER IF EXISTS trg_task_monitors_rollup_{suffix} ON task_monitors;")
+    op.execute("DROP FUNCTION IF EXISTS apply_task_daily_rollup();")
+    op.drop_table("task_daily_rollup")
@@ -0,0 +1,68 @@
+"""hot path indexes
+
+Revision ID: 5c1e8a7d2b94
+Revises: 42397247f77d
+Create Date: 2026-10-17 10:04:55.102733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8a7d2b94'
+down_revision: Union[str, Sequence[str], None] = '42397247f77d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns) -- columns are raw SQL so DESC ordering matches the ORDER BYs
+INDEXES = [
+    # _task_exists: equality on all three columns
+    ("ix_task_monitors_emp_proj_date", "task_monitors", "employees_id, project_id, task_date"),
+    # find_all_task / export: ORDER BY task_date DESC, task_id DESC (+ keyset cursor), optional filters
+    ("ix_task_monitors_date_id", "task_monitors", "task_date DESC, task_id DESC"),
+    ("ix_task_monitors_emp_date_id", "task_monitors", "employees_id, task_date DESC, task_id DESC"),
+    ("ix_task_monitors_proj_date_id", "task_monitors", "project_id, task_date DESC, task_id DESC"),
+    # get_projects_for_trainer, employee-side staffing joins (project side is covered by the unique index)
+    ("ix_project_staffing_employees_id", "project_staffing", "employees_id"),
+    # find_all_employees: roles join and ORDER BY created_at DESC
+    ("ix_employees_role", "employees", "role"),
+    ("ix_employees_created_at", "employees", "created_at DESC"),
+    # dashboard / time series: date window scans, per-employee series
+    ("ix_task_daily_rollup_task_date", "task_daily_rollup", "task_date"),
+    ("ix_task_daily_rollup_emp_date", "task_daily_rollup", "employees_id, task_date"),
+]
+
+
+def upgrade():
+    # 1) Collapse duplicate staffing pairs (keep the oldest row) so the unique index can be built
+    op.execute("""
+    DELETE FROM project_staffing ps
+    USING project_staffing keep
+    WHERE ps.project_id = keep.project_id
+      AND ps.employees_id = keep.employees_id
+      AND ps.id > keep.id;
+    """)
+    op.create_index(
+        "uq_project_staffing_project_employee",
+        "project_staffing",
+        ["project_id", "employees_id"],
+        unique=True,
+        if_not_exists=True,
+    )
+
+    # 2) Secondary indexes for the lookup paths
+    for name, table, columns in INDEXES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns});")
+
+    # 3) Fresh statistics so the planner picks the new indexes right away
+    for table in sorted({t for _, t, _ in INDEXES}):
+        op.execute(f"ANALYZE {table};")
+
+
+def downgrade():
+    for name, _, _ in reversed(INDEXES):
+        op.execute(f"DROP INDEX IF EXISTS {name};")
+    op.drop_index("uq_project_staffing_project_employee", table_name="project_staffing", if_exists=True)
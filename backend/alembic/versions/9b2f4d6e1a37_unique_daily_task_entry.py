@@ -0,0 +1,55 @@
+"""unique daily task entry
+
+Revision ID: 9b2f4d6e1a37
+Revises: 5c1e8a7d2b94
+Create Date: 2026-10-17 11:26:08.734519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2f4d6e1a37'
+down_revision: Union[str, Sequence[str], None] = '5c1e8a7d2b94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CONSTRAINT = "uq_task_monitors_emp_proj_date"
+
+
+def upgrade():
+    # 1) Keep one entry per (employee, project, day): the most recently updated, then the newest id.
+    #    The rollup DELETE trigger subtracts the removed rows from task_daily_rollup.
+    op.execute("""
+    DELETE FROM task_monitors tm
+    USING (
+      SELECT task_id,
+             ROW_NUMBER() OVER (
+               PARTITION BY employees_id, project_id, task_date
+               ORDER BY updated_at DESC, task_id DESC
+             ) AS rn
+      FROM task_monitors
+    ) ranked
+    WHERE tm.task_id = ranked.task_id
+      AND ranked.rn > 1;
+    """)
+
+    # 2) Unique key for ON CONFLICT; its index replaces the plain lookup index from 5c1e8a7d2b94.
+    #    A database bootstrapped by create_schema() already has it (pg_db declares it)
+    exists = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_constraint WHERE conname = :name"), {"name": CONSTRAINT}
+    ).scalar()
+    if not exists:
+        op.create_unique_constraint(CONSTRAINT, "task_monitors", ["employees_id", "project_id", "task_date"])
+    op.drop_index("ix_task_monitors_emp_proj_date", table_name="task_monitors", if_exists=True)
+
+
+def downgrade():
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_task_monitors_emp_proj_date "
+        "ON task_monitors (employees_id, project_id, task_date);"
+    )
+    op.drop_constraint(CONSTRAINT, "task_monitors", type_="unique")
@@ -0,0 +1,33 @@
+"""drop updated_at indexes
+
+Revision ID: a8d3f61c2e5b
+Revises: f2b6d8a4c913
+Create Date: 2026-10-18 14:07:52.318640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d3f61c2e5b'
+down_revision: Union[str, Sequence[str], None] = 'f2b6d8a4c913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ix_<table>_updated_at (c4d7e2a9f015) served the max(updated_at) / count(*) table versions that
+# table_change_log replaced; nothing reads them, and since every update moves updated_at they
+# cost an index write per update and rule out HOT updates
+TABLES = ["employees", "roles", "projects", "project_staffing", "task_monitors"]
+
+
+def upgrade():
+    for table in TABLES:
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_updated_at;")
+
+
+def downgrade():
+    for table in TABLES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_updated_at ON {table} (updated_at);")
@@ -0,0 +1,34 @@
+"""updated_at indexes
+
+Revision ID: c4d7e2a9f015
+Revises: 9b2f4d6e1a37
+Create Date: 2026-10-17 16:42:18.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7e2a9f015'
+down_revision: Union[str, Sequence[str], None] = '9b2f4d6e1a37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# conditional.TableVersions: max(updated_at) reads the index's last entry, count(*) scans
+# this (narrow) index only
+TABLES = ["employees", "roles", "projects", "project_staffing", "task_monitors"]
+
+
+def upgrade():
+    for table in TABLES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS ix_{table}_updated_at ON {table} (updated_at);")
+    for table in TABLES:
+        op.execute(f"ANALYZE {table};")
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        op.execute(f"DROP INDEX IF EXISTS ix_{table}_updated_at;")
@@ -0,0 +1,36 @@
+"""revoked tokens
+
+Revision ID: d81f3b6c2a40
+Revises: c4d7e2a9f015
+Create Date: 2026-10-17 20:14:37.206481
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f3b6c2a40'
+down_revision: Union[str, Sequence[str], None] = 'c4d7e2a9f015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade():
+    # Logged-out session tokens (auth.TokenAuthority); rows are useless once expires_at passes
+    op.create_table(
+        "revoked_tokens",
+        sa.Column("jti", sa.String(32), primary_key=True),
+        sa.Column("user_id", sa.String(36), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("revoked_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        if_not_exists=True,
+    )
+    op.create_index("ix_revoked_tokens_expires_at", "revoked_tokens", ["expires_at"], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_revoked_tokens_expires_at", table_name="revoked_tokens", if_exists=True)
+    op.drop_table("revoked_tokens", if_exists=True)
@@ -0,0 +1,38 @@
+"""employee trigram search
+
+Revision ID: e5a9c1f3b782
+Revises: d81f3b6c2a40
+Create Date: 2026-10-17 19:12:40.284613
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c1f3b782'
+down_revision: Union[str, Sequence[str], None] = 'd81f3b6c2a40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# find_all_employees (ILIKE '%q%') and /api/employees/search (word-similarity <% and ranking):
+# one GIN trigram index per searched column, combined by a BitmapOr
+COLUMNS = ["first_name", "last_name", "email"]
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    for column in COLUMNS:
+        op.execute(
+            f"CREATE INDEX IF NOT EXISTS ix_employees_{column}_trgm "
+            f"ON employees USING gin ({column} gin_trgm_ops);"
+        )
+    op.execute("ANALYZE employees;")
+
+
+def downgrade():
+    for column in reversed(COLUMNS):
+        op.execute(f"DROP INDEX IF EXISTS ix_employees_{column}_trgm;")
+    # the extension is left installed: other objects may depend on it
@@ -0,0 +1,127 @@
+"""table change log
+
+Revision ID: f2b6d8a4c913
+Revises: e5a9c1f3b782
+Create Date: 2026-10-18 09:41:27.906154
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b6d8a4c913'
+down_revision: Union[str, Sequence[str], None] = 'e5a9c1f3b782'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# conditional.TableVersions: every statement that changes rows of these tables appends a row to
+# table_change_log in the writer's transaction, so a table's version (max id, sum of changes)
+# moves exactly when its data becomes visible. Appends take no shared row lock, so writers to
+# one table never wait on each other; statements that touch no rows append nothing.
+# prune_table_change_log() folds each table's older rows into its newest one without changing
+# the version (run periodically by conditional.run_change_log_pruner)
+TABLES = ["employees", "roles", "projects", "project_staffing", "task_monitors"]
+
+# trigger suffix -> (events, REFERENCING clause, function); transition tables need one event per trigger
+TRIGGERS = {
+    "ins": ("INSERT", "REFERENCING NEW TABLE AS new_rows", "log_table_change_new"),
+    "upd": ("UPDATE", "REFERENCING NEW TABLE AS new_rows", "log_table_change_new"),
+    "del": ("DELETE", "REFERENCING OLD TABLE AS old_rows", "log_table_change_old"),
+    "trunc": ("TRUNCATE", "", "log_table_change"),
+}
+
+PRUNE_LOCK_KEY = 7240002    # pg_try_advisory_xact_lock key: one pruner at a time across workers
+
+
+def upgrade():
+    op.create_table(
+        "table_change_log",
+        sa.Column("id", sa.BigInteger, sa.Identity(), primary_key=True),
+        sa.Column("table_name", sa.String(63), nullable=False),
+        sa.Column("changes", sa.BigInteger, nullable=False, server_default="1"),
+        sa.Column("changed_at", sa.DateTime(timezone=True), nullable=True, server_default=sa.func.clock_timestamp()),
+        if_not_exists=True,
+    )
+    op.create_index("ix_table_change_log_table_id", "table_change_log", ["table_name", "id"], if_not_exists=True)
+    # a starting row per table (0 changes) so Last-Modified reflects existing data
+    for table in TABLES:
+        op.execute(f"""
+        INSERT INTO table_change_log (table_name, changes, changed_at)
+        SELECT '{table}', 0, (SELECT MAX(updated_at) FROM {table})
+        WHERE NOT EXISTS (SELECT 1 FROM table_change_log WHERE table_name = '{table}');
+        """)
+
+    for function, transition in (("log_table_change_new", "new_rows"), ("log_table_change_old", "old_rows")):
+        op.execute(f"""
+        CREATE OR REPLACE FUNCTION {function}()
+        RETURNS TRIGGER AS $$
+        BEGIN
+          IF EXISTS (SELECT 1 FROM {transition}) THEN
+            INSERT INTO table_change_log (table_name, changed_at) VALUES (TG_TABLE_NAME, clock_timestamp());
+          END IF;
+          RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """)
+    op.execute("""
+    CREATE OR REPLACE FUNCTION log_table_change()
+    RETURNS TRIGGER AS $$
+    BEGIN
+      INSERT INTO table_change_log (table_name, changed_at) VALUES (TG_TABLE_NAME, clock_timestamp());
+      RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+
+    op.execute(f"""
+    CREATE OR REPLACE FUNCTION prune_table_change_log()
+    RETURNS BIGINT AS $$
+    DECLARE
+      pruned BIGINT;
+    BEGIN
+      IF NOT pg_try_advisory_xact_lock({PRUNE_LOCK_KEY}) THEN
+        RETURN 0;
+      END IF;
+      -- rows are never updated by writers, so folding into the newest row blocks nobody;
+      -- max(id) and sum(changes) per table come out the same
+      WITH newest AS (
+        SELECT table_name, MAX(id) AS id FROM table_change_log GROUP BY table_name
+      ), gone AS (
+        DELETE FROM table_change_log c USING newest n
+        WHERE c.table_name = n.table_name AND c.id < n.id
+        RETURNING c.table_name, c.changes
+      ), folded AS (
+        SELECT table_name, SUM(changes) AS changes, COUNT(*) AS n FROM gone GROUP BY table_name
+      ), kept AS (
+        UPDATE table_change_log c SET changes = c.changes + f.changes
+        FROM folded f JOIN newest n USING (table_name)
+        WHERE c.id = n.id
+      )
+      SELECT COALESCE(SUM(n), 0) INTO pruned FROM folded;
+      RETURN pruned;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+
+    for table in TABLES:
+        for suffix, (event, referencing, function) in TRIGGERS.items():
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_change_log_{suffix} ON {table};")
+            op.execute(f"""
+            CREATE TRIGGER trg_{table}_change_log_{suffix}
+            AFTER {event} ON {table}
+            {referencing}
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}();
+            """)
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        for suffix in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_change_log_{suffix} ON {table};")
+    for function in ("prune_table_change_log", "log_table_change", "log_table_change_old", "log_table_change_new"):
+        op.execute(f"DROP FUNCTION IF EXISTS {function}();")
+    op.drop_index("ix_table_change_log_table_id", table_name="table_change_log", if_exists=True)
+    op.drop_table("table_change_log", if_exists=True)
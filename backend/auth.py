@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, NamedTuple, Optional, Set, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from config import settings
+from pg_db import database, revoked_tokens, users
+
+logger = logging.getLogger(__name__)
+
+TOKEN_VERSION = "v1"
+
+INTERNAL_TOKEN_HEADER = "X-Internal-Token"
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+# reachable without a token even when AUTH_REQUIRED is on
+PUBLIC_ENDPOINTS = {
+    ("POST", "/api/users/login"),
+    ("POST", "/api/users"),                   # sign up
+}
+
+
+class TokenClaims(NamedTuple):
+    sub: str                                  # users.id
+    jti: str                                  # token id, what logout revokes
+    iat: int
+    exp: int
+
+
+class TokenError(Exception):
+    """The token is malformed, forged, expired or revoked; str(exc) is the reason."""
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class TokenAuthority:
+    """
+    Stateless session tokens: "v1.<payload>.<signature>", where the payload is base64url
+    JSON claims and the signature is HMAC-SHA256 over "v1.<payload>" with AUTH_SECRET.
+
+    verify() keeps an LRU of tokens that passed the signature check, so a repeat caller
+    costs a dict lookup plus the expiry / revocation checks. Revocations (logout) and
+    deactivated users are held in memory and reloaded every AUTH_REVOCATION_REFRESH_SECONDS;
+    a logout applies at once on the worker that handled it, and on the others after their
+    next reload.
+    """
+
+    def __init__(self, secret: bytes, ttl: int, cache_size: int):
+        self._secret = secret
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, TokenClaims]" = OrderedDict()
+        self.revoked: Set[str] = set()
+        self._revoked_here: Dict[str, int] = {}  # jti -> exp; survives a reload that raced the INSERT
+        self.disabled_users: Set[str] = set()
+        self.refreshed_at: Optional[float] = None
+        self.hits = 0
+        self.misses = 0
+        self.rejected: Dict[str, int] = {}
+
+    # ───────────────────────── tokens ─────────────────────────
+
+    def _sign(self, signing_input: str) -> str:
+        return _b64encode(hmac.new(self._secret, signing_input.encode(), hashlib.sha256).digest())
+
+    def issue(self, user_id: str) -> Tuple[str, TokenClaims]:
+        now = int(time.time())
+        claims = TokenClaims(sub=user_id, jti=secrets.token_hex(16), iat=now, exp=now + self.ttl)
+        payload = _b64encode(json.dumps(claims._asdict(), separators=(",", ":")).encode())
+        signing_input = f"{TOKEN_VERSION}.{payload}"
+        return f"{signing_input}.{self._sign(signing_input)}", claims
+
+    def _reject(self, reason: str) -> TokenError:
+        self.rejected[reason] = self.rejected.get(reason, 0) + 1
+        return TokenError(reason)
+
+    def verify(self, token: str) -> TokenClaims:
+        claims = self._cache.get(token)
+        if claims is not None:
+            self.hits += 1
+            self._cache.move_to_end(token)
+        else:
+            self.misses += 1
+            claims = self._decode(token)
+            self._cache[token] = claims
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        if claims.exp <= time.time():
+            self._cache.pop(token, None)
+            raise self._reject("expired")
+        if claims.jti in self.revoked:
+            raise self._reject("revoked")
+        if claims.sub in self.disabled_users:
+            raise self._reject("user inactive")
+        return claims
+
+    def _decode(self, token: str) -> TokenClaims:
+        version, _, rest = token.partition(".")
+        payload, _, signature = rest.partition(".")
+        if version != TOKEN_VERSION or not payload or not signature:
+            raise self._reject("malformed")
+        if not hmac.compare_digest(signature, self._sign(f"{version}.{payload}")):
+            raise self._reject("bad signature")
+        try:
+            return TokenClaims(**json.loads(_b64decode(payload)))
+        except (ValueError, TypeError):
+            raise self._reject("malformed")
+
+    # ───────────────────────── revocation ─────────────────────────
+
+    async def revoke(self, claims: TokenClaims) -> None:
+        self.revoked.add(claims.jti)
+        self._revoked_here[claims.jti] = claims.exp
+        expires_at = datetime.fromtimestamp(claims.exp, tz=timezone.utc)
+        async with database.transaction():
+            # a repeat logout (same token, any worker) finds the row already there
+            await database.execute(
+                pg_insert(revoked_tokens)
+                .values(jti=claims.jti, user_id=claims.sub, expires_at=expires_at)
+                .on_conflict_do_nothing(index_elements=[revoked_tokens.c.jti])
+            )
+            # housekeeping: rows past their token's expiry can never match again
+            await database.execute(revoked_tokens.delete().where(revoked_tokens.c.expires_at < datetime.now(timezone.utc)))
+
+    async def refresh(self) -> None:
+        now = datetime.now(timezone.utc)
+        revoked = await database.fetch_all(select(revoked_tokens.c.jti).where(revoked_tokens.c.expires_at > now))
+        disabled = await database.fetch_all(select(users.c.id).where(users.c.status == "0"))
+        now_ts = time.time()
+        self._revoked_here = {jti: exp for jti, exp in self._revoked_here.items() if exp > now_ts}
+        self.revoked = {row["jti"] for row in revoked} | set(self._revoked_here)
+        self.disabled_users = {row["id"] for row in disabled}
+        self.refreshed_at = time.monotonic()
+
+    async def run_refresher(self, interval: float) -> None:
+        """Reload the revocation list every `interval` seconds until cancelled."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Token revocation refresh failed; keeping the previous list")
+            await asyncio.sleep(interval)
+
+    # ───────────────────────── metrics ─────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "required": settings.AUTH_REQUIRED,
+            "token_ttl_seconds": self.ttl,
+            "cache_entries": len(self._cache),
+            "cache_size": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejected": dict(self.rejected),
+            "revoked_tokens": len(self.revoked),
+            "disabled_users": len(self.disabled_users),
+            "refreshed_seconds_ago": round(time.monotonic() - self.refreshed_at, 1) if self.refreshed_at else None,
+        }
+
+
+def _secret() -> bytes:
+    if settings.AUTH_SECRET:
+        return settings.AUTH_SECRET.encode()
+    # per-process secret: tokens die with the process and are not shared by separate
+    # uvicorn processes (workers forked by `python -m serve` do share it)
+    logger.warning("AUTH_SECRET is not set; using a random per-process signing key")
+    return secrets.token_bytes(32)
+
+
+token_authority = TokenAuthority(_secret(), settings.AUTH_TOKEN_TTL_SECONDS, settings.AUTH_TOKEN_CACHE_SIZE)
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def _unauthorized(detail: str, error: Optional[str] = None) -> HTTPException:
+    challenge = f'Bearer error="{error}"' if error else "Bearer"
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail,
+                         headers={"WWW-Authenticate": challenge})
+
+
+async def current_user(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> TokenClaims:
+    """Claims of the caller's bearer token (also on request.state.user); 401 without a valid one."""
+    if credentials is None:
+        raise _unauthorized("Not authenticated")
+    try:
+        claims = token_authority.verify(credentials.credentials)
+    except TokenError as exc:
+        raise _unauthorized(f"Invalid token: {exc}", error="invalid_token")
+    request.state.user = claims
+    return claims
+
+
+async def require_auth(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> None:
+    """Router-wide guard: enforces current_user when AUTH_REQUIRED is on, except PUBLIC_ENDPOINTS."""
+    if not settings.AUTH_REQUIRED or (request.method, request.url.path) in PUBLIC_ENDPOINTS:
+        return
+    await current_user(request, credentials)
+
+
+async def require_internal(request: Request) -> None:
+    """Guard for /internal/*: the INTERNAL_TOKEN header when one is configured, else loopback callers only."""
+    if settings.INTERNAL_TOKEN:
+        supplied = request.headers.get(INTERNAL_TOKEN_HEADER, "")
+        if hmac.compare_digest(supplied.encode(), settings.INTERNAL_TOKEN.encode()):
+            return
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Missing or wrong {INTERNAL_TOKEN_HEADER}")
+    host = request.client.host if request.client else None
+    if host not in LOOPBACK_HOSTS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Internal endpoints are loopback-only; set INTERNAL_TOKEN to reach them remotely",
+        )
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import functools
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from config import settings
+
+
+class TTLCache:
+    """
+    In-process read cache with per-entry TTL and LRU eviction.
+
+    Keys are namespaced (one namespace per cached route); writes call
+    `invalidate(namespace, ...)` to drop every entry of the routes they affect.
+    Each namespace carries a generation number so a read that started before an
+    invalidation cannot store its (now stale) result afterwards.
+    Entries are per worker process: other workers converge within the TTL.
+    """
+
+    def __init__(self, max_entries: int = 512, default_ttl: float = 30.0, enabled: bool = True):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+        self._evictions = 0
+        self._invalidations = 0
+
+    # ───────────────────────── core ─────────────────────────
+
+    def get(self, namespace: str, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._entries.get((namespace, key))
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end((namespace, key))
+                self._hits[namespace] += 1
+                return True, value
+            del self._entries[(namespace, key)]
+        self._misses[namespace] += 1
+        return False, None
+
+    def set(self, namespace: str, key: Hashable, value: Any, ttl: Optional[float] = None,
+            generation: Optional[int] = None) -> None:
+        if generation is not None and generation != self._generations[namespace]:
+            return  # invalidated while the value was being computed
+        self._entries[(namespace, key)] = (time.monotonic() + (ttl or self.default_ttl), value)
+        self._entries.move_to_end((namespace, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, *namespaces: str) -> None:
+        for ns in namespaces:
+            self._generations[ns] += 1
+        stale = [k for k in self._entries if k[0] in namespaces]
+        for k in stale:
+            del self._entries[k]
+        self._invalidations += 1
+
+    def generation(self, namespace: str) -> int:
+        """Bumped by every invalidate() of `namespace`; lets callers notice local writes."""
+        return self._generations[namespace]
+
+    def clear(self) -> None:
+        for ns in list(self._generations):
+            self._generations[ns] += 1
+        self._entries.clear()
+
+    # ───────────────────────── decorator ─────────────────────────
+
+    def cached(self, namespace: str, ttl: Optional[float] = None) -> Callable:
+        """Cache an async read method; the key is its (hashable) arguments."""
+        def decorator(fn: Callable) -> Callable:
+            @functools.wraps(fn)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return await fn(*args, **kwargs)
+                key = (args, tuple(sorted(kwargs.items())))
+                hit, value = self.get(namespace, key)
+                if hit:
+                    return value
+                generation = self._generations[namespace]
+                value = await fn(*args, **kwargs)
+                self.set(namespace, key, value, ttl=ttl, generation=generation)
+                return value
+            return wrapper
+        return decorator
+
+    # ───────────────────────── metrics ─────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        namespaces = sorted(set(self._hits) | set(self._misses))
+        hits, misses = sum(self._hits.values()), sum(self._misses.values())
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "default_ttl_seconds": self.default_ttl,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else None,
+            "evictions": self._evictions,
+            "invalidations": self._invalidations,
+            "namespaces": {
+                ns: {"hits": self._hits[ns], "misses": self._misses[ns]} for ns in namespaces
+            },
+        }
+
+
+response_cache = TTLCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    default_ttl=settings.CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED,
+)
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import any_, bindparam, func, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.types import BigInteger, String
+
+from cache import TTLCache, response_cache
+from config import settings
+from errors import NotModified
+from pg_db import database, employees, project_staffing, projects, read_database, roles, table_change_log, task_monitors
+
+logger = logging.getLogger(__name__)
+
+# (changed_at, last id, changes) from table_change_log: statement triggers append a row inside
+# every transaction that changes the table, so the version becomes visible exactly when the
+# data does. Both numbers are needed: a transaction holding a lower id can commit after one
+# with a higher id, and pruning folds rows together without changing either
+Version = Tuple[Optional[datetime], int, int]
+
+TABLES = {t.name: t for t in (employees, roles, projects, project_staffing, task_monitors)}
+
+# response_cache namespaces built from each table (mirrors the invalidate() calls in curd/)
+TABLE_CACHE_NAMESPACES = {
+    "employees": ("employees", "employee_names", "projects", "dashboard"),
+    "roles": ("employees", "employee_names"),
+    "projects": ("projects", "dashboard"),
+    "project_staffing": ("projects", "dashboard"),
+    "task_monitors": ("dashboard",),
+}
+
+
+class TableVersions:
+    """
+    Per-table versions for conditional GETs, memoized per worker for `ttl` seconds.
+
+    One round trip aggregates every missing table's rows of table_change_log (kept short by
+    the pruner, indexed on (table_name, id)). A local write (any
+    response_cache.invalidate() of the table's namespaces) drops the memo at once; writes on
+    other workers are seen within `ttl`. Seeing a table change also invalidates its
+    response_cache namespaces here, so a cached body is never older than the ETag sent with it.
+    """
+
+    def __init__(self, db, cache: TTLCache, ttl: float = 1.0):
+        self.db = db
+        self.cache = cache
+        self.ttl = ttl
+        self._memo: Dict[str, Tuple[float, Tuple[int, ...], Version]] = {}
+        self._lock = asyncio.Lock()
+        self.refreshes = 0
+        self.changes_seen = 0
+
+    def _generations(self, name: str) -> Tuple[int, ...]:
+        return tuple(self.cache.generation(ns) for ns in TABLE_CACHE_NAMESPACES[name])
+
+    def _fresh(self, name: str, now: float) -> bool:
+        entry = self._memo.get(name)
+        return entry is not None and now - entry[0] < self.ttl and entry[1] == self._generations(name)
+
+    @staticmethod
+    def _query(names: Iterable[str]):
+        log = table_change_log
+        return (
+            select(
+                log.c.table_name,
+                func.max(log.c.changed_at).label("changed_at"),
+                func.max(log.c.id).label("last_id"),
+                func.sum(log.c.changes).cast(BigInteger).label("changes"),
+            )
+            .where(log.c.table_name == any_(bindparam("names", list(names), type_=ARRAY(String))))
+            .group_by(log.c.table_name)
+        )
+
+    async def get(self, names: Iterable[str]) -> Dict[str, Version]:
+        names = tuple(names)
+        if any(not self._fresh(name, time.monotonic()) for name in names):
+            async with self._lock:                  # one refresh at a time; waiters reuse its result
+                stale = [name for name in names if not self._fresh(name, time.monotonic())]
+                if stale:
+                    await self._refresh(stale)
+        return {name: self._memo[name][2] for name in names}
+
+    async def _refresh(self, names) -> None:
+        rows = await self.db.fetch_all(self._query(names))
+        self.refreshes += 1
+        found = {row["table_name"]: (row["changed_at"], row["last_id"], row["changes"]) for row in rows}
+        for name in names:
+            version = found.get(name, (None, 0, 0))  # no row yet: never written since the migration
+            previous = self._memo.get(name)
+            if previous is not None and previous[2] != version:
+                self.changes_seen += 1
+                self.cache.invalidate(*TABLE_CACHE_NAMESPACES[name])
+            self._memo[name] = (time.monotonic(), self._generations(name), version)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "enabled": validators_enabled(),
+            "ttl_seconds": self.ttl,
+            "refreshes": self.refreshes,
+            "changes_seen": self.changes_seen,
+            "tables": {
+                name: {
+                    "changed_at": version[0].isoformat() if version[0] else None,
+                    "last_id": version[1],
+                    "changes": version[2],
+                    "age_seconds": round(now - fetched_at, 3),
+                }
+                for name, (fetched_at, _, version) in sorted(self._memo.items())
+            },
+        }
+
+
+# versions come from the primary: round-robin over replicas at different lag would make them flip
+# back and forth, invalidating the response cache on every flip
+table_versions = TableVersions(database, response_cache, ttl=settings.CONDITIONAL_GET_TTL_SECONDS)
+
+
+def validators_enabled() -> bool:
+    """
+    ETag / 304 only without read replicas: the body of a GET is read through read_database, so
+    a replica still behind the primary's version would serve old data under the new ETag, and
+    the client would keep getting 304s for it until the table changed again.
+    """
+    return settings.CONDITIONAL_GET_ENABLED and not read_database.replicas
+
+
+async def run_change_log_pruner(interval: float) -> None:
+    """Fold table_change_log down to one row per table every `interval` seconds (versions stay the same)."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            pruned = await database.fetch_val(text("SELECT prune_table_change_log()"))
+            logger.debug("table_change_log: folded %s rows", pruned)
+        except Exception:
+            logger.exception("table_change_log prune failed")
+
+
+def make_etag(request: Request, versions: Dict[str, Version]) -> str:
+    # weak: the representation is the same, but GZip may change the bytes
+    parts = [settings.APP_VERSION, request.url.path, request.url.query]
+    parts += [f"{name}:{ts.isoformat() if ts else '-'}:{last_id}:{changes}"
+              for name, (ts, last_id, changes) in sorted(versions.items())]
+    return 'W/"%s"' % hashlib.blake2b("|".join(parts).encode(), digest_size=12).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison (RFC 9110 §13.1.2) against a comma-separated If-None-Match."""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or (candidate[2:] if candidate.startswith("W/") else candidate) == opaque:
+            return True
+    return False
+
+
+def conditional_get(*tables: str):
+    """
+    Route dependency for GETs that read `tables`: sets ETag / Last-Modified on the response
+    and raises NotModified (a bodiless 304) before the endpoint runs when If-None-Match
+    still matches. Endpoints that return their own Response must copy the headers of the
+    injected `response` (fast_json.fast_rows does).
+
+    The ETag covers the path and query string, so any write to one of the tables changes it
+    for every URL of the route. If-Modified-Since is not honored: HTTP dates have one-second
+    resolution, coarser than the change log. With READ_DATABASE_URL set this is a no-op
+    (see validators_enabled).
+    """
+    unknown = set(tables) - set(TABLES)
+    if unknown:
+        raise ValueError(f"No version source for tables: {sorted(unknown)}")
+
+    async def dependency(request: Request, response: Response) -> None:
+        if not validators_enabled():
+            return
+        versions = await table_versions.get(tables)
+        headers = {"ETag": make_etag(request, versions), "Cache-Control": "no-cache"}
+        last_modified = max((ts for ts, _, _ in versions.values() if ts is not None), default=None)
+        if last_modified is not None:
+            headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            raise NotModified(headers)
+        response.headers.update(headers)
+
+    return Depends(dependency)
@@ -9,11 +9,78 @@ class Settings(BaseSettings):
     # Alembic / sync tooling (optional). If not set, we’ll derive it from DATABASE_URL.
     SYNC_DATABASE_URL: Optional[AnyUrl] = None
 
+    # asyncpg pool (per worker process: workers × DB_POOL_MAX_SIZE must fit Postgres max_connections)
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    DB_POOL_ACQUIRE_TIMEOUT: float = 10.0               # seconds to wait for a free connection
+    DB_STATEMENT_CACHE_SIZE: int = 100                  # prepared statements per connection; 0 behind pgbouncer
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = 300.0        # close idle connections after this many seconds
+    DB_POOL_MAX_QUERIES: int = 50_000                   # recycle a connection after this many queries
+    DB_COMMAND_TIMEOUT: Optional[float] = None          # per-statement timeout in seconds
+
+    # Read replicas for GET endpoints: comma-separated asyncpg URLs (same pool knobs as the primary)
+    READ_DATABASE_URL: Optional[str] = None
+    REPLICA_RETRY_SECONDS: float = 30.0                 # skip a failed replica for this long
+
+    # `python -m serve`: worker processes (default: CPU count) and the primary-DB connection budget
+    # split across them (default: WORKERS × DB_POOL_MAX_SIZE); serve sets DB_POOL_MAX_SIZE per worker
+    WORKERS: Optional[int] = None
+    DB_CONNECTION_BUDGET: Optional[int] = None
+    GRACEFUL_TIMEOUT_SECONDS: float = 30.0              # in-flight requests get this long on restart / stop
+
+    # bcrypt hash / verify on a dedicated thread pool (per worker process), off the event loop
+    PASSWORD_HASH_THREADS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64                 # beyond this many waiting, sign-ins get 503 + Retry-After
+
+    # Signed session tokens from POST /api/users/login (HMAC-SHA256; set AUTH_SECRET in every deployment)
+    AUTH_SECRET: Optional[str] = None                   # unset: random per process, tokens die on restart
+    AUTH_TOKEN_TTL_SECONDS: int = 12 * 3600
+    AUTH_TOKEN_CACHE_SIZE: int = 4096                   # verified tokens kept per worker (LRU)
+    AUTH_REVOCATION_REFRESH_SECONDS: float = 30.0       # logouts / deactivations reach other workers within this
+    AUTH_REQUIRED: bool = False                         # require a bearer token on every router except login / sign-up
+
+    # /internal/* (stats, SQL text, EXPLAIN plans, resets): callers send X-Internal-Token with this
+    # value; unset, only loopback clients get in
+    INTERNAL_TOKEN: Optional[str] = None
+
+    # In-memory prefix index behind GET /api/employees/names (per worker process)
+    TYPEAHEAD_ENABLED: bool = True
+    TYPEAHEAD_REFRESH_SECONDS: float = 30.0             # other workers' employee / role writes show up within this
+
+    # Run pg_db.create_schema() in the app lifespan (dev convenience; prefer `alembic upgrade head`)
+    DB_CREATE_ALL_ON_STARTUP: bool = False
+
     # CORS
     CORS_ORIGINS: str = "*"  # comma-separated or "*" in dev
     APP_NAME: str = "GMS Project Management System"
     APP_VERSION: str = "1.0.0"
 
+    # In-process read cache (dashboard / list endpoints); invalidated on writes
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: float = 30.0
+    CACHE_MAX_ENTRIES: int = 512
+
+    # Per-route request count / latency histograms at GET /metrics (Prometheus text format)
+    METRICS_ENABLED: bool = True
+
+    # Per-statement timings at GET /internal/queries; statements slower than SLOW_QUERY_MS are logged
+    QUERY_STATS_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 200.0
+    SLOW_QUERY_EXPLAIN_SAMPLE: float = 0.0              # fraction of slow SELECTs re-run under EXPLAIN ANALYZE
+
+    # List endpoints serialize trusted DB rows straight to JSON (orjson) instead of validating
+    # them against the response_model; same wire format
+    FAST_JSON: bool = False
+
+    # ETag / Last-Modified on GET endpoints from per-table (max(updated_at), count(*)); 304 on If-None-Match
+    CONDITIONAL_GET_ENABLED: bool = True
+    CONDITIONAL_GET_TTL_SECONDS: float = 1.0            # table versions are re-read at most this often per worker
+    CHANGE_LOG_PRUNE_SECONDS: float = 300.0             # table_change_log is folded to one row per table this often
+
+    # gzip responses larger than GZIP_MIN_SIZE bytes when the client accepts it (0 turns it off)
+    GZIP_MIN_SIZE: int = 1024
+    GZIP_LEVEL: int = 5                                 # 1 fastest … 9 smallest
+
     class Config:
         env_file = ".env"
         case_sensitive = True
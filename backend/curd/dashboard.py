@@ -1,58 +1,134 @@
-from pg_db import database,projects, project_staffing, employees, task_monitors
-from sqlalchemy import select, func, case, literal
+from __future__ import annotations
+from datetime import date
+from typing import Any, Dict, List, Optional
+from pg_db import database, read_database,projects, project_staffing, task_monitors, task_daily_rollup
+from sqlalchemy import select, func, literal, insert, text, and_
+from cache import response_cache
+
+# Counter columns shared by task_monitors and task_daily_rollup
+ROLLUP_COUNTERS = (
+    "task_completed", "task_inprogress", "task_reworked",
+    "task_approved", "task_rejected", "task_reviewed", "hours_logged",
+)
 
 class DashboardCurdOperation:
 
     ## Dashboard Summary
     @staticmethod
-    async def get_dashboard_summary():
+    @response_cache.cached("dashboard")
+    async def get_dashboard_summary(
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        project_id: Optional[int] = None,
+        status: Optional[str] = None,      # '1' or '0'
+    ) -> List[Dict[str, Any]]:
         p  = projects.alias("p")
         ps = project_staffing.alias("ps")
-        e  = employees.alias("e")
-        tm = task_monitors.alias("tm")
-
-        # Normalize name to collapse case/space duplicates
-        norm_name = func.trim(func.lower(p.c.project_name))
+        r  = task_daily_rollup.alias("r")
 
-        # LEFT joins so projects without staffing or tasks still appear
-        j = (
-            p.outerjoin(ps, ps.c.project_id == p.c.project_id)
-            .outerjoin(e,  e.c.employees_id == ps.c.employees_id)
-            .outerjoin(tm, tm.c.project_id  == p.c.project_id)
+        # Projects in scope; normalized name collapses case/space duplicates
+        scoped = select(
+            p.c.project_id,
+            p.c.project_name,
+            p.c.status,
+            p.c.created_at,
+            func.trim(func.lower(p.c.project_name)).label("norm_name"),
         )
+        if project_id:
+            scoped = scoped.where(p.c.project_id == project_id)
+        if status in ("0", "1"):
+            scoped = scoped.where(p.c.status == status)
+        scoped = scoped.cte("scoped")
 
-        # bool_or(...) gives boolean; convert to '1'/'0'
-        active_flag = case(
-            (func.bool_or(p.c.status == literal('1')), literal('1')),
-            else_=literal('0')
-        ).label("status")
+        group_key = (scoped.c.norm_name, scoped.c.status)
 
-        query = (
+        # One row per project group; staffing and tasks are aggregated separately
+        # and joined afterwards, so neither side multiplies the other.
+        project_agg = (
+            select(
+                *group_key,
+                func.min(scoped.c.project_name).label("project_name"),  # representative original name
+                func.min(scoped.c.created_at).label("project_created_on"),
+            )
+            .group_by(*group_key)
+            .subquery("pa")
+        )
+
+        staff_agg = (
             select(
-                func.min(p.c.project_name).label("project_name"),  # representative original name
-                active_flag,
-                # staff aggregates from project_staffing
+                *group_key,
                 func.string_agg(func.distinct(ps.c.gms_manager), literal(', ')).label("manager_name"),
                 func.string_agg(func.distinct(ps.c.t_manager),    literal(', ')).label("lead_name"),
                 func.string_agg(func.distinct(ps.c.pod_lead),     literal(', ')).label("pod_lead_name"),
-                # number of distinct trainers (employees tied via staffing)
-                func.count(func.distinct(e.c.employees_id)).label("num_trainers"),
-                # task aggregates from task_monitors
-                func.coalesce(func.sum(tm.c.task_completed),  0).label("task_completed_sum"),
-                func.coalesce(func.sum(tm.c.task_inprogress), 0).label("task_inprogress_sum"),
-                func.coalesce(func.sum(tm.c.task_reworked),   0).label("task_reworked_sum"),
-                func.coalesce(func.sum(tm.c.task_approved),   0).label("task_approved_sum"),
-                func.coalesce(func.sum(tm.c.task_rejected),   0).label("task_rejected_sum"),
-                func.coalesce(func.sum(tm.c.task_reviewed),   0).label("task_reviewed_sum"),
-                func.coalesce(func.sum(tm.c.hours_logged),    0).label("hours_logged_sum"),
-                # dates
-                func.min(tm.c.task_date).label("first_task_date"),
-                func.min(p.c.created_at).label("project_created_on"),
+                # number of distinct trainers tied via staffing
+                func.count(func.distinct(ps.c.employees_id)).label("num_trainers"),
+            )
+            .select_from(scoped.join(ps, ps.c.project_id == scoped.c.project_id))
+            .group_by(*group_key)
+            .subquery("sa")
+        )
+
+        task_agg = (
+            select(
+                *group_key,
+                *[func.sum(r.c[c]).label(f"{c}_sum") for c in ROLLUP_COUNTERS],
+                func.min(r.c.task_date).label("first_task_date"),
+            )
+            .select_from(scoped.join(r, r.c.project_id == scoped.c.project_id))
+            .group_by(*group_key)
+        )
+        if date_from:
+            task_agg = task_agg.where(r.c.task_date >= date_from)
+        if date_to:
+            task_agg = task_agg.where(r.c.task_date <= date_to)
+        task_agg = task_agg.subquery("ta")
+
+        def same_group(sub):
+            return and_(sub.c.norm_name == project_agg.c.norm_name, sub.c.status == project_agg.c.status)
+
+        query = (
+            select(
+                project_agg.c.project_name,
+                project_agg.c.status,
+                staff_agg.c.manager_name,
+                staff_agg.c.lead_name,
+                staff_agg.c.pod_lead_name,
+                func.coalesce(staff_agg.c.num_trainers, 0).label("num_trainers"),
+                *[func.coalesce(task_agg.c[f"{c}_sum"], 0).label(f"{c}_sum") for c in ROLLUP_COUNTERS],
+                task_agg.c.first_task_date,
+                project_agg.c.project_created_on,
+            )
+            .select_from(
+                project_agg
+                .outerjoin(staff_agg, same_group(staff_agg))
+                .outerjoin(task_agg, same_group(task_agg))
+            )
+            .order_by(project_agg.c.project_name)
+        )
+
+        rows = await read_database.fetch_all(query)
+        return [dict(row) for row in rows]
+
+    ## Rebuild task_daily_rollup from task_monitors (backfill / repair)
+    @staticmethod
+    async def rebuild_daily_rollup() -> int:
+        tm = task_monitors
+        key = (tm.c.project_id, tm.c.employees_id, tm.c.task_date)
+        source = (
+            select(
+                *key,
+                *[func.sum(tm.c[c]) for c in ROLLUP_COUNTERS],
+                func.count(),
             )
-            .select_from(j)
-            .group_by(norm_name, p.c.status)
-            .order_by(func.min(p.c.project_name))
+            .group_by(*key)
         )
+        columns = ["project_id", "employees_id", "task_date", *ROLLUP_COUNTERS, "entry_count"]
 
-        rows = await database.fetch_all(query)
-        return [dict(r) for r in rows]
+        async with database.transaction():
+            # Block writers (readers still allowed) so no trigger delta is lost mid-rebuild
+            await database.execute(text("LOCK TABLE task_monitors IN SHARE MODE"))
+            await database.execute(text("TRUNCATE task_daily_rollup"))
+            await database.execute(insert(task_daily_rollup).from_select(columns, source))
+            rebuilt = await database.fetch_val(select(func.count()).select_from(task_daily_rollup))
+        response_cache.invalidate("dashboard")
+        return rebuilt
@@ -1,21 +1,41 @@
 from __future__ import annotations
+import csv
+import io
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 import sqlalchemy as sa
-from sqlalchemy import select, insert, update, delete
+from sqlalchemy import select, insert, update, delete, any_, literal, union_all
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 from schema.employees import EmployeesEntry,EmployeesUpdate, EmployeesList
-from pg_db import database,employees, roles
-from passlib.context import CryptContext
-from typing import List, Dict, Any, Optional
+from pg_db import database, read_database,employees, roles, copy_records
+from cache import response_cache
+from typeahead import employee_names, normalize
+from config import settings
+from errors import constraint_error
+from pagination import encode_cursor, decode_cursor
+from query_templates import QueryTemplate
+import functools
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from datetime import date
 
- 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+# Cached read routes that show employee data
+EMPLOYEE_CACHE_NAMESPACES = ("employees", "employee_names", "projects", "dashboard")
+
+# Columns written by the CSV import, in COPY order (EmployeesEntry field names)
+IMPORT_COLUMNS = (
+    "employees_id", "first_name", "last_name", "email", "phone", "gender", "designation", "role",
+    "skill", "experience", "qualification", "state", "city", "active_at", "inactive_at", "status",
+)
 
 
 ## End Point for Employees Table
 
 class EmployeesCurdOperation:
 
+    import_max_rows = 50_000
+    import_chunk_rows = 1000        # rows validated and checked against the DB per round trip
+
     # ───────────────────────── helpers ─────────────────────────
 
     @staticmethod
@@ -34,6 +54,50 @@ class EmployeesCurdOperation:
             q = q.where(employees.c.employees_id != exclude_emp_id)
         return (await database.fetch_one(q)) is not None
 
+    @staticmethod
+    def _joined_select(e=None):
+        """Employee columns of `e` (employees alias or a RETURNING cte) with role_name."""
+        e = employees.alias("e") if e is None else e
+        r = roles.alias("r")
+        return (
+            select(
+                e.c.employees_id, e.c.first_name, e.c.last_name, e.c.email, e.c.phone, e.c.gender,
+                e.c.designation, e.c.role, e.c.skill, e.c.experience, e.c.qualification,
+                e.c.state, e.c.city, e.c.active_at, e.c.inactive_at, e.c.status,
+                e.c.created_at, e.c.updated_at,
+                r.c.role_name,
+            )
+            .select_from(e.outerjoin(r, r.c.role_id == e.c.role))
+        )
+
+    # Hot lookup: built and compiled once, reused with new bind values
+    by_id_template = QueryTemplate(
+        "employees.by_id",
+        lambda: EmployeesCurdOperation._by_id_select(),
+    )
+
+    @staticmethod
+    def _by_id_select():
+        e = employees.alias("e")
+        return EmployeesCurdOperation._joined_select(e).where(e.c.employees_id == sa.bindparam("employees_id"))
+
+    @staticmethod
+    def _like_pattern(q: str) -> str:
+        """'%q%' for ILIKE, with the LIKE wildcards in q escaped (ESCAPE '\\')."""
+        return "%" + q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+    @staticmethod
+    def _write_error(exc: Exception, employee: Any) -> HTTPException:
+        """409 for a taken id/email, 404 for an unknown role, else 400."""
+        return constraint_error(
+            exc,
+            conflict={
+                "employees_pkey": "Employee ID already exists",
+                "uq_employee_email": "Email already exists",
+            },
+            not_found={"*": f"Role '{getattr(employee, 'role', None)}' not found"},
+        ) or HTTPException(status_code=400, detail="Failed to save employee")
+
     @staticmethod
     def _row_to_employees_list(row: sa.engine.Row | Dict[str, Any]) -> Dict[str, Any]:
         """Normalize a joined row → EmployeesList shape."""
@@ -71,6 +135,7 @@ class EmployeesCurdOperation:
     # ───────────────────────── list ─────────────────────────
 
     @staticmethod
+    @response_cache.cached("employees")
     async def find_all_employees(
         *,
         q: Optional[str] = None,
@@ -96,26 +161,123 @@ class EmployeesCurdOperation:
         )
 
         if q:
-            like = f"%{q}%"
+            # served by the ix_employees_*_trgm GIN indexes (pg_trgm) for q of 3+ characters
+            like = EmployeesCurdOperation._like_pattern(q)
             stmt = stmt.where(
                 sa.or_(
-                    e.c.first_name.ilike(like),
-                    e.c.last_name.ilike(like),
-                    e.c.email.ilike(like),
+                    e.c.first_name.ilike(like, escape="\\"),
+                    e.c.last_name.ilike(like, escape="\\"),
+                    e.c.email.ilike(like, escape="\\"),
                 )
             )
         if status_flag in ("0", "1"):
             stmt = stmt.where(e.c.status == status_flag)
 
         try:
-            rows = await database.fetch_all(stmt)
+            rows = await read_database.fetch_all(stmt)
             return [EmployeesCurdOperation._row_to_employees_list(r) for r in rows]
         except Exception:
             raise HTTPException(status_code=400, detail="Failed to list employees")
 
+    # ───────────────────────── search ─────────────────────────
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _search_template(by_status: bool, after: bool) -> QueryTemplate:
+        """
+        Precompiled search statement. A row matches when q is word-similar (pg_trgm `<%`,
+        threshold pg_trgm.word_similarity_threshold, default 0.6) to, or a substring of, the
+        first name, last name or email; score is the best word_similarity of the three.
+        Ordered by (score DESC, employees_id); `after` adds the keyset seek past a cursor.
+        """
+        def build():
+            e = employees.alias("e")
+            q = sa.bindparam("q", type_=sa.String)
+            like = sa.bindparam("like", type_=sa.String)
+            columns = (e.c.first_name, e.c.last_name, e.c.email)
+            score = sa.func.greatest(
+                *(sa.func.word_similarity(q, column, type_=sa.Float) for column in columns), type_=sa.Float
+            )
+            hits = (
+                EmployeesCurdOperation._joined_select(e)
+                .add_columns(score.label("score"))
+                .where(sa.or_(
+                    *(q.op("<%")(column) for column in columns),
+                    *(column.ilike(like, escape="\\") for column in columns),
+                ))
+            )
+            if by_status:
+                hits = hits.where(e.c.status == sa.bindparam("status_flag"))
+            hits = hits.subquery("hits")
+            query = select(hits).order_by(hits.c.score.desc(), hits.c.employees_id)
+            if after:
+                after_score = sa.bindparam("after_score", type_=sa.Float)
+                query = query.where(sa.or_(
+                    hits.c.score < after_score,
+                    sa.and_(hits.c.score == after_score, hits.c.employees_id > sa.bindparam("after_id")),
+                ))
+            return query.limit(sa.bindparam("limit", type_=sa.Integer))
+
+        return QueryTemplate(f"employees.search[{'s' if by_status else '-'}:{'after' if after else 'first'}]", build)
+
+    @staticmethod
+    def next_search_cursor(rows: List[Dict[str, Any]], limit: int) -> Optional[str]:
+        """Cursor for the page of search hits after `rows`, or None when this was the last page."""
+        if len(rows) < limit:
+            return None
+        last = rows[-1]
+        return encode_cursor(last["score"], last["employees_id"])
+
+    @staticmethod
+    async def search_employees(
+        q: str,
+        *,
+        status_flag: Optional[str] = None,   # '1' or '0'
+        limit: int = 20,
+        cursor: Optional[str] = None,        # from next_search_cursor()
+    ) -> List[Dict[str, Any]]:
+        """Employees ranked by how well q matches their name or email (best first), with score."""
+        values: Dict[str, Any] = {"q": q, "like": EmployeesCurdOperation._like_pattern(q), "limit": limit}
+        if cursor:
+            values["after_score"], values["after_id"] = decode_cursor(cursor, float, str)
+        if status_flag in ("0", "1"):
+            values["status_flag"] = status_flag
+        template = EmployeesCurdOperation._search_template("status_flag" in values, bool(cursor))
+        try:
+            rows = await read_database.fetch_all(template, values)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Failed to search employees")
+        return [
+            {**EmployeesCurdOperation._row_to_employees_list(row), "score": row["score"]}
+            for row in rows
+        ]
+
     # ───────────────────────── basic name list (optional) ─────────────────────────
     # If you keep this endpoint, it returns a simplified shape (not EmployeesList).
     @staticmethod
+    async def find_employee_names(prefix: str = "", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Active employees whose name ("first last" / "last first") or id starts with `prefix`
+        (case- and accent-insensitive), from the in-memory typeahead index. Until the index
+        has been built, the same answer is computed from the database listing.
+        """
+        if settings.TYPEAHEAD_ENABLED and employee_names.ready:
+            return employee_names.lookup(prefix, limit)
+        rows = await EmployeesCurdOperation.find_all_employees_name()
+        prefix = normalize(prefix)
+        if prefix:
+            rows = [
+                row for row in rows
+                if any(key.startswith(prefix) for key in (
+                    normalize(row["full_name"]),
+                    normalize(" ".join(reversed(row["full_name"].split(" ", 1)))),
+                    normalize(row["employees_id"]),
+                ))
+            ]
+        return rows[:limit] if limit is not None else rows
+
+    @staticmethod
+    @response_cache.cached("employee_names")
     async def find_all_employees_name( active_only: bool = True
     ) -> List[Dict[str, Any]]:
         e, r = employees.alias("e"), roles.alias("r")
@@ -131,11 +293,11 @@ class EmployeesCurdOperation:
         if active_only:
             stmt = stmt.where(e.c.status == sa.literal("1"))
         try:
-            rows = await database.fetch_all(stmt)
+            rows = await read_database.fetch_all(stmt)
             return [
                 {
                     "employees_id": row["employees_id"],
-                    "full_name": row["first_name"]+" "+row["last_name"],
+                    "full_name": " ".join(part for part in (row["first_name"], row["last_name"]) if part),
                     "role_name": row["role_name"],
                 }
                 for row in rows
@@ -147,20 +309,8 @@ class EmployeesCurdOperation:
 
     @staticmethod
     async def find_employees_by_id(employees_id: str) -> EmployeesList:
-        e, r = employees.alias("e"), roles.alias("r")
-        stmt = (
-            select(
-                e.c.employees_id, e.c.first_name, e.c.last_name, e.c.email, e.c.phone, e.c.gender,
-                e.c.designation, e.c.role, e.c.skill, e.c.experience, e.c.qualification,
-                e.c.state, e.c.city, e.c.active_at, e.c.inactive_at, e.c.status,
-                e.c.created_at, e.c.updated_at,
-                r.c.role_name,
-            )
-            .select_from(e.outerjoin(r, r.c.role_id == e.c.role))
-            .where(e.c.employees_id == employees_id)
-        )
         try:
-            row = await database.fetch_one(stmt)
+            row = await read_database.fetch_one(EmployeesCurdOperation.by_id_template, {"employees_id": employees_id})
             if not row:
                 raise HTTPException(status_code=404, detail=f"Employee '{employees_id}' not found")
             return EmployeesCurdOperation._row_to_employees_list(row)
@@ -173,101 +323,247 @@ class EmployeesCurdOperation:
 
     @staticmethod
     async def register_employee(employee: EmployeesEntry) -> EmployeesList:
-        # enforce unique email (also add UNIQUE index in DB, which you have)
-        if await EmployeesCurdOperation._email_exists(employee.email):
-            raise HTTPException(status_code=409, detail="Email already exists")
-        
-        if await EmployeesCurdOperation._ensure_employee_exists(employee.employees_id):
-            raise HTTPException(status_code=409, detail="Employee ID already exists")
-
-        if employee.employees_id:
-            # If role is provided, let DB FK enforce validity. (Optionally pre-check)
-            values = {
-                "employees_id": employee.employees_id,
-                "first_name": employee.first_name,
-                "last_name": employee.last_name,
-                "email": employee.email,
-                "phone": employee.phone,
-                "gender": employee.gender,
-                "designation": employee.designation,
-                "role": employee.role,
-                "skill": employee.skill,
-                "experience": employee.experience,
-                "qualification": employee.qualification,
-                "state": employee.state,
-                "city": employee.city,
-                "active_at": employee.active_at or date.today(),
-                "status": employee.status or "1",
-                # created_at/updated_at should be DB defaults/triggers; avoid setting explicitly
-            }
-            print(values)
-            try:
-                ins = insert(employees).values(**values).returning(*employees.c)
-                inserted = await database.execute(ins)
-                if not inserted:
-                    raise HTTPException(status_code=400, detail="Insert failed")
-                
-                # Return full row (joined)
-                return await EmployeesCurdOperation.find_employees_by_id(employee.employees_id)
-            except HTTPException:
-                raise
-            except Exception:
-                # Could be FK violation for role, etc.
-                raise HTTPException(status_code=400, detail="Failed to create employee")
-        else:
+        if not employee.employees_id:
             raise HTTPException(status_code=404, detail="Employee ID is required")
 
+        # Duplicate id/email and unknown role are caught by the PK, uq_employee_email and the role FK
+        values = {
+            "employees_id": employee.employees_id,
+            "first_name": employee.first_name,
+            "last_name": employee.last_name,
+            "email": employee.email,
+            "phone": employee.phone,
+            "gender": employee.gender,
+            "designation": employee.designation,
+            "role": employee.role,
+            "skill": employee.skill,
+            "experience": employee.experience,
+            "qualification": employee.qualification,
+            "state": employee.state,
+            "city": employee.city,
+            "active_at": employee.active_at or date.today(),
+            "status": employee.status or "1",
+            # created_at/updated_at should be DB defaults/triggers; avoid setting explicitly
+        }
+        # INSERT … RETURNING inside a CTE, joined with roles: one round trip
+        inserted = insert(employees).values(**values).returning(*employees.c).cte("inserted")
+        try:
+            row = await database.fetch_one(EmployeesCurdOperation._joined_select(inserted))
+        except Exception as exc:
+            raise EmployeesCurdOperation._write_error(exc, employee)
+        if not row:
+            raise HTTPException(status_code=400, detail="Insert failed")
+        response_cache.invalidate(*EMPLOYEE_CACHE_NAMESPACES)
+        employee_names.upsert(row)
+        return EmployeesCurdOperation._row_to_employees_list(row)
+
 
     # ───────────────────────── update ─────────────────────────
 
     @staticmethod
     async def update_employees(employees_id: str, employee: "EmployeesUpdate") -> EmployeesList:
-        # Ensure exists for nicer 404
-        await EmployeesCurdOperation._ensure_employee_exists(employees_id)
-
-        # Email uniqueness (if changed)
-        if employee.email and await EmployeesCurdOperation._email_exists(employee.email, exclude_emp_id=employees_id):
-            raise HTTPException(status_code=409, detail="Email already exists")
-
         # Build update dict; ignore None to allow partial-like update with this model
         data = {k: v for k, v in employee.dict(exclude_unset=True).items() if v is not None}
 
         # Map schema field names directly to columns.
-        # DO NOT touch created_at here; rely on DB trigger to bump updated_at, or set it explicitly:
-        # data["updated_at"] = sa.func.now()  # if you don't have triggers
+        # DO NOT touch created_at here; rely on DB trigger to bump updated_at
         if not data:
             # Nothing changed; return current row
             return await EmployeesCurdOperation.find_employees_by_id(employees_id)
 
+        updated = (
+            update(employees)
+            .where(employees.c.employees_id == employees_id)
+            .values(**data)
+            .returning(*employees.c)
+            .cte("updated")
+        )
         try:
-            stmt = (
-                update(employees)
-                .where(employees.c.employees_id == employees_id)
-                .values(**data)
-            )
-            await database.execute(stmt)
-            return await EmployeesCurdOperation.find_employees_by_id(employees_id)
-        except HTTPException:
-            raise
-        except Exception:
-            raise HTTPException(status_code=400, detail="Failed to update employee")
+            row = await database.fetch_one(EmployeesCurdOperation._joined_select(updated))
+        except Exception as exc:
+            raise EmployeesCurdOperation._write_error(exc, employee)
+        if not row:
+            raise HTTPException(status_code=404, detail=f"Employee '{employees_id}' not found")
+        response_cache.invalidate(*EMPLOYEE_CACHE_NAMESPACES)
+        employee_names.upsert(row)
+        return EmployeesCurdOperation._row_to_employees_list(row)
 
     # ───────────────────────── delete ─────────────────────────
 
     @staticmethod
     async def delete_employee(employees_id: str) -> Dict[str, Any]:
-        # Ensure exists
-        await EmployeesCurdOperation._ensure_employee_exists(employees_id)
-
+        # project_staffing/task_monitors rows go with it (ON DELETE CASCADE)
+        stmt = (
+            delete(employees)
+            .where(employees.c.employees_id == employees_id)
+            .returning(employees.c.employees_id)
+        )
         try:
-            # If you have ON DELETE CASCADE from project_staffing/task_monitors → employees,
-            # this will cascade cleanly; otherwise you may get FK errors.
-            stmt = delete(employees).where(employees.c.employees_id == employees_id)
-            await database.execute(stmt)
-            return {"status": True, "message": "Employee has been deleted successfully.", "employees_id": employees_id}
+            deleted = await database.fetch_val(stmt)
         except Exception:
             raise HTTPException(
                 status_code=400,
                 detail="Cannot delete employee because it is referenced by other records",
             )
-    
\ No newline at end of file
+        if deleted is None:
+            raise HTTPException(status_code=404, detail=f"Employee '{employees_id}' not found")
+        response_cache.invalidate(*EMPLOYEE_CACHE_NAMESPACES)
+        employee_names.remove(employees_id)
+        return {"status": True, "message": "Employee has been deleted successfully.", "employees_id": employees_id}
+
+    # ───────────────────────── bulk import (CSV) ─────────────────────────
+
+    @staticmethod
+    def _csv_chunks(data: bytes, size: int) -> Iterator[List[Tuple[int, Dict[str, Any]]]]:
+        """(row number, fields) in chunks of `size`; header = EmployeesEntry field names, blank cells omitted."""
+        try:
+            text_data = data.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+        reader = csv.DictReader(io.StringIO(text_data))
+        if not reader.fieldnames or "employees_id" not in {f.strip() for f in reader.fieldnames if f}:
+            raise HTTPException(status_code=400, detail="CSV header must name the employee fields, including employees_id")
+        chunk: List[Tuple[int, Dict[str, Any]]] = []
+        for number, row in enumerate(reader, start=1):
+            if number > EmployeesCurdOperation.import_max_rows:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"Too many rows (max {EmployeesCurdOperation.import_max_rows})",
+                )
+            chunk.append((number, {k.strip(): v.strip() for k, v in row.items() if k and v not in ("", None)}))
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _taken_query(ids: List[str], emails: List[str], role_ids: List[str]):
+        """One round trip: which ids / emails are taken and which roles exist (PK, uq_employee_email, roles PK)."""
+        return union_all(
+            select(literal("employees_id").label("kind"), employees.c.employees_id.label("value"))
+            .where(employees.c.employees_id == any_(sa.bindparam("ids", ids, type_=ARRAY(sa.String)))),
+            select(literal("email"), employees.c.email)
+            .where(employees.c.email == any_(sa.bindparam("emails", emails, type_=ARRAY(sa.String)))),
+            select(literal("role"), roles.c.role_id)
+            .where(roles.c.role_id == any_(sa.bindparam("role_ids", role_ids, type_=ARRAY(sa.String)))),
+        )
+
+    @staticmethod
+    async def import_employees(data: bytes) -> Dict[str, Any]:
+        """
+        Create employees from a CSV upload. Each chunk of rows is validated with EmployeesEntry,
+        then checked with one query for taken ids / emails and unknown roles (and against the
+        earlier rows of the file). Every valid row is then COPYed into a staging table and
+        inserted in one statement; rows that are rejected are reported, the rest still go in.
+        """
+        results: List[Dict[str, Any]] = []
+        valid: List[Tuple[int, EmployeesEntry]] = []
+        seen_ids: Dict[str, int] = {}
+        seen_emails: Dict[str, int] = {}
+
+        for chunk in EmployeesCurdOperation._csv_chunks(data, EmployeesCurdOperation.import_chunk_rows):
+            # 1) Validate with the single-create schema
+            entries: List[Tuple[Dict[str, Any], EmployeesEntry]] = []
+            for number, raw in chunk:
+                result = {"row": number, "status": "inserted", "employees_id": raw.get("employees_id"),
+                          "email": raw.get("email"), "errors": []}
+                results.append(result)
+                try:
+                    entries.append((result, EmployeesEntry.model_validate(raw)))
+                except ValidationError as exc:
+                    result.update(status="error", errors=[
+                        {"field": ".".join(str(p) for p in err["loc"]), "message": err["msg"]}
+                        for err in exc.errors()
+                    ])
+            if not entries:
+                continue
+
+            # 2) Uniqueness and roles: one set-based query per chunk
+            try:
+                found = await database.fetch_all(EmployeesCurdOperation._taken_query(
+                    list({e.employees_id for _, e in entries}),
+                    list({e.email for _, e in entries}),
+                    list({e.role for _, e in entries if e.role}),
+                ))
+            except Exception:
+                raise HTTPException(status_code=400, detail="Failed to check employees for import")
+            taken = {(row["kind"], row["value"]) for row in found}
+            for result, entry in entries:
+                errors = []
+                if ("employees_id", entry.employees_id) in taken:
+                    errors.append({"field": "employees_id", "message": "Employee ID already exists"})
+                elif entry.employees_id in seen_ids:
+                    errors.append({"field": "employees_id", "message": f"Duplicate of row {seen_ids[entry.employees_id]}"})
+                if ("email", entry.email) in taken:
+                    errors.append({"field": "email", "message": "Email already exists"})
+                elif entry.email in seen_emails:
+                    errors.append({"field": "email", "message": f"Duplicate of row {seen_emails[entry.email]}"})
+                if entry.role and ("role", entry.role) not in taken:
+                    errors.append({"field": "role", "message": f"Role '{entry.role}' not found"})
+                seen_ids.setdefault(entry.employees_id, result["row"])
+                seen_emails.setdefault(entry.email, result["row"])
+                if errors:
+                    result.update(status="error", errors=errors)
+                else:
+                    valid.append((result["row"], entry))
+
+        if not results:
+            raise HTTPException(status_code=400, detail="CSV has no data rows")
+
+        # 3) COPY into a transaction-scoped staging table, then insert it in one statement;
+        #    ON CONFLICT covers rows that became taken after the checks above
+        if valid:
+            records = [
+                tuple(
+                    (entry.status or "1") if column == "status" else getattr(entry, column)
+                    for column in IMPORT_COLUMNS
+                )
+                for _, entry in valid
+            ]
+            staging = sa.table("employees_import", *[sa.column(c) for c in IMPORT_COLUMNS])
+            try:
+                async with database.transaction():
+                    await database.execute(sa.text(
+                        f"CREATE TEMP TABLE {staging.name} ON COMMIT DROP AS "
+                        f"SELECT {', '.join(IMPORT_COLUMNS)} FROM employees WITH NO DATA"
+                    ))
+                    await copy_records(staging, IMPORT_COLUMNS, records)
+                    stored = await database.fetch_all(
+                        pg_insert(employees)
+                        .from_select(list(IMPORT_COLUMNS), select(staging))
+                        .on_conflict_do_nothing()
+                        .returning(employees.c.employees_id, employees.c.first_name, employees.c.last_name,
+                                   employees.c.role, employees.c.status)
+                    )
+            except Exception:
+                raise HTTPException(status_code=400, detail="Failed to bulk insert employees")
+            inserted_ids = {row["employees_id"] for row in stored}
+            by_row = {result["row"]: result for result in results}
+            for number, entry in valid:
+                if entry.employees_id not in inserted_ids:
+                    by_row[number].update(status="error", errors=[
+                        {"field": "", "message": "Employee ID or email was taken while importing"}
+                    ])
+            if stored:
+                response_cache.invalidate(*EMPLOYEE_CACHE_NAMESPACES)
+                employee_names.upsert_many(stored)
+
+        inserted = sum(1 for r in results if r["status"] == "inserted")
+        return {
+            "received": len(results),
+            "inserted": inserted,
+            "failed": len(results) - inserted,
+            "results": results,
+        }
+
+    @staticmethod
+    def import_report_csv(report: Dict[str, Any]) -> str:
+        """The import report as CSV: one line per row (row, status, employees_id, email, errors)."""
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(["row", "status", "employees_id", "email", "errors"])
+        for r in report["results"]:
+            errors = "; ".join(f"{e['field']}: {e['message']}" if e["field"] else e["message"] for e in r["errors"])
+            writer.writerow([r["row"], r["status"], r["employees_id"] or "", r["email"] or "", errors])
+        return out.getvalue()
@@ -1,15 +1,22 @@
 from __future__ import annotations
+import functools
 from datetime import date, datetime
 from operator import and_
 from typing import Any, List, Dict
 import sqlalchemy
 from schema.projects import ProjectsAdd,ProjectStaffingAdd, ProjectWithStaffingAdd, Projects, ProjectsWithTrainer, TrainerProjectUpdate
-from pg_db import database,projects, project_staffing, employees
+from pg_db import database, read_database,projects, project_staffing, employees
+from cache import response_cache
+from errors import constraint_error
+from query_templates import QueryTemplate
 from fastapi import HTTPException, status
 
 
 ## End Point for Projects Table
 
+# Cached read routes that show project or staffing data
+PROJECT_CACHE_NAMESPACES = ("projects", "dashboard")
+
 class ProjectsCurdOperation:
 
     default_limit = 500
@@ -37,17 +44,105 @@ class ProjectsCurdOperation:
         )
         return (await database.fetch_one(q)) is not None
 
+    @staticmethod
+    def _with_trainer_columns(p, ps, e):
+        """ProjectsWithTrainer columns; p/ps may be the tables or RETURNING ctes."""
+        return (
+            # project
+            p.c.project_id, p.c.project_name, p.c.active_at, p.c.status,
+            p.c.inactive_at, p.c.created_at, p.c.updated_at,
+            # staffing
+            ps.c.id.label("staffing_id"), ps.c.employees_id,
+            ps.c.gms_manager, ps.c.t_manager, ps.c.pod_lead,
+            ps.c.created_at.label("staffing_created_at"),
+            ps.c.updated_at.label("staffing_updated_at"),
+            # employee
+            e.c.first_name.label("employee_first_name"), e.c.last_name.label("employee_last_name"),
+        )
+
+    @staticmethod
+    def _staffing_write_error(exc: Exception, project_id: Any, employees_id: Any) -> HTTPException:
+        """409 for a repeated assignment, 404 for an unknown project/employee, else 400."""
+        return constraint_error(
+            exc,
+            conflict={"*": f"Employee '{employees_id}' is already assigned to project '{project_id}'"},
+            not_found={
+                "project_staffing_project_id_fkey": f"Project '{project_id}' not found",
+                "project_staffing_employees_id_fkey": f"Employee '{employees_id}' not found",
+                "*": f"Project '{project_id}' or employee '{employees_id}' not found",
+            },
+        ) or HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Failed to save project staffing")
+
+    # ───────────── hot lookups: built and compiled once, reused with new bind values ─────────────
+
+    @staticmethod
+    def _by_id_with_trainer_select():
+        p, ps, e = projects.alias("p"), project_staffing.alias("ps"), employees.alias("e")
+        return (
+            sqlalchemy.select(
+                *ProjectsCurdOperation._with_trainer_columns(p, ps, e),
+                e.c.email.label("employee_email"),
+            )
+            .select_from(
+                p.join(ps, ps.c.project_id == p.c.project_id)
+                .outerjoin(e, e.c.employees_id == ps.c.employees_id)
+            )
+            .where(and_(p.c.project_id == sqlalchemy.bindparam("project_id"),
+                        ps.c.employees_id == sqlalchemy.bindparam("trainer_id")))
+        )
+
+    by_id_with_trainer_template = QueryTemplate(
+        "projects.by_id_with_trainer", lambda: ProjectsCurdOperation._by_id_with_trainer_select())
+    by_id_template = QueryTemplate(
+        "projects.by_id", lambda: sqlalchemy.select(projects).where(projects.c.project_id == sqlalchemy.bindparam("project_id")))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _list_template(is_active: bool) -> QueryTemplate:
+        def build():
+            query = projects.select().order_by(projects.c.project_id.desc())
+            if is_active:
+                query = query.where(projects.c.status == '1')
+            return query.limit(sqlalchemy.bindparam("limit", type_=sqlalchemy.Integer)).offset(
+                sqlalchemy.bindparam("offset", type_=sqlalchemy.Integer))
+        return QueryTemplate(f"projects.list[active={is_active}]", build)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _for_trainer_template(is_active: bool) -> QueryTemplate:
+        def build():
+            query = (
+                sqlalchemy.select(
+                    projects,
+                    project_staffing.c.id.label("staffing_id"),
+                    project_staffing.c.employees_id,
+                    project_staffing.c.gms_manager,
+                    project_staffing.c.t_manager,
+                    project_staffing.c.pod_lead,
+                    project_staffing.c.created_at.label("staffing_created_at"),
+                    project_staffing.c.updated_at.label("staffing_updated_at"),
+                )
+                .select_from(projects.join(project_staffing, project_staffing.c.project_id == projects.c.project_id))
+                .where(project_staffing.c.employees_id == sqlalchemy.bindparam("trainer_id"))
+            )
+            if is_active:
+                query = query.where(projects.c.status == '1')
+            return query.limit(sqlalchemy.bindparam("limit", type_=sqlalchemy.Integer)).offset(
+                sqlalchemy.bindparam("offset", type_=sqlalchemy.Integer))
+        return QueryTemplate(f"projects.for_trainer[active={is_active}]", build)
+
     ## All projects only
     @staticmethod
     async def find_all_projects(limit: int = default_limit, offset: int = default_offset, is_active: bool = False) -> List[Projects]: 
         try:
-            query = projects.select().order_by(projects.c.project_id.desc()).limit(limit).offset(offset).where(projects.c.status == '1' if is_active else True)
-            return await database.fetch_all(query)
+            return await read_database.fetch_all(
+                ProjectsCurdOperation._list_template(bool(is_active)), {"limit": limit, "offset": offset})
         except Exception:
             raise HTTPException(status_code=400, detail="Failed to list projects")
 
     ## All projects with trainer details
     @staticmethod
+    @response_cache.cached("projects")
     async def find_all_projects_with_trainer(limit: int = default_limit, offset: int = default_offset, is_active: bool = False) -> List[ProjectsWithTrainer]:
         try:
             p, ps, e = projects.alias("p"), project_staffing.alias("ps"), employees.alias("e")
@@ -83,7 +178,7 @@ class ProjectsCurdOperation:
                 .offset(offset)
                 .where(p.c.status == '1' if is_active else True)
             )
-            rows = await database.fetch_all(query)
+            rows = await read_database.fetch_all(query)
             return [dict(r) for r in rows]
         except Exception as exc:
             raise HTTPException(status_code=400, detail=f"Failed to list projects with trainer details: {exc}")
@@ -91,30 +186,11 @@ class ProjectsCurdOperation:
     ## Find project and trainer by ID
     @staticmethod
     async def find_project_by_id(project_id: int, trainer_id: str) -> ProjectsWithTrainer:
-        p, ps, e = projects.alias("p"), project_staffing.alias("ps"), employees.alias("e")
-        stmt = (
-            sqlalchemy.select(
-                # project
-                p.c.project_id, p.c.project_name, p.c.active_at, p.c.status,
-                p.c.inactive_at, p.c.created_at, p.c.updated_at,
-                # staffing
-                ps.c.id.label("staffing_id"), ps.c.employees_id,
-                ps.c.gms_manager, ps.c.t_manager, ps.c.pod_lead,
-                ps.c.created_at.label("staffing_created_at"),
-                ps.c.updated_at.label("staffing_updated_at"),
-                # employee
-                e.c.first_name.label("employee_first_name"), e.c.last_name.label("employee_last_name"), e.c.email.label("employee_email"),
-            )
-            .select_from(
-                p.join(ps, ps.c.project_id == p.c.project_id)
-                .outerjoin(e, e.c.employees_id == ps.c.employees_id)
-            )
-            .where(and_(p.c.project_id == project_id, ps.c.employees_id == trainer_id))
-        )
-        row = await database.fetch_one(stmt)
+        row = await read_database.fetch_one(
+            ProjectsCurdOperation.by_id_with_trainer_template, {"project_id": project_id, "trainer_id": trainer_id})
         if not row:
             # fallback: return project-only
-            proj = await database.fetch_one(sqlalchemy.select(projects).where(projects.c.project_id == project_id))
+            proj = await read_database.fetch_one(ProjectsCurdOperation.by_id_template, {"project_id": project_id})
             if not proj:
                 raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
             return dict(proj)
@@ -279,6 +355,7 @@ class ProjectsCurdOperation:
             row = await database.fetch_one(stmt)
             if not row:
                 raise HTTPException(status_code=400, detail="Project create failed")
+            response_cache.invalidate(*PROJECT_CACHE_NAMESPACES)
             return dict(row)
         except HTTPException:
             raise
@@ -291,17 +368,8 @@ class ProjectsCurdOperation:
     ## Add project staffing
     @staticmethod
     async def add_project_staffing(staff: "ProjectStaffingAdd") -> dict:
-        # validate FKs
-        await ProjectsCurdOperation._ensure_project_exists(staff.project_id)
-        await ProjectsCurdOperation._ensure_employee_exists(staff.employees_id)
-
-        # prevent duplicate assignment
-        if await ProjectsCurdOperation._staffing_exists(staff.project_id, staff.employees_id):
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Employee '{staff.employees_id}' is already assigned to project '{staff.project_id}'",
-            )
-
+        # unknown project/employee and duplicate assignment are caught by the FKs and
+        # uq_project_staffing_project_employee
         values = {
             "project_id":  staff.project_id,
             "employees_id": staff.employees_id,
@@ -309,20 +377,15 @@ class ProjectsCurdOperation:
             "t_manager":    staff.t_manager,
             "pod_lead":     staff.pod_lead,
         }
-
+        stmt = sqlalchemy.insert(project_staffing).values(**values).returning(*project_staffing.c)
         try:
-            stmt = sqlalchemy.insert(project_staffing).values(**values).returning(*project_staffing.c)
             row = await database.fetch_one(stmt)
-            if not row:
-                raise HTTPException(status_code=400, detail="Project staffing create failed")
-            return dict(row)
-        except HTTPException:
-            raise
         except Exception as exc:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to create project staffing: {exc}",
-            ) from exc
+            raise ProjectsCurdOperation._staffing_write_error(exc, staff.project_id, staff.employees_id) from exc
+        if not row:
+            raise HTTPException(status_code=400, detail="Project staffing create failed")
+        response_cache.invalidate(*PROJECT_CACHE_NAMESPACES)
+        return dict(row)
     
     ## Add project with staffing
     @staticmethod
@@ -330,46 +393,56 @@ class ProjectsCurdOperation:
         """
         Uses the ProjectWithStaffingAdd variant that includes project fields (via inheritance from ProjectsAdd)
         AND the trainer assignment fields.
+        Both inserts and the employee-name join run as one statement, so they commit or fail together.
         """
-        async with database.transaction():
-            # 3a. create project
-            proj = await ProjectsCurdOperation.add_project(payload)  # reuses method #1
-            project_id = proj["project_id"]
-
-            # 3b. create staffing
-            staff_input = type("Tmp", (), {})()   # minimal shim to reuse method #2
-            staff_input.project_id  = project_id
-            staff_input.employees_id = payload.employees_id
-            staff_input.gms_manager  = getattr(payload, "gms_manager", None)
-            staff_input.t_manager    = getattr(payload, "t_manager", None)
-            staff_input.pod_lead     = getattr(payload, "pod_lead", None)
-
-            print("Staff input:", staff_input)  # Debugging line
-
-            staff = await ProjectsCurdOperation.add_project_staffing(staff_input)  # reuses method #2
-
-            # (optional) include a couple of employee name fields for convenience
-            emp = await database.fetch_one(
-                sqlalchemy.select(employees.c.first_name, employees.c.last_name)
-                .where(employees.c.employees_id == payload.employees_id)
+        new_project = (
+            sqlalchemy.insert(projects)
+            .values(
+                project_name=payload.project_name,
+                active_at=payload.active_at or date.today(),
+                inactive_at=payload.inactive_at,
+                status=payload.status or "1",
             )
-
-            result = {
-                **proj,
-                "staffing_id": staff["id"],
-                "employees_id" : staff["employees_id"], 
-                "gms_manager" : staff["gms_manager"],
-                "t_manager" : staff["t_manager"],
-                "pod_lead" : staff["pod_lead"],
-                "staffing_created_at" : staff["created_at"],
-                "staffing_updated_at" : staff["updated_at"]
-            }
-            
-            if emp:
-                result["employee_first_name"] = emp["first_name"]
-                result["employee_last_name"] = emp["last_name"]
-
-            return result
+            .returning(*projects.c)
+            .cte("new_project")
+        )
+        staff_values = {
+            "employees_id": payload.employees_id,
+            "gms_manager":  getattr(payload, "gms_manager", None),
+            "t_manager":    getattr(payload, "t_manager", None),
+            "pod_lead":     getattr(payload, "pod_lead", None),
+        }
+        new_staffing = (
+            sqlalchemy.insert(project_staffing)
+            .from_select(
+                ["project_id", *staff_values],
+                sqlalchemy.select(
+                    new_project.c.project_id,
+                    *[sqlalchemy.literal(v, project_staffing.c[k].type) for k, v in staff_values.items()],
+                ),
+            )
+            .returning(*project_staffing.c)
+            .cte("new_staffing")
+        )
+        e = employees.alias("e")
+        query = (
+            sqlalchemy.select(*ProjectsCurdOperation._with_trainer_columns(new_project, new_staffing, e))
+            .select_from(
+                new_project.join(new_staffing, new_staffing.c.project_id == new_project.c.project_id)
+                .outerjoin(e, e.c.employees_id == new_staffing.c.employees_id)
+            )
+        )
+        try:
+            row = await database.fetch_one(query)
+        except Exception as exc:
+            # the project is new, so the staffing FK that can fail is the employee's
+            raise constraint_error(
+                exc, not_found={"*": f"Employee '{payload.employees_id}' not found"},
+            ) or HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Project create failed") from exc
+        if not row:
+            raise HTTPException(status_code=400, detail="Project create failed")
+        response_cache.invalidate(*PROJECT_CACHE_NAMESPACES)
+        return dict(row)
     
     ## Update projects and project staffing
     @staticmethod
@@ -393,73 +466,75 @@ class ProjectsCurdOperation:
         if not proj_update and not staff_update:
             return await ProjectsCurdOperation.find_project_by_id(project_id, trainer_id)
 
+        # Each changed table becomes an UPDATE … RETURNING cte; the final select reads the
+        # returned rows (a plain table read in the same statement would see the old values)
+        p = projects
+        if proj_update:
+            p = (
+                sqlalchemy.update(projects)
+                .where(projects.c.project_id == project_id)
+                .values(**proj_update)
+                .returning(*projects.c)
+                .cte("updated_project")
+            )
+        ps = project_staffing
+        if staff_update:
+            ps = (
+                sqlalchemy.update(project_staffing)
+                .where(sqlalchemy.and_(
+                    project_staffing.c.project_id == project_id,
+                    project_staffing.c.employees_id == trainer_id
+                ))
+                .values(**staff_update)
+                .returning(*project_staffing.c)
+                .cte("updated_staffing")
+            )
+        e = employees.alias("e")
+        query = (
+            sqlalchemy.select(*ProjectsCurdOperation._with_trainer_columns(p, ps, e))
+            .select_from(
+                p.outerjoin(ps, sqlalchemy.and_(ps.c.project_id == p.c.project_id, ps.c.employees_id == trainer_id))
+                .outerjoin(e, e.c.employees_id == ps.c.employees_id)
+            )
+            .where(p.c.project_id == project_id)
+        )
         try:
-            async with database.transaction():
-                # Update projects
-                if proj_update:
-                    stmt = (
-                        sqlalchemy.update(projects)
-                        .where(projects.c.project_id == project_id)
-                        .values(**proj_update)
-                    )
-                    await database.execute(stmt)
-
-                # Update project_staffing (must exist; we checked)
-                if staff_update:
-                    stmt = (
-                        sqlalchemy.update(project_staffing)
-                        .where(and_(
-                            project_staffing.c.project_id == project_id,
-                            project_staffing.c.employees_id == trainer_id
-                        ))
-                        .values(**staff_update)
-                    )
-                    await database.execute(stmt)
-
-            # Return a joined view (project + staffing + employee)
-            return await ProjectsCurdOperation.find_project_by_id(project_id, trainer_id)
-
-        except HTTPException:
-            raise
+            row = await database.fetch_one(query)
         except Exception:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Failed to update project and staffing"
             )
+        if not row:
+            raise HTTPException(status_code=404, detail=f"Project '{project_id}' not found")
+        response_cache.invalidate(*PROJECT_CACHE_NAMESPACES)
+        return dict(row)
 
     ## Delete project
     @staticmethod
     async def delete_project(project_id: int, trainer_id: str) -> Dict[str, Any]:
         ps = project_staffing
-        p = projects
-        row_exists_query = sqlalchemy.select(ps.c.id).where(
-            and_(ps.c.project_id == project_id, ps.c.employees_id == trainer_id)
+        query = (
+            ps.delete()
+            .where(ps.c.project_id == project_id, ps.c.employees_id == trainer_id)
+            .returning(ps.c.id)
         )
-        row_exists = await database.fetch_one(row_exists_query)
-        if not row_exists:
+        if await database.fetch_val(query) is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No staffing for project_id={project_id} with trainer_id='{trainer_id}'"
             )
-        query = ps.delete().where(ps.c.project_id == project_id, ps.c.employees_id == trainer_id)
-        await database.execute(query)
+        response_cache.invalidate(*PROJECT_CACHE_NAMESPACES)
         return {"message": "Project ID deleted successfully"}
     
     ## Get Projects by Trainer Name
     @staticmethod
     async def get_projects_for_trainer(trainer_id: str, limit: int = default_limit, offset: int = default_offset, is_active: bool = False) -> List[Projects]:
         try:
-            query = sqlalchemy.select(projects, 
-                                      project_staffing.c.id.label("staffing_id"),
-                                      project_staffing.c.employees_id,
-                                      project_staffing.c.gms_manager,
-                                      project_staffing.c.t_manager,
-                                      project_staffing.c.pod_lead,
-                                      project_staffing.c.created_at.label("staffing_created_at"),
-                                      project_staffing.c.updated_at.label("staffing_updated_at")
-                                      ).select_from(projects.join(project_staffing, project_staffing.c.project_id == projects.c.project_id)
-                                                            ).where(project_staffing.c.employees_id == trainer_id).limit(limit).offset(offset).where(projects.c.status == '1' if is_active else True)
-            res = await database.fetch_all(query)
+            res = await read_database.fetch_all(
+                ProjectsCurdOperation._for_trainer_template(bool(is_active)),
+                {"trainer_id": trainer_id, "limit": limit, "offset": offset},
+            )
             return res
         except Exception:
             raise HTTPException(status_code=400, detail="Failed to list projects for trainer")
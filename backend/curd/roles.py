@@ -2,7 +2,10 @@ from __future__ import annotations
 import datetime, uuid
 from typing import Dict, Any, List, Optional
 from schema.roles import RolesEntry,RolesUpdate, RolesList
-from pg_db import database,roles
+from pg_db import database, read_database,roles
+from cache import response_cache
+from typeahead import employee_names
+from errors import constraint_error
 from sqlalchemy import select, insert, update, delete
 from fastapi import HTTPException, status
 
@@ -49,12 +52,19 @@ class RolesCurdOperation:
             "updated_at": str(updated_at) if updated_at is not None else "",
         }
 
+    @staticmethod
+    def _write_error(exc: Exception) -> HTTPException:
+        return (
+            constraint_error(exc, conflict={"*": "Role name already exists"})
+            or HTTPException(status_code=400, detail="Failed to save role")
+        )
+
     # ───────────────────────── list ─────────────────────────
 
     @staticmethod
     async def find_all_roles() -> List[RolesList]:
         try:
-            rows = await database.fetch_all(select(roles).order_by(roles.c.role_name.asc()))
+            rows = await read_database.fetch_all(select(roles).order_by(roles.c.role_name.asc()))
             return [RolesCurdOperation._to_roles_list_dict(dict(r)) for r in rows]
         except Exception:
             raise HTTPException(status_code=400, detail="Failed to list roles")
@@ -63,80 +73,62 @@ class RolesCurdOperation:
 
     @staticmethod
     async def register_role(role: RolesEntry) -> RolesList:
-        # prevent duplicate names
-        if await RolesCurdOperation._role_name_exists(role.role_name):
-            raise HTTPException(status_code=409, detail="Role name already exists")
-
-        new_role_id = str(uuid.uuid4())
-
-        try:
-            # If your table has server defaults for create_at/updated_at, you can omit them.
-            stmt = (
-                insert(roles)
-                .values(
-                    role_id=new_role_id,
-                    role_name=role.role_name
-                )
+        # duplicate names are rejected by the unique role_name constraint
+        stmt = (
+            insert(roles)
+            .values(
+                role_id=str(uuid.uuid4()),
+                role_name=role.role_name
             )
-            await database.execute(stmt)
-
-            stored = await database.fetch_one(select(roles).where(roles.c.role_id == new_role_id))
-            if not stored:
-                raise HTTPException(status_code=400, detail="Failed to fetch newly created role")
-
-            return RolesCurdOperation._to_roles_list_dict(dict(stored))
-
-        except HTTPException:
-            raise
-        except Exception:
+            .returning(*roles.c)
+        )
+        try:
+            stored = await database.fetch_one(stmt)
+        except Exception as exc:
+            raise RolesCurdOperation._write_error(exc)
+        if not stored:
             raise HTTPException(status_code=400, detail="Failed to create role")
+        employee_names.set_role(stored["role_id"], stored["role_name"])
+        return RolesCurdOperation._to_roles_list_dict(dict(stored))
 
     # ───────────────────────── update ─────────────────────────
 
     @staticmethod
     async def update_role(role_id: str, role: RolesUpdate) -> RolesList:
-        # ensure it exists
-        await RolesCurdOperation._ensure_role_exists(role_id)
-
-        # prevent duplicate name (excluding current role)
-        if await RolesCurdOperation._role_name_exists(role.role_name, exclude_role_id=role_id):
-            raise HTTPException(status_code=409, detail="Role name already exists")
-
-        try:
-            stmt = (
-                update(roles)
-                .where(roles.c.role_id == role_id)
-                .values(
-                    role_name=role.role_name
-                )
+        stmt = (
+            update(roles)
+            .where(roles.c.role_id == role_id)
+            .values(
+                role_name=role.role_name
             )
-            await database.execute(stmt)
-
-            updated = await database.fetch_one(select(roles).where(roles.c.role_id == role_id))
-            if not updated:
-                raise HTTPException(status_code=404, detail="Role not found after update")
-
-            return RolesCurdOperation._to_roles_list_dict(dict(updated))
-
-        except HTTPException:
-            raise
-        except Exception:
-            raise HTTPException(status_code=400, detail="Failed to update role")
+            .returning(*roles.c)
+        )
+        try:
+            updated = await database.fetch_one(stmt)
+        except Exception as exc:
+            raise RolesCurdOperation._write_error(exc)
+        if not updated:
+            raise HTTPException(status_code=404, detail=f"Role '{role_id}' not found")
+        # role_name is shown in the employee listings
+        response_cache.invalidate("employees", "employee_names")
+        employee_names.set_role(updated["role_id"], updated["role_name"])
+        return RolesCurdOperation._to_roles_list_dict(dict(updated))
 
     # ───────────────────────── delete ─────────────────────────
 
     @staticmethod
     async def delete_role(role_id: str) -> Dict[str, Any]:
-        await RolesCurdOperation._ensure_role_exists(role_id)
-
+        stmt = delete(roles).where(roles.c.role_id == role_id).returning(roles.c.role_id)
         try:
-            stmt = delete(roles).where(roles.c.role_id == role_id)
-            await database.execute(stmt)
-            return {"message": "Role deleted successfully", "role_id": role_id}
+            deleted = await database.fetch_val(stmt)
         except Exception:
             # Likely FK violation if employees reference this role
             raise HTTPException(
                 status_code=400,
                 detail="Cannot delete role because it is referenced by other records",
             )
-        
\ No newline at end of file
+        if deleted is None:
+            raise HTTPException(status_code=404, detail=f"Role '{role_id}' not found")
+        response_cache.invalidate("employees", "employee_names")
+        employee_names.drop_role(role_id)
+        return {"message": "Role deleted successfully", "role_id": role_id}
@@ -1,16 +1,53 @@
 from __future__ import annotations
-from typing import Optional, Dict, Any, List
+import csv
+import functools
+import io
+import json
+from typing import Optional, Dict, Any, List, Tuple, AsyncIterator
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pydantic import ValidationError
 from schema.tasks_monitor import TaskMonitorBase,TaskMonitorCreate,TaskMonitorUpdate
-from pg_db import database,task_monitors, employees, projects, project_staffing
+from pg_db import database, read_database,task_monitors, employees, projects, project_staffing, task_daily_rollup, copy_records
+from pagination import encode_cursor, decode_cursor
+from query_templates import QueryTemplate
+from cache import response_cache
 from fastapi import HTTPException, status
-from sqlalchemy import select, insert, update, delete, and_
+from sqlalchemy import select, insert, update, delete, and_, tuple_, any_, bindparam, func, cast, literal_column, true, text
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
 import sqlalchemy
+from sqlalchemy import Date, Integer
+from errors import constraint_error
 
 
 ## Curd Operation for task_monitor Table
 
+# Columns written by bulk ingestion, in COPY order
+BULK_COLUMNS = (
+    "employees_id", "project_id", "task_date",
+    "task_completed", "task_inprogress", "task_reworked",
+    "task_approved", "task_rejected", "task_reviewed",
+    "hours_logged", "description",
+)
+
+# One entry per employee, project and day (uq_task_monitors_emp_proj_date)
+TASK_KEY = ("employees_id", "project_id", "task_date")
+DAILY_CONSTRAINT = "uq_task_monitors_emp_proj_date"
+DUPLICATE_DAILY_DETAIL = "A task entry for this employee, project and date already exists; use PUT /api/tasks/daily"
+
+# Counters summed by the time-series endpoint (same columns on task_daily_rollup)
+SERIES_COUNTERS = (
+    "task_completed", "task_inprogress", "task_reworked",
+    "task_approved", "task_rejected", "task_reviewed",
+)
+
 class TaskMonitorsCurd:
 
+    bulk_max_rows = 50_000
+    series_max_buckets = 1000
+    # default window per bucket size when date_from is omitted
+    series_default_span = {"day": timedelta(days=29), "week": timedelta(weeks=11), "month": timedelta(days=365)}
+
     # helper
     @staticmethod
     async def _task_exists(employees_id: str, project_id: int, task_date) -> bool:
@@ -37,33 +74,34 @@ class TaskMonitorsCurd:
             d["date"] = d["task_date"]
         return d
 
-    ## All projects
     @staticmethod
-    async def find_all_task(
-        limit: int = 100,
-        offset: int = 0,
-        employees_id: Optional[str] = None,
-        project_id: Optional[int] = None,
-        date_from: Optional[str] = None,   # 'YYYY-MM-DD'
-        date_to: Optional[str] = None,     # 'YYYY-MM-DD'
-        ) -> List[TaskMonitorBase]  | None:
-        query = (
+    def next_cursor(rows: List[Dict[str, Any]], limit: int) -> Optional[str]:
+        """Cursor for the page after `rows`, or None when this was the last page."""
+        if len(rows) < limit:
+            return None
+        last = rows[-1]
+        return encode_cursor(last["task_date"], last["task_id"])
+
+    @staticmethod
+    def _joined_select(tm=task_monitors):
+        """Task columns of `tm` (task_monitors or a RETURNING cte) with employee, project and staffing names."""
+        return (
             select(
                 # task fields (keep what you need)
-                task_monitors.c.task_id,
-                task_monitors.c.task_date,
-                task_monitors.c.employees_id,
-                task_monitors.c.project_id,
-                task_monitors.c.task_completed,
-                task_monitors.c.task_inprogress,
-                task_monitors.c.task_reworked,
-                task_monitors.c.task_approved,
-                task_monitors.c.task_rejected,
-                task_monitors.c.task_reviewed,
-                task_monitors.c.hours_logged,
-                task_monitors.c.description,
-                task_monitors.c.created_at,
-                task_monitors.c.updated_at,
+                tm.c.task_id,
+                tm.c.task_date,
+                tm.c.employees_id,
+                tm.c.project_id,
+                tm.c.task_completed,
+                tm.c.task_inprogress,
+                tm.c.task_reworked,
+                tm.c.task_approved,
+                tm.c.task_rejected,
+                tm.c.task_reviewed,
+                tm.c.hours_logged,
+                tm.c.description,
+                tm.c.created_at,
+                tm.c.updated_at,
 
                 # from employees table
                 employees.c.first_name.label("first_name"),
@@ -76,20 +114,61 @@ class TaskMonitorsCurd:
                 project_staffing.c.pod_lead.label("pod_lead"),
             )
             .select_from(
-                task_monitors
-                .join(employees, employees.c.employees_id == task_monitors.c.employees_id)
-                .join(projects, projects.c.project_id == task_monitors.c.project_id)
+                tm
+                .join(employees, employees.c.employees_id == tm.c.employees_id)
+                .join(projects, projects.c.project_id == tm.c.project_id)
                 .outerjoin(
                     project_staffing,
                     and_(
-                        project_staffing.c.project_id == task_monitors.c.project_id,
-                        project_staffing.c.employees_id == task_monitors.c.employees_id
+                        project_staffing.c.project_id == tm.c.project_id,
+                        project_staffing.c.employees_id == tm.c.employees_id
                     )
                 )
             )
+        )
+
+    # Hot lookups: built and compiled once, reused with new bind values
+    by_id_template = QueryTemplate(
+        "tasks.by_id",
+        lambda: TaskMonitorsCurd._joined_select().where(task_monitors.c.task_id == bindparam("task_id")),
+    )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _list_template(by_employee: bool, by_project: bool, has_from: bool, has_to: bool, paging: str) -> QueryTemplate:
+        """Precompiled find_all_task statement for one filter combination; paging is 'first' | 'offset' | 'cursor'."""
+        def build():
+            tm = task_monitors
+            query = TaskMonitorsCurd._joined_select().order_by(tm.c.task_date.desc(), tm.c.task_id.desc())
+            if by_employee:
+                query = query.where(tm.c.employees_id == bindparam("employees_id"))
+            if by_project:
+                query = query.where(tm.c.project_id == bindparam("project_id"))
+            if has_from:
+                query = query.where(tm.c.task_date >= bindparam("date_from"))
+            if has_to:
+                query = query.where(tm.c.task_date <= bindparam("date_to"))
+            if paging == "cursor":
+                query = query.where(tuple_(tm.c.task_date, tm.c.task_id) < tuple_(
+                    bindparam("after_date", type_=Date), bindparam("after_id", type_=Integer)))
+            elif paging == "offset":
+                query = query.offset(bindparam("offset", type_=Integer))
+            return query.limit(bindparam("limit", type_=Integer))
+
+        flags = "".join(k for k, on in zip(("e", "p", "f", "t"), (by_employee, by_project, has_from, has_to)) if on)
+        return QueryTemplate(f"tasks.list[{flags or '-'}:{paging}]", build)
+
+    @staticmethod
+    def _list_query(
+        employees_id: Optional[str] = None,
+        project_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ):
+        """Joined task listing with filters, ordered by (task_date DESC, task_id DESC); no paging."""
+        query = (
+            TaskMonitorsCurd._joined_select()
             .order_by(task_monitors.c.task_date.desc(), task_monitors.c.task_id.desc())
-            .limit(limit)
-            .offset(offset)
         )
         if employees_id:
             query = query.where(task_monitors.c.employees_id == employees_id)
@@ -99,52 +178,212 @@ class TaskMonitorsCurd:
             query = query.where(task_monitors.c.task_date >= date_from)
         if date_to:
             query = query.where(task_monitors.c.task_date <= date_to)
+        return query
+
+    ## All projects
+    @staticmethod
+    async def find_all_task(
+        limit: int = 100,
+        offset: int = 0,
+        employees_id: Optional[str] = None,
+        project_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        cursor: Optional[str] = None,      # from next_cursor(); takes precedence over offset
+        ) -> List[TaskMonitorBase]  | None:
+        values: Dict[str, Any] = {"limit": limit}
+        if cursor:
+            # Keyset seek on (task_date DESC, task_id DESC): cost is independent of page depth
+            values["after_date"], values["after_id"] = decode_cursor(cursor, date.fromisoformat, int)
+            paging = "cursor"
+        elif offset:
+            values["offset"] = offset
+            paging = "offset"
+        else:
+            paging = "first"
+        for name, value in (("employees_id", employees_id), ("project_id", project_id),
+                            ("date_from", date_from), ("date_to", date_to)):
+            if value:
+                values[name] = value
+        template = TaskMonitorsCurd._list_template(
+            bool(employees_id), bool(project_id), bool(date_from), bool(date_to), paging)
 
         try:
-            rows = await database.fetch_all(query)
+            rows = await read_database.fetch_all(template, values)
             return [TaskMonitorsCurd._row_to_output(r) for r in rows]
         except Exception:
             raise HTTPException(status_code=400, detail="Failed to list task monitors")
+
+    ## Streaming export (CSV / NDJSON)
+    @staticmethod
+    def _json_default(value: Any) -> Any:
+        # Same wire format as the TaskMonitorBase responses: ISO dates, Decimal as string
+        if isinstance(value, datetime):
+            return value.isoformat().replace("+00:00", "Z")
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        raise TypeError(f"Unserializable value: {type(value).__name__}")
+
+    @staticmethod
+    async def export_tasks(
+        export_format: str = "ndjson",
+        employees_id: Optional[str] = None,
+        project_id: Optional[int] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        chunk_rows: int = 500,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield the filtered task listing as encoded chunks. Rows come from a server-side
+        cursor (read_database.iterate), so memory use does not grow with the export size.
+        """
+        query = TaskMonitorsCurd._list_query(employees_id, project_id, date_from, date_to)
+        fields = list(TaskMonitorBase.model_fields)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == "csv" else None
+        if writer:
+            writer.writerow(fields)
+
+        pending = 0
+        async for row in read_database.iterate(query):
+            if writer:
+                writer.writerow([
+                    TaskMonitorsCurd._json_default(v) if isinstance(v, (date, Decimal)) else v
+                    for v in (row[f] for f in fields)
+                ])
+            else:
+                buffer.write(json.dumps({f: row[f] for f in fields}, default=TaskMonitorsCurd._json_default))
+                buffer.write("\n")
+            pending += 1
+            if pending >= chunk_rows:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        if buffer.tell():
+            yield buffer.getvalue().encode()
     
-    ## Task by ID
+    ## Bucketed time series
     @staticmethod
-    async def find_task_by_id(task_id: int) -> TaskMonitorBase | None:
+    def _bucket_count(bucket: str, date_from: date, date_to: date) -> int:
+        if bucket == "day":
+            return (date_to - date_from).days + 1
+        if bucket == "week":
+            return (date_to - date_from).days // 7 + 2
+        return (date_to.year - date_from.year) * 12 + date_to.month - date_from.month + 1
+
+    @staticmethod
+    async def find_task_timeseries(
+        group_by: str = "employee",          # 'employee' | 'project'
+        bucket: str = "day",                 # 'day' | 'week' | 'month'
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        employees_id: Optional[str] = None,
+        project_id: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Per-group sums of every task counter and hours_logged, bucketed with date_trunc and
+        gap-filled with generate_series, computed from the task_daily_rollup table.
+        """
+        if bucket not in TaskMonitorsCurd.series_default_span or group_by not in ("employee", "project"):
+            raise HTTPException(status_code=400, detail="Unsupported group_by/bucket")
+        date_to = date_to or date.today()
+        date_from = date_from or date_to - TaskMonitorsCurd.series_default_span[bucket]
+        if date_from > date_to:
+            raise HTTPException(status_code=400, detail="date_from must be on or before date_to")
+        if TaskMonitorsCurd._bucket_count(bucket, date_from, date_to) > TaskMonitorsCurd.series_max_buckets:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many buckets; narrow the date range or use a coarser bucket (max {TaskMonitorsCurd.series_max_buckets})",
+            )
+
+        r = task_daily_rollup.alias("r")
+        key_col = r.c.employees_id if group_by == "employee" else r.c.project_id
+        unit = literal_column(f"'{bucket}'")                     # whitelisted above
+        step = literal_column(f"interval '1 {bucket}'")
+
+        def truncate(value):
+            return cast(func.date_trunc(unit, cast(value, sqlalchemy.DateTime)), sqlalchemy.Date)
+
+        agg = (
+            select(
+                key_col.label("group_key"),
+                truncate(r.c.task_date).label("bucket"),
+                *[func.sum(r.c[c]).label(c) for c in SERIES_COUNTERS],
+                func.sum(r.c.hours_logged).label("hours_logged"),
+            )
+            .where(r.c.task_date >= date_from, r.c.task_date <= date_to)
+            .group_by(key_col, truncate(r.c.task_date))
+        )
+        if employees_id:
+            agg = agg.where(r.c.employees_id == employees_id)
+        if project_id:
+            agg = agg.where(r.c.project_id == project_id)
+        agg = agg.cte("agg")
+
+        buckets = select(
+            cast(
+                func.generate_series(
+                    func.date_trunc(unit, cast(date_from, sqlalchemy.DateTime)),
+                    func.date_trunc(unit, cast(date_to, sqlalchemy.DateTime)),
+                    step,
+                ),
+                sqlalchemy.Date,
+            ).label("bucket")
+        ).cte("buckets")
+
+        groups = select(agg.c.group_key).distinct().cte("groups")
+        if group_by == "employee":
+            label_source = groups.outerjoin(employees, employees.c.employees_id == groups.c.group_key)
+            label = func.concat_ws(" ", employees.c.first_name, employees.c.last_name)
+        else:
+            label_source = groups.outerjoin(projects, projects.c.project_id == groups.c.group_key)
+            label = projects.c.project_name
+
         query = (
             select(
-                task_monitors.c.task_id,
-                task_monitors.c.task_date,
-                task_monitors.c.employees_id,
-                task_monitors.c.project_id,
-                task_monitors.c.task_completed,
-                task_monitors.c.task_inprogress,
-                task_monitors.c.task_reworked,
-                task_monitors.c.task_approved,
-                task_monitors.c.task_rejected,
-                task_monitors.c.task_reviewed,
-                task_monitors.c.hours_logged,
-                task_monitors.c.description,
-                task_monitors.c.created_at,
-                task_monitors.c.updated_at,
-                employees.c.first_name,
-                employees.c.last_name,
-                projects.c.project_name,
-                project_staffing.c.gms_manager.label("manager"),
-                project_staffing.c.t_manager.label("lead"),
-                project_staffing.c.pod_lead.label("pod_lead"),
+                groups.c.group_key,
+                label.label("label"),
+                buckets.c.bucket,
+                *[cast(func.coalesce(agg.c[c], 0), sqlalchemy.BigInteger).label(c) for c in SERIES_COUNTERS],
+                func.coalesce(agg.c.hours_logged, 0).label("hours_logged"),
             )
             .select_from(
-                task_monitors.join(employees, employees.c.employees_id == task_monitors.c.employees_id)
-                  .join(projects, projects.c.project_id == task_monitors.c.project_id)
-                  .outerjoin(
-                      project_staffing,
-                      and_(project_staffing.c.project_id == task_monitors.c.project_id,
-                           project_staffing.c.employees_id == task_monitors.c.employees_id)
-                  )
+                label_source
+                .join(buckets, true())
+                .outerjoin(agg, and_(agg.c.group_key == groups.c.group_key, agg.c.bucket == buckets.c.bucket))
             )
-            .where(task_monitors.c.task_id == task_id)
+            .order_by(groups.c.group_key, buckets.c.bucket)
         )
+
         try:
-            row = await database.fetch_one(query)
+            rows = await read_database.fetch_all(query)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Failed to build task time series")
+
+        series: Dict[Any, Dict[str, Any]] = {}
+        for row in rows:
+            entry = series.setdefault(row["group_key"], {"key": str(row["group_key"]), "label": row["label"], "points": []})
+            entry["points"].append({
+                "bucket": row["bucket"],
+                **{c: row[c] for c in SERIES_COUNTERS},
+                "hours_logged": row["hours_logged"],
+            })
+        return {
+            "group_by": group_by,
+            "bucket": bucket,
+            "date_from": date_from,
+            "date_to": date_to,
+            "series": list(series.values()),
+        }
+
+    ## Task by ID
+    @staticmethod
+    async def find_task_by_id(task_id: int) -> TaskMonitorBase | None:
+        try:
+            row = await read_database.fetch_one(TaskMonitorsCurd.by_id_template, {"task_id": task_id})
             if not row:
                 raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
             return TaskMonitorsCurd._row_to_output(row)
@@ -153,11 +392,24 @@ class TaskMonitorsCurd:
         except Exception:
             raise HTTPException(status_code=400, detail="Failed to fetch task monitor")
 
+    @staticmethod
+    def _write_error(exc: Exception, employees_id: Optional[str], project_id: Optional[int]) -> HTTPException:
+        """409 for a second entry on the same day, 404 for an unknown employee/project, else 400."""
+        return constraint_error(
+            exc,
+            conflict={DAILY_CONSTRAINT: DUPLICATE_DAILY_DETAIL},
+            not_found={
+                "task_monitors_employees_id_fkey": f"Employee '{employees_id}' not found",
+                "task_monitors_project_id_fkey": f"Project '{project_id}' not found",
+                "*": f"Employee '{employees_id}' or project '{project_id}' not found",
+            },
+        ) or HTTPException(status_code=400, detail="Failed to save task monitor")
+
     ## Tasks register
     @staticmethod
     async def register_task(task: TaskMonitorCreate) -> TaskMonitorBase | None:
-
-        query = (
+        # INSERT … RETURNING inside a CTE, joined for the names: one round trip
+        inserted = (
             insert(task_monitors)
             .values(
                 employees_id   = task.employees_id,
@@ -173,59 +425,217 @@ class TaskMonitorsCurd:
                 description    = task.description,          
             )
             .returning(*task_monitors.c)   # ✅ return inserted row
+            .cte("inserted")
         )
         try:
-            row = await database.fetch_one(query)   
-            if not row:
-                raise HTTPException(status_code=400, detail="Insert failed")
-            # Return expanded (with joins)
-            return await TaskMonitorsCurd.find_task_by_id(row["task_id"])
-            # return row
-        except HTTPException:
-            raise
-        except Exception:
-            raise HTTPException(status_code=400, detail="Failed to create task monitor")
+            row = await database.fetch_one(TaskMonitorsCurd._joined_select(inserted))
+        except Exception as exc:
+            raise TaskMonitorsCurd._write_error(exc, task.employees_id, task.project_id)
+        if not row:
+            raise HTTPException(status_code=400, detail="Insert failed")
+        response_cache.invalidate("dashboard")
+        return TaskMonitorsCurd._row_to_output(row)
+
+    ## Daily upsert (idempotent create-or-replace of one day's entry)
+    @staticmethod
+    def _upsert(values: Dict[str, Any]):
+        """INSERT … ON CONFLICT (employee, project, date) DO UPDATE for one entry."""
+        stmt = pg_insert(task_monitors).values(**values)
+        return (
+            stmt.on_conflict_do_update(
+                constraint=DAILY_CONSTRAINT,
+                set_={c: stmt.excluded[c] for c in BULK_COLUMNS if c not in TASK_KEY},
+            )
+            # xmax is 0 only for freshly inserted tuples
+            .returning(*task_monitors.c, literal_column("xmax = 0", sqlalchemy.Boolean).label("inserted"))
+        )
+
+    @staticmethod
+    async def upsert_daily_task(task: TaskMonitorCreate) -> Tuple[Dict[str, Any], bool]:
+        """Create or replace the entry for (employees_id, project_id, task_date) in one statement.
+        Returns the joined row and whether it was newly created."""
+        values = {
+            c: Decimal(str(v)) if isinstance(v, float) else v      # float schema default for hours_logged
+            for c, v in task.model_dump(include=set(BULK_COLUMNS), warnings=False).items()
+        }
+        upserted = TaskMonitorsCurd._upsert(values).cte("upserted")
+        query = TaskMonitorsCurd._joined_select(upserted).add_columns(upserted.c.inserted)
+        try:
+            row = await database.fetch_one(query)
+        except Exception as exc:
+            raise TaskMonitorsCurd._write_error(exc, task.employees_id, task.project_id)
+        if not row:
+            raise HTTPException(status_code=400, detail="Failed to save daily task entry")
+        response_cache.invalidate("dashboard")
+        return TaskMonitorsCurd._row_to_output(row), bool(row["inserted"])
+
+
+    ## Bulk register (JSON array or CSV)
+    @staticmethod
+    def rows_from_csv(data: bytes) -> List[Dict[str, Any]]:
+        """Parse a CSV upload (header row = TaskMonitorCreate field names). Blank cells fall back to defaults."""
+        try:
+            text_data = data.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+        reader = csv.DictReader(io.StringIO(text_data))
+        return [
+            {k.strip(): v for k, v in row.items() if k and v not in ("", None)}
+            for row in reader
+        ]
+
+    @staticmethod
+    async def bulk_register_tasks(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if len(rows) > TaskMonitorsCurd.bulk_max_rows:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Too many rows: {len(rows)} (max {TaskMonitorsCurd.bulk_max_rows})",
+            )
+
+        results: List[Dict[str, Any]] = [{"row": i + 1, "status": "inserted", "errors": []} for i in range(len(rows))]
+        valid: List[Tuple[int, TaskMonitorCreate]] = []
+
+        # 1) Validate every row with the single-create schema
+        for i, raw in enumerate(rows):
+            if not isinstance(raw, dict):
+                results[i].update(status="error", errors=[{"field": "", "message": "Row must be an object"}])
+                continue
+            try:
+                valid.append((i, TaskMonitorCreate.model_validate(raw)))
+            except ValidationError as exc:
+                results[i].update(
+                    status="error",
+                    errors=[
+                        {"field": ".".join(str(p) for p in err["loc"]), "message": err["msg"]}
+                        for err in exc.errors()
+                    ],
+                )
+
+        # 2) Resolve foreign keys with one set-based query per table
+        if valid:
+            emp_ids = {t.employees_id for _, t in valid}
+            proj_ids = {t.project_id for _, t in valid}
+            known_emps = {
+                r["employees_id"] for r in await database.fetch_all(
+                    select(employees.c.employees_id).where(
+                        employees.c.employees_id == any_(bindparam("emp_ids", list(emp_ids), type_=ARRAY(sqlalchemy.String)))
+                    )
+                )
+            }
+            known_projs = {
+                r["project_id"] for r in await database.fetch_all(
+                    select(projects.c.project_id).where(
+                        projects.c.project_id == any_(bindparam("proj_ids", list(proj_ids), type_=ARRAY(sqlalchemy.Integer)))
+                    )
+                )
+            }
+            checked = []
+            for i, t in valid:
+                errors = []
+                if t.employees_id not in known_emps:
+                    errors.append({"field": "employees_id", "message": f"Employee '{t.employees_id}' not found"})
+                if t.project_id not in known_projs:
+                    errors.append({"field": "project_id", "message": f"Project '{t.project_id}' not found"})
+                if errors:
+                    results[i].update(status="error", errors=errors)
+                else:
+                    checked.append((i, t))
+            valid = checked
+
+        # 3) Insert-only, like POST /api/tasks: a repeat of an earlier row's (employee, project, date)
+        #    is a conflict; replacing a day's entry is PUT /api/tasks/daily
+        first: Dict[Tuple[Any, ...], int] = {}
+        unique = []
+        for i, t in valid:
+            key = tuple(getattr(t, c) for c in TASK_KEY)
+            if key in first:
+                results[i].update(status="error", errors=[{
+                    "field": "", "code": "409",
+                    "message": f"Same employee, project and date as row {first[key] + 1}",
+                }])
+                continue
+            first[key] = i
+            unique.append((i, t))
+        valid = unique
+
+        # 4) COPY into a transaction-scoped staging table, then insert what is not there yet
+        if valid:
+            # schema default for hours_logged is a float; COPY's numeric codec wants Decimal
+            records = [
+                tuple(Decimal(str(v)) if isinstance(v, float) else v for v in (getattr(t, c) for c in BULK_COLUMNS))
+                for _, t in valid
+            ]
+            staging = sqlalchemy.table("task_monitors_staging", *[sqlalchemy.column(c) for c in BULK_COLUMNS])
+            try:
+                async with database.transaction():
+                    await database.execute(text(
+                        f"CREATE TEMP TABLE {staging.name} ON COMMIT DROP AS "
+                        f"SELECT {', '.join(BULK_COLUMNS)} FROM task_monitors WITH NO DATA"
+                    ))
+                    await copy_records(staging, BULK_COLUMNS, records)
+                    stored = await database.fetch_all(
+                        pg_insert(task_monitors)
+                        .from_select(list(BULK_COLUMNS), select(staging))
+                        .on_conflict_do_nothing(constraint=DAILY_CONSTRAINT)
+                        .returning(*[task_monitors.c[c] for c in TASK_KEY])
+                    )
+            except Exception:
+                raise HTTPException(status_code=400, detail="Failed to bulk insert task monitors")
+            if stored:
+                response_cache.invalidate("dashboard")
+
+            # rows the insert skipped already have an entry for that day
+            inserted = {tuple(r[c] for c in TASK_KEY) for r in stored}
+            for key, i in first.items():
+                if key not in inserted:
+                    results[i].update(status="error", errors=[
+                        {"field": "", "code": "409", "message": DUPLICATE_DAILY_DETAIL},
+                    ])
+
+        failed = sum(1 for r in results if r["status"] == "error")
+        return {
+            "received": len(rows),
+            "inserted": len(rows) - failed,
+            "failed": failed,
+            "results": results,
+        }
 
-    
     ## Update task_monitors
     @staticmethod
     async def update_task(task_id: int, task: TaskMonitorUpdate) -> TaskMonitorBase | None:
-        # Ensure row exists first (for a nicer 404)
-        await TaskMonitorsCurd.find_task_by_id(task_id)
         # Build partial payload
         update_data = {k: v for k, v in task.dict(exclude_unset=True).items() if v is not None}
         if not update_data:
             # Nothing to change; return current row
             return await TaskMonitorsCurd.find_task_by_id(task_id)
 
-        query = (
+        # UPDATE … RETURNING inside a CTE, joined for the names; no row means no such task
+        updated = (
             task_monitors.update()
             .where(task_monitors.c.task_id == task_id)
             .values(**update_data)
             .returning(*task_monitors.c)   # ✅ return updated row directly
+            .cte("updated")
         )
-        
         try:
-            row = await database.fetch_one(query)  # ✅ execute and fetch row
-            if not row:
-                # Highly unlikely after the pre-check, but safe:
-                raise HTTPException(status_code=404, detail="Task not found after update")
-            return await TaskMonitorsCurd.find_task_by_id(row["task_id"])
-        except HTTPException:
-            raise
-        except Exception:
-            raise HTTPException(status_code=400, detail="Failed to update task monitor")
+            row = await database.fetch_one(TaskMonitorsCurd._joined_select(updated))
+        except Exception as exc:
+            raise TaskMonitorsCurd._write_error(exc, update_data.get("employees_id"), update_data.get("project_id"))
+        if not row:
+            raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
+        response_cache.invalidate("dashboard")
+        return TaskMonitorsCurd._row_to_output(row)
 
 
     @staticmethod
     async def delete_task(task_id: int) -> Dict[str, str]:
-        # Ensure exists
-        await TaskMonitorsCurd.find_task_by_id(task_id)
-
-        stmt = delete(task_monitors).where(task_monitors.c.task_id == task_id)
+        stmt = delete(task_monitors).where(task_monitors.c.task_id == task_id).returning(task_monitors.c.task_id)
         try:
-            await database.execute(stmt)
-            return {"message": "Task deleted successfully"}
+            deleted = await database.fetch_val(stmt)
         except Exception:
             # With ON DELETE CASCADE on FKs from task_monitors, this should be fine.
             raise HTTPException(status_code=400, detail="Failed to delete task monitor")
+        if deleted is None:
+            raise HTTPException(status_code=404, detail=f"Task '{task_id}' not found")
+        response_cache.invalidate("dashboard")
+        return {"message": "Task deleted successfully"}
@@ -3,16 +3,29 @@ from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 
 from schema.users import UserEntry, UserList, UserLogin, UserUpdate
-from pg_db import database, users
+from pg_db import database, read_database, users
 from fastapi import HTTPException
-from passlib.context import CryptContext
 from sqlalchemy import select
-
-# Prefer bcrypt_sha256 first to avoid 72-byte truncation issues
-pwd_context = CryptContext(
-    schemes=["bcrypt_sha256", "bcrypt"],
-    deprecated="auto",
-    bcrypt__truncate_error=False,
+from errors import constraint_error
+from passwords import HasherBusy, password_hasher
+from auth import TokenClaims, token_authority
+
+def busy_error() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many sign-ins in progress, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+# Columns returned to clients (never the password)
+PUBLIC_COLUMNS = (
+    users.c.id,
+    users.c.username,
+    users.c.first_name,
+    users.c.last_name,
+    users.c.gender,
+    users.c.created_at,
+    users.c.status,
 )
 
 class UserCurdOperation:
@@ -20,98 +33,76 @@ class UserCurdOperation:
     @staticmethod
     async def find_all_users() -> List[Dict[str, Any]]:
         # Do NOT select password here
-        query = select(
-            users.c.id,
-            users.c.username,
-            users.c.first_name,
-            users.c.last_name,
-            users.c.gender,
-            users.c.created_at,
-            users.c.status,
-        )
-        rows = await database.fetch_all(query)
+        query = select(*PUBLIC_COLUMNS)
+        rows = await read_database.fetch_all(query)
         return [dict(r) for r in rows]
 
     # -------- Register (Sign Up) --------
     @staticmethod
     async def register_user(user: UserEntry) -> Dict[str, Any]:
-        g_id = str(uuid.uuid1())
         now = datetime.now(timezone.utc)
 
-        #hashed = pwd_context.hash(user.password)
+        try:
+            hashed = await password_hasher.hash(user.password)
+        except HasherBusy:
+            raise busy_error()
 
         ins = users.insert().values(
-            id=g_id,
+            id=str(uuid.uuid1()),
             username=user.username,
-            password=user.password,          # store HASH, not plaintext
+            password=hashed,
             first_name=user.first_name,
             last_name=user.last_name,
             gender=user.gender,
             created_at=now,
             updated_at=now,
             status="1",
-        )
-        await database.execute(ins)
+        ).returning(*PUBLIC_COLUMNS)
+        try:
+            row = await database.fetch_one(ins)
+        except Exception as exc:
+            raise (
+                constraint_error(exc, conflict={"*": "Username already exists"})
+                or HTTPException(status_code=400, detail="Failed to register user")
+            ) from exc
 
         # Return what the response_model expects (no password)
-        return {
-            "id": g_id,
-            "username": user.username,
-            "first_name": user.first_name,
-            "last_name": user.last_name,
-            "gender": user.gender,
-            "created_at": now,
-            "status": "1",
-        }
+        return dict(row)
 
     # -------- Find by ID --------
     @staticmethod
     async def find_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
-        query = select(
-            users.c.id,
-            users.c.username,
-            users.c.first_name,
-            users.c.last_name,
-            users.c.gender,
-            users.c.created_at,
-            users.c.status,
-        ).where(users.c.id == user_id)
+        query = select(*PUBLIC_COLUMNS).where(users.c.id == user_id)
 
-        row = await database.fetch_one(query)
+        row = await read_database.fetch_one(query)
         return dict(row) if row else None
 
     # -------- Update --------
     @staticmethod
-    async def update_user(user: UserUpdate) -> Dict[str, Any]:
-        now = datetime.now(timezone.utc)
-
+    async def update_user(user_id: str, user: UserUpdate) -> Dict[str, Any]:
         upd = (
             users.update()
-            .where(users.c.id == user.id)
+            .where(users.c.id == user_id)
             .values(
                 first_name=user.first_name,
                 last_name=user.last_name,
                 gender=user.gender,
                 status=user.status,
-                updated_at=now,
+                updated_at=datetime.now(timezone.utc),
             )
+            .returning(*PUBLIC_COLUMNS)
         )
-        await database.execute(upd)
-
-        updated = await UserCurdOperation.find_user_by_id(user.id)
+        updated = await database.fetch_one(upd)
         if not updated:
             raise HTTPException(status_code=404, detail="User not found")
-        return updated
+        return dict(updated)
 
     # -------- Delete --------
     @staticmethod
     async def delete_user(user_id: str) -> Dict[str, Any]:
-        exists = await UserCurdOperation.find_user_by_id(user_id)
-        if not exists:
+        dele = users.delete().where(users.c.id == user_id).returning(users.c.id)
+        if await database.fetch_val(dele) is None:
             raise HTTPException(status_code=404, detail="User not found")
-
-        dele = users.delete().where(users.c.id == user_id)
-        await database.execute(dele)
         return {"status": True, "message": "This user has been deleted successfully."}
 
     # -------- Login --------
@@ -129,7 +120,37 @@ class UserCurdOperation:
         if not db_user:
             raise HTTPException(status_code=401, detail="Invalid username or password")
 
-        if not user.password == db_user['password']:
+        try:
+            matches, replacement = await password_hasher.verify_and_update(user.password, db_user["password"])
+        except HasherBusy:
+            raise busy_error()
+        if not matches:
             raise HTTPException(status_code=401, detail="Invalid username or password")
+        # checked after the password, so the response does not reveal account state to guessers;
+        # other workers would accept the token until their disabled_users list is reloaded
+        if db_user["status"] != "1":
+            raise HTTPException(status_code=403, detail="User account is inactive")
+
+        if replacement:
+            # deprecated scheme or legacy plaintext: store the current hash (unless it changed meanwhile)
+            await database.execute(
+                users.update()
+                .where(users.c.id == db_user["id"], users.c.password == db_user["password"])
+                .values(password=replacement, updated_at=datetime.now(timezone.utc))
+            )
 
-        return {"status": True, "message": "Login successful", "user_id": db_user["id"]}
\ No newline at end of file
+        token, claims = token_authority.issue(db_user["id"])
+        return {
+            "status": True,
+            "message": "Login successful",
+            "user_id": db_user["id"],
+            "access_token": token,
+            "token_type": "bearer",
+            "expires_at": datetime.fromtimestamp(claims.exp, tz=timezone.utc),
+        }
+
+    # -------- Logout --------
+    @staticmethod
+    async def logout(claims: TokenClaims) -> Dict[str, Any]:
+        await token_authority.revoke(claims)
+        return {"status": True, "message": "Logged out"}
\ No newline at end of file
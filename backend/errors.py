@@ -1,11 +1,13 @@
-from fastapi import Request
-from fastapi.responses import JSONResponse
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from starlette import status
 
 def http_error_handler(request: Request, exc):
-    # FastAPI’s HTTPException already has status_code & detail
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+    # FastAPI’s HTTPException already has status_code & detail (and optional headers: Retry-After, WWW-Authenticate)
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=getattr(exc, "headers", None))
 
 def validation_exception_handler(request: Request, exc: RequestValidationError):
     return JSONResponse(
@@ -13,9 +15,44 @@ def validation_exception_handler(request: Request, exc: RequestValidationError):
         content={"detail": "Validation error", "errors": exc.errors()},
     )
 
+class NotModified(Exception):
+    """Raised by conditional.conditional_get when the client's copy is current."""
+
+    def __init__(self, headers: Dict[str, str]):
+        self.headers = headers
+
+def not_modified_handler(request: Request, exc: NotModified):
+    # 304 carries the validators but no body
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=exc.headers)
+
 def unhandled_exception_handler(request: Request, exc: Exception):
     # Hide internals from clients; log exc in real apps
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "Internal server error", "code": "INTERNAL_ERROR"},
     )
+
+
+# SQLSTATEs raised by asyncpg for constraint violations
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+
+def constraint_error(
+    exc: Exception,
+    conflict: Optional[Dict[str, str]] = None,
+    not_found: Optional[Dict[str, str]] = None,
+) -> Optional[HTTPException]:
+    """
+    Map a unique / foreign-key violation from a single-statement write to the API's 409 / 404.
+    `conflict` and `not_found` map constraint names to details; "*" matches any other constraint.
+    Returns None for anything else so the caller can fall back to its generic error.
+    """
+    sqlstate = getattr(exc, "sqlstate", None)
+    if sqlstate == UNIQUE_VIOLATION:
+        code, details = status.HTTP_409_CONFLICT, conflict or {}
+    elif sqlstate == FOREIGN_KEY_VIOLATION:
+        code, details = status.HTTP_404_NOT_FOUND, not_found or {}
+    else:
+        return None
+    detail = details.get(getattr(exc, "constraint_name", None) or "", details.get("*"))
+    return HTTPException(status_code=code, detail=detail) if detail else None
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import functools
+from decimal import Decimal
+from typing import Any, Iterable, List, Mapping, Optional, Tuple, Type, Union
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from config import settings
+
+try:
+    import orjson
+except ImportError:                    # optional: falls back to a precompiled pydantic TypeAdapter
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # pydantic's JSON mode writes Decimal as a string ("7.50"); keep the wire format identical
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Unserializable value: {type(value).__name__}")
+
+
+@functools.lru_cache(maxsize=None)
+def _fields(model: Type[BaseModel]) -> Tuple[Tuple[str, Any], ...]:
+    """(name, default) per field in declaration order; required fields default to None."""
+    return tuple(
+        (name, None if info.is_required() else info.get_default(call_default_factory=True))
+        for name, info in model.model_fields.items()
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def dump_rows(rows: Iterable[Mapping[str, Any]], model: Type[BaseModel]) -> bytes:
+    """
+    JSON for `rows` shaped like List[model] — same keys, order and value formats as the
+    response_model path — without validating them. Rows must come from trusted queries
+    whose columns already satisfy the model (our own SELECTs do).
+    """
+    fields = _fields(model)
+    if orjson is not None:
+        projected = [{name: row.get(name, default) for name, default in fields} for row in rows]
+        # OPT_UTC_Z: "…Z" like pydantic instead of "+00:00"; OPT_NON_STR_KEYS never needed here
+        return orjson.dumps(projected, default=_default, option=orjson.OPT_UTC_Z)
+    constructed = [model.model_construct(**{name: row.get(name, default) for name, default in fields}) for row in rows]
+    return _list_adapter(model).dump_json(constructed, warnings=False)
+
+
+def fast_rows(rows: List[Any], model: Type[BaseModel],
+              response: Optional[Response] = None) -> Union[List[Any], Response]:
+    """
+    With FAST_JSON on, the serialized Response for a list endpoint (FastAPI then skips
+    response_model validation and the stdlib json encoder); otherwise `rows` unchanged.
+    Pass the endpoint's injected `response` so headers set on it (cursor, ETag) carry over.
+    """
+    if not settings.FAST_JSON:
+        return rows
+    headers = {k: v for k, v in response.headers.items() if k != "content-length"} if response is not None else None
+    return Response(content=dump_rows(rows, model), media_type="application/json", headers=headers)
@@ -1,19 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import importlib
 import logging
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.exceptions import HTTPException, RequestValidationError
-from pg_db import database
+from pg_db import database, read_database, create_schema, asyncpg_pool
 from config import settings
-from routers.users import router as users_router
-from routers.employees import router as employees_router
-from routers.roles import router as roles_router
-from routers.projects import router as projects_router
-from routers.tasks_monitor import router as tasks_router
-from routers.dashboard import router as dashboard_router
+from pagination import NEXT_CURSOR_HEADER
+from pool_metrics import pool_metrics
+from request_metrics import RequestMetricsMiddleware, request_metrics
+import worker_status
+from auth import require_auth, token_authority
+from conditional import run_change_log_pruner
+from typeahead import employee_names
 from errors import (
+    NotModified,
+    not_modified_handler,
     http_error_handler,
     validation_exception_handler,
     unhandled_exception_handler,
@@ -37,13 +44,35 @@ ALLOWED_ORIGINS = [
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
+    if settings.DB_CREATE_ALL_ON_STARTUP:
+        logger.info("🧱 DB_CREATE_ALL_ON_STARTUP set… creating missing tables")
+        await asyncio.to_thread(create_schema)
     logger.info("🚀 App starting… connecting to DB")
     await database.connect()
+    # pool is built from Settings (pg_db.pool_options) by connect(); instrument it for /internal/pool
+    pool_metrics.install(asyncpg_pool(), settings.DB_POOL_ACQUIRE_TIMEOUT)
+    await read_database.connect()     # replicas that are down are retried later, primary serves meanwhile
+    # under `python -m serve`: publish this worker's status (the first beat marks it ready)
+    heartbeat = asyncio.create_task(worker_status.heartbeat(request_metrics, pool_metrics)) if worker_status.table else None
+    # logged-out tokens / deactivated users, reloaded in the background (first load happens right away)
+    revocations = asyncio.create_task(token_authority.run_refresher(settings.AUTH_REVOCATION_REFRESH_SECONDS))
+    # employee name typeahead: built in the background, /api/employees/names reads the DB until it is ready
+    typeahead = (asyncio.create_task(employee_names.run_refresher(settings.TYPEAHEAD_REFRESH_SECONDS))
+                 if settings.TYPEAHEAD_ENABLED else None)
+    # table_change_log housekeeping (workers take turns through an advisory lock)
+    change_log_pruner = asyncio.create_task(run_change_log_pruner(settings.CHANGE_LOG_PRUNE_SECONDS))
     try:
         yield
     finally:
         # Shutdown
+        revocations.cancel()
+        change_log_pruner.cancel()
+        if typeahead is not None:
+            typeahead.cancel()
+        if heartbeat is not None:
+            heartbeat.cancel()
         logger.info("🛑 App shutting down… disconnecting DB")
+        await read_database.disconnect()
         await database.disconnect()
 
 
@@ -57,9 +86,19 @@ app.add_middleware(
     allow_credentials=True,                   # keep False if you don't use cookies
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"], # allow all HTTP methods
     allow_headers=["*"],                        # add others if you send them
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified"],  # keyset cursor, validators
 )
 
+# Compress large bodies (list endpoints, exports); 304s and small responses pass through
+if settings.GZIP_MIN_SIZE > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MIN_SIZE, compresslevel=settings.GZIP_LEVEL)
+
+# Request metrics — added last so it wraps CORS too and times the whole response
+if settings.METRICS_ENABLED:
+    app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
 # Global error handlers
+app.add_exception_handler(NotModified, not_modified_handler)
 app.add_exception_handler(HTTPException, http_error_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, unhandled_exception_handler)
@@ -67,29 +106,34 @@ app.add_exception_handler(Exception, unhandled_exception_handler)
 # Health
 @app.get("/healthz", tags=["Health"])
 async def healthz():
-    return {"ok": True}
-
-
-## ----------------------------------- USER ENDPOINTS -----------------------------
-
-app.include_router(users_router, prefix="/api")
-    
-## ----------------------------------- EMPLOYEE ENDPOINTS -------------------------
-
-app.include_router(employees_router, prefix="/api")
-
-## ------------------------------------Roles Endpoints-----------------------------
-
-app.include_router(roles_router, prefix="/api")
-
-## ------------------------------------Projects Endpoints-----------------------------
-
-app.include_router(projects_router, prefix="/api")
-
-## ------------------------------------Task Monitors Endpoints-----------------------------
-
-app.include_router(tasks_router, prefix="/api")
+    # plus every worker's status when running under `python -m serve`
+    return {"ok": True, **worker_status.snapshot(settings.DB_POOL_MAX_SIZE)}
+
+# Prometheus scrape endpoint (per worker process)
+@app.get("/metrics", tags=["Health"], include_in_schema=False, response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(request_metrics.prometheus(), media_type="text/plain; version=0.0.4")
+
+
+## ----------------------------------- ROUTERS -----------------------------------
+# (module, prefix) — each module exposes `router`; modules are imported here, once, by name.
+# Deliberately at import, not lazily: building the routes is most of their cost and every worker
+# needs them before its first request, so `python -m serve` pays it once in the preloading master
+# (shared copy-on-write), and app.routes / app.openapi() are complete without the lifespan
+
+ROUTERS = [
+    ("routers.users", "/api"),            # USER ENDPOINTS
+    ("routers.employees", "/api"),        # EMPLOYEE ENDPOINTS
+    ("routers.roles", "/api"),            # Roles Endpoints
+    ("routers.projects", "/api"),         # Projects Endpoints
+    ("routers.tasks_monitor", "/api"),    # Task Monitors Endpoints
+    ("routers.dashboard", "/api"),        # Dashboard Endpoints
+    ("routers.internal", ""),             # Internal Endpoints
+]
 
-## ------------------------------------Dashboard Endpoints-----------------------------
+def include_routers(app: FastAPI) -> None:
+    for module_name, prefix in ROUTERS:
+        # require_auth is a no-op unless AUTH_REQUIRED is set
+        app.include_router(importlib.import_module(module_name).router, prefix=prefix, dependencies=[Depends(require_auth)])
 
-app.include_router(dashboard_router, prefix="/api")
+include_routers(app)
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import hmac
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from config import settings
+from pool_metrics import percentile
+
+
+@lru_cache(maxsize=1)
+def pwd_context():
+    """Password hasher, built on first use so passlib/bcrypt stay off the startup path."""
+    from passlib.context import CryptContext
+
+    # Prefer bcrypt_sha256 first to avoid 72-byte truncation issues; anything else is
+    # verified and then rehashed on login
+    return CryptContext(
+        schemes=["bcrypt_sha256", "bcrypt"],
+        deprecated="auto",
+        bcrypt__truncate_error=False,
+    )
+
+
+class HasherBusy(Exception):
+    """More hash / verify calls are waiting than PASSWORD_HASH_MAX_PENDING allows."""
+
+
+class PasswordHasher:
+    """
+    bcrypt off the event loop.
+
+    Calls run on a dedicated ThreadPoolExecutor of `threads` threads (bcrypt releases the
+    GIL, so they do not stall the loop, and the default executor stays free for
+    everything else). A semaphore admits `threads` calls at a time; the rest wait in
+    FIFO order, and once `max_pending` are waiting new calls fail fast with HasherBusy
+    instead of queueing behind a burst. The pool is created on first use, so a forked
+    worker builds its own.
+    """
+
+    def __init__(self, threads: int, max_pending: int):
+        self.threads = threads
+        self.max_pending = max_pending
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = asyncio.Semaphore(threads)
+        self.waiting = 0
+        self.running = 0
+        self.max_waiting = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.calls: Dict[str, int] = defaultdict(int)
+        self._wait_times: Deque[float] = deque(maxlen=1024)
+        self._run_times: Deque[float] = deque(maxlen=1024)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="pwhash")
+        return self._executor
+
+    async def _call(self, op: str, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.waiting >= self.max_pending:
+            self.rejected += 1
+            raise HasherBusy(f"{self.waiting} password operations already waiting")
+        queued = time.perf_counter()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        started = time.perf_counter()
+        self._wait_times.append(started - queued)
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool(), fn, *args)
+        finally:
+            self.running -= 1
+            self._slots.release()
+            self._run_times.append(time.perf_counter() - started)
+            self.calls[op] += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._call("hash", pwd_context().hash, password)
+
+    async def verify_and_update(self, password: str, stored: str) -> Tuple[bool, Optional[str]]:
+        """
+        (matches, replacement hash or None). The replacement is set when `stored` uses a
+        deprecated scheme or is a legacy plaintext password; the caller should save it.
+        """
+        context = pwd_context()
+        if context.identify(stored, required=False) is None:
+            # rows written before passwords were hashed
+            matches = hmac.compare_digest(password.encode(), stored.encode())
+            replacement = await self.hash(password) if matches else None
+        else:
+            matches, replacement = await self._call("verify", context.verify_and_update, password, stored)
+        if replacement:
+            self.rehashed += 1
+        return matches, replacement
+
+    def stats(self) -> Dict[str, Any]:
+        def ms(samples) -> Dict[str, Optional[float]]:
+            ordered = sorted(samples)
+            return {
+                "p50": round(percentile(ordered, 50) * 1000, 1) if ordered else None,
+                "p99": round(percentile(ordered, 99) * 1000, 1) if ordered else None,
+                "max": round(ordered[-1] * 1000, 1) if ordered else None,
+            }
+
+        return {
+            "threads": self.threads,
+            "max_pending": self.max_pending,
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+            "calls": dict(self.calls),
+            "wait_ms": ms(self._wait_times),
+            "run_ms": ms(self._run_times),
+        }
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_THREADS, settings.PASSWORD_HASH_MAX_PENDING)
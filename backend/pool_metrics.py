@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from fastapi import HTTPException, status
+
+
+class PoolAcquireTimeout(HTTPException):
+    """No pooled connection became free within DB_POOL_ACQUIRE_TIMEOUT."""
+
+    def __init__(self, timeout: float):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Database busy: no connection available within {timeout:g}s",
+        )
+
+
+def percentile(sorted_values, q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100) of an already sorted sequence."""
+    if not sorted_values:
+        return None
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class PoolMetrics:
+    """
+    Wraps the asyncpg pool's `acquire` (what `databases` awaits for every connection)
+    to count waiters, enforce the acquire timeout and record acquire latency.
+    Latencies are kept for the last `window` acquisitions.
+    """
+
+    def __init__(self, window: int = 2048):
+        self.waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.acquire_timeout: Optional[float] = None
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._pool = None
+
+    def install(self, pool, acquire_timeout: Optional[float] = None) -> None:
+        """Call after database.connect(); `pool` is the live asyncpg pool."""
+        self._pool = pool
+        self.acquire_timeout = acquire_timeout
+        original = pool.acquire
+
+        async def acquire(*, timeout: Optional[float] = None):
+            self.waiting += 1
+            started = time.perf_counter()
+            try:
+                connection = await original(timeout=timeout or self.acquire_timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise PoolAcquireTimeout(timeout or self.acquire_timeout)
+            finally:
+                self.waiting -= 1
+            self._latencies.append(time.perf_counter() - started)
+            self.acquired += 1
+            return connection
+
+        pool.acquire = acquire
+
+    def snapshot(self) -> Dict[str, Any]:
+        pool = self._pool
+        if pool is None or pool.is_closing():
+            return {"connected": False}
+        size, idle = pool.get_size(), pool.get_idle_size()
+        latencies = sorted(self._latencies)
+
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+
+        return {
+            "connected": True,
+            "min_size": pool.get_min_size(),
+            "max_size": pool.get_max_size(),
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "waiting": self.waiting,
+            "acquired_total": self.acquired,
+            "acquire_timeouts": self.timeouts,
+            "acquire_timeout_seconds": self.acquire_timeout,
+            "acquire_latency_ms": {
+                "samples": len(latencies),
+                "p50": ms(percentile(latencies, 50)),
+                "p90": ms(percentile(latencies, 90)),
+                "p99": ms(percentile(latencies, 99)),
+                "max": ms(latencies[-1] if latencies else None),
+            },
+        }
+
+
+pool_metrics = PoolMetrics()
@@ -0,0 +1,289 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import sys
+import time
+from collections import deque
+from typing import Any, AsyncGenerator, Deque, Dict, List, Optional, Tuple
+
+import databases
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import asyncpg as pg_asyncpg
+from sqlalchemy.sql import ClauseElement
+
+from config import settings
+from pool_metrics import percentile
+from query_templates import QueryTemplate
+
+logger = logging.getLogger(__name__)
+
+DIALECT = pg_asyncpg.dialect(paramstyle="numeric_dollar")
+_SKIP_MODULES = (__name__, "databases", "replicas", "contextlib", "asyncio")
+
+
+def _as_clause(query, values: Optional[dict] = None):
+    """`databases` also accepts raw SQL strings with :named values; templates stay as they are."""
+    if isinstance(query, str):
+        return text(query).bindparams(**(values or {}))
+    return query
+
+
+def _compiled(query: ClauseElement):
+    return query.compile(dialect=DIALECT, compile_kwargs={"render_postcompile": True})
+
+
+def _compile(query: ClauseElement) -> Tuple[str, List[Any]]:
+    compiled = _compiled(query)
+    params = compiled.construct_params()
+    return str(compiled), [params[name] for name in compiled.positiontup or []]
+
+
+def _caller() -> str:
+    """`module.Class.method` of the nearest frame outside the database layer (the CRUD method)."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(_SKIP_MODULES):
+            return f"{module}.{getattr(frame.f_code, 'co_qualname', frame.f_code.co_name)}"
+        frame = frame.f_back
+    return "?"
+
+
+class _Fingerprint:
+    __slots__ = ("id", "sql", "calls", "errors", "rows", "total", "max", "slow",
+                 "callers", "recent", "explain", "explained_at")
+
+    def __init__(self, sql: str):
+        self.id = hashlib.sha1(sql.encode()).hexdigest()[:12]
+        self.sql = sql
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.slow = 0
+        self.callers: Dict[str, int] = {}
+        self.recent: Deque[float] = deque(maxlen=256)
+        self.explain: Optional[str] = None
+        self.explained_at: Optional[float] = None
+
+
+class QueryStats:
+    """
+    Per-statement-shape timings for every query sent through InstrumentedDatabase.
+
+    A fingerprint is the statement with its bound values stripped: SQLAlchemy's cache key
+    identifies the shape without compiling, and the SQL text is compiled once, the first
+    time a shape is seen. Durations include acquiring the pooled connection. Statements
+    over `slow_ms` are logged; a `explain_sample` fraction of slow SELECTs are re-run
+    under EXPLAIN (ANALYZE, BUFFERS) on a separate pooled connection and the plan is kept.
+    """
+
+    def __init__(self, slow_ms: float = 200.0, explain_sample: float = 0.0,
+                 max_fingerprints: int = 1000, enabled: bool = True):
+        self.enabled = enabled
+        self.slow_ms = slow_ms
+        self.explain_sample = explain_sample
+        self.max_fingerprints = max_fingerprints
+        self.dropped = 0
+        self._by_key: Dict[Any, _Fingerprint] = {}
+        self._explaining = False
+        self.started_at = time.time()
+
+    # ───────────────────────── recording ─────────────────────────
+
+    def fingerprint(self, query) -> Optional[_Fingerprint]:
+        if isinstance(query, QueryTemplate):
+            key, statement = query, query.statement      # already one shape per template
+        else:
+            cache_key = query._generate_cache_key()
+            key, statement = (cache_key.key if cache_key is not None else str(query)), query
+        entry = self._by_key.get(key)
+        if entry is None:
+            if len(self._by_key) >= self.max_fingerprints:
+                self.dropped += 1
+                return None
+            entry = self._by_key[key] = _Fingerprint(" ".join(str(_compiled(statement)).split()))
+        return entry
+
+    def record(self, db: databases.Database, query, caller: str, seconds: float,
+               rows: Optional[int], failed: bool, values: Optional[dict] = None) -> None:
+        entry = self.fingerprint(query)
+        if entry is None:
+            return
+        entry.calls += 1
+        entry.total += seconds
+        entry.recent.append(seconds)
+        if seconds > entry.max:
+            entry.max = seconds
+        if rows:
+            entry.rows += rows
+        if failed:
+            entry.errors += 1
+        if len(entry.callers) < 8 or caller in entry.callers:
+            entry.callers[caller] = entry.callers.get(caller, 0) + 1
+
+        ms = seconds * 1000
+        if ms >= self.slow_ms:
+            entry.slow += 1
+            logger.warning("Slow query %.1f ms [%s] rows=%s caller=%s: %s",
+                           ms, entry.id, rows, caller, entry.sql[:500])
+            if (self.explain_sample and not self._explaining and not failed
+                    and entry.sql.lstrip("( ").upper().startswith(("SELECT", "WITH"))
+                    and not _writes(entry.sql)
+                    and random.random() < self.explain_sample):
+                self._explaining = True
+                asyncio.get_running_loop().create_task(self._explain(db, query, entry, values))
+
+    async def _explain(self, db: databases.Database, query, entry: _Fingerprint,
+                       values: Optional[dict] = None) -> None:
+        # own connection, outside the caller's transaction: uncommitted rows are not visible here
+        try:
+            if isinstance(query, QueryTemplate):
+                compiled = query.compiled(DIALECT)
+                sql, args = compiled.sql, compiled.args(values)
+            else:
+                sql, args = _compile(query)
+            pool = db._backend._pool
+            connection = await pool.acquire()
+            try:
+                rows = await connection.fetch("EXPLAIN (ANALYZE, BUFFERS) " + sql, *args)
+            finally:
+                await pool.release(connection)
+            entry.explain = "\n".join(row[0] for row in rows)
+            entry.explained_at = time.time()
+            logger.warning("EXPLAIN ANALYZE for slow query [%s]:\n%s", entry.id, entry.explain)
+        except Exception:
+            logger.exception("EXPLAIN ANALYZE failed for query [%s]", entry.id)
+        finally:
+            self._explaining = False
+
+    # ───────────────────────── reporting ─────────────────────────
+
+    def reset(self) -> None:
+        self._by_key.clear()
+        self.dropped = 0
+        self.started_at = time.time()
+
+    def snapshot(self, order_by: str = "total", limit: int = 50) -> Dict[str, Any]:
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 3) if value is not None else None
+
+        entries = list(self._by_key.values())
+        sort_keys = {
+            "total": lambda e: e.total,
+            "mean": lambda e: e.total / e.calls if e.calls else 0,
+            "max": lambda e: e.max,
+            "calls": lambda e: e.calls,
+            "slow": lambda e: e.slow,
+        }
+        entries.sort(key=sort_keys.get(order_by, sort_keys["total"]), reverse=True)
+        statements = []
+        for e in entries[:limit]:
+            recent = sorted(e.recent)
+            statements.append({
+                "fingerprint": e.id,
+                "sql": e.sql,
+                "calls": e.calls,
+                "errors": e.errors,
+                "rows": e.rows,
+                "slow": e.slow,
+                "total_ms": ms(e.total),
+                "mean_ms": ms(e.total / e.calls) if e.calls else None,
+                "p95_ms": ms(percentile(recent, 95)),
+                "max_ms": ms(e.max),
+                "callers": dict(sorted(e.callers.items(), key=lambda kv: -kv[1])),
+                "explain": e.explain,
+                "explained_at": e.explained_at,
+            })
+        return {
+            "enabled": self.enabled,
+            "since": self.started_at,
+            "slow_ms": self.slow_ms,
+            "explain_sample": self.explain_sample,
+            "fingerprints": len(self._by_key),
+            "dropped_new_fingerprints": self.dropped,
+            "statements": statements,
+        }
+
+
+_WRITE_RE = re.compile(r"\b(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+def _writes(sql: str) -> bool:
+    # WITH … INSERT/UPDATE/DELETE (and SELECT … FOR UPDATE): EXPLAIN ANALYZE would execute/lock
+    return _WRITE_RE.search(sql) is not None
+
+
+class InstrumentedDatabase(databases.Database):
+    """
+    `databases.Database` whose query API reports each statement to `query_stats`;
+    fetch_all / fetch_one / fetch_val also accept a precompiled QueryTemplate.
+    """
+
+    async def _call(self, method: str, query, values, *args):
+        if isinstance(query, QueryTemplate):
+            return await query.run(self, method, values, *args)
+        return await getattr(super(), method)(query, values, *args)
+
+    async def _timed(self, method: str, query, values, count_rows, *args):
+        stats = query_stats
+        if not stats.enabled:
+            return await self._call(method, query, values, *args)
+        caller = _caller()
+        failed, result = True, None
+        started = time.perf_counter()
+        try:
+            result = await self._call(method, query, values, *args)
+            failed = False
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            values = values if isinstance(values, dict) else None       # execute_many passes a list
+            stats.record(self, _as_clause(query, values), caller, elapsed,
+                         None if failed else count_rows(result), failed, values)
+
+    async def fetch_all(self, query, values: Optional[dict] = None):
+        return await self._timed("fetch_all", query, values, len)
+
+    async def fetch_one(self, query, values: Optional[dict] = None):
+        return await self._timed("fetch_one", query, values, lambda row: int(row is not None))
+
+    async def fetch_val(self, query, values: Optional[dict] = None, column: Any = 0):
+        return await self._timed("fetch_val", query, values, lambda value: int(value is not None), column)
+
+    async def execute(self, query, values: Optional[dict] = None):
+        return await self._timed("execute", query, values, lambda _: None)
+
+    async def execute_many(self, query, values: list):
+        return await self._timed("execute_many", query, values, lambda _: len(values))
+
+    async def iterate(self, query, values: Optional[dict] = None) -> AsyncGenerator[Any, None]:
+        stats = query_stats
+        if not stats.enabled:
+            async for row in super().iterate(query, values):
+                yield row
+            return
+        caller = _caller()
+        rows, failed = 0, True
+        started = time.perf_counter()
+        try:
+            async for row in super().iterate(query, values):
+                rows += 1
+                yield row
+            failed = False
+        finally:
+            # streamed: the duration includes the consumer's time between rows
+            stats.record(self, _as_clause(query, values), caller,
+                         time.perf_counter() - started, rows, failed)
+
+
+query_stats = QueryStats(
+    slow_ms=settings.SLOW_QUERY_MS,
+    explain_sample=settings.SLOW_QUERY_EXPLAIN_SAMPLE,
+    enabled=settings.QUERY_STATS_ENABLED,
+)
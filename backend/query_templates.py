@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from databases.backends.common.records import Record, create_column_maps
+from sqlalchemy.sql import ClauseElement
+
+
+class _Compiled:
+    """One template compiled for one dialect: SQL text, bind order and result-column maps."""
+
+    __slots__ = ("sql", "keys", "defaults", "processors", "result_columns", "column_maps")
+
+    def __init__(self, statement: ClauseElement, dialect):
+        compiled = statement.compile(dialect=dialect)
+        params = compiled.params
+        if compiled.positiontup:                        # positional paramstyle ($1, ?)
+            self.keys: Tuple[str, ...] = tuple(compiled.positiontup)
+            self.sql = compiled.string
+        else:                                           # pyformat: same $n numbering as databases' _compile
+            self.keys = tuple(sorted(params))
+            self.sql = compiled.string % {key: f"${i}" for i, key in enumerate(self.keys, start=1)}
+        self.defaults = params
+        self.processors = compiled._bind_processors
+        self.result_columns = compiled._result_columns
+        self.column_maps = create_column_maps(self.result_columns)
+
+    def args(self, values: Optional[Dict[str, Any]]) -> List[Any]:
+        values = values or {}
+        processors = self.processors
+        out = []
+        for key in self.keys:
+            value = values[key] if key in values else self.defaults[key]
+            out.append(processors[key](value) if key in processors else value)
+        return out
+
+
+class QueryTemplate:
+    """
+    A hot statement built once with bindparam() placeholders and compiled once per dialect.
+
+    Pass it to `database` / `read_database` fetch_all / fetch_one / fetch_val in place of a
+    select(), with the bind values as the `values` dict. The statement is built on first use
+    (so it may reference classes defined later in the module); each call then costs a dict
+    lookup and an argument list instead of building and compiling a new select().
+    Bind parameters must not be `expanding` (IN lists), since those are rendered per call.
+    """
+
+    def __init__(self, name: str, build: Callable[[], ClauseElement]):
+        self.name = name
+        self._build = build
+        self._statement: Optional[ClauseElement] = None
+        self._compiled: Dict[type, _Compiled] = {}
+
+    def __repr__(self) -> str:
+        return f"QueryTemplate({self.name!r})"
+
+    @property
+    def statement(self) -> ClauseElement:
+        if self._statement is None:
+            self._statement = self._build()
+        return self._statement
+
+    def compiled(self, dialect) -> _Compiled:
+        compiled = self._compiled.get(type(dialect))
+        if compiled is None:
+            compiled = self._compiled[type(dialect)] = _Compiled(self.statement, dialect)
+        return compiled
+
+    async def run(self, db, method: str, values: Optional[Dict[str, Any]], column: Any = 0):
+        """Execute on `db` (a databases.Database) through the current task's connection."""
+        compiled = self.compiled(db._backend._dialect)
+        args = compiled.args(values)
+        async with db.connection() as connection:
+            async with connection._query_lock:
+                raw = connection.raw_connection
+                if method == "fetch_all":
+                    rows = await raw.fetch(compiled.sql, *args)
+                    return [self._record(row, compiled, db) for row in rows]
+                row = await raw.fetchrow(compiled.sql, *args)
+        if row is None:
+            return None
+        record = self._record(row, compiled, db)
+        return record if method == "fetch_one" else record[column]
+
+    @staticmethod
+    def _record(row, compiled: _Compiled, db) -> Record:
+        return Record(row, compiled.result_columns, db._backend._dialect, compiled.column_maps)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Type
+
+import asyncpg
+import databases
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean "this replica is unreachable", not "this query is wrong"
+REPLICA_DOWN_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.exceptions.PostgresConnectionError,
+    asyncpg.exceptions.CannotConnectNowError,
+    asyncpg.exceptions.AdminShutdownError,
+    asyncpg.exceptions.TooManyConnectionsError,
+    asyncpg.exceptions.InterfaceError,
+)
+
+
+def in_transaction(db: databases.Database) -> bool:
+    """True when the current task has an open transaction on `db`."""
+    connection = db._global_connection if db._force_rollback else db._connection
+    return bool(connection and connection._transaction_stack)
+
+
+class _Replica:
+    def __init__(self, url: str, options: Dict[str, Any], database_class: Type[databases.Database]):
+        self.database = database_class(url, **options)
+        self.down_since: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.served = 0
+
+    @property
+    def name(self) -> str:
+        return self.database.url.obscure_password
+
+
+class ReadRouter:
+    """
+    Read-only query API (fetch_all / fetch_one / fetch_val / iterate) that round-robins over
+    replica pools and falls back to the primary.
+
+    The primary is used when no replica is configured or healthy, and whenever the current
+    task is inside a transaction on the primary (read-after-write must see its own writes).
+    A replica that fails to connect or drops mid-query is skipped for `retry_after` seconds.
+    """
+
+    def __init__(self, primary: databases.Database, urls: List[str], options: Dict[str, Any],
+                 retry_after: float = 30.0):
+        self.primary = primary
+        self.retry_after = retry_after
+        # replica pools are built like the primary (same class, so the same instrumentation)
+        self.replicas = [_Replica(url, options, type(primary)) for url in urls]
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self.primary_reads = 0
+
+    # ───────────────────────── lifecycle ─────────────────────────
+
+    async def connect(self) -> None:
+        for replica in self.replicas:
+            await self._try_connect(replica)
+
+    async def disconnect(self) -> None:
+        for replica in self.replicas:
+            if replica.database.is_connected:
+                await replica.database.disconnect()
+
+    async def _try_connect(self, replica: _Replica) -> bool:
+        try:
+            await replica.database.connect()
+        except REPLICA_DOWN_ERRORS as exc:
+            self._mark_down(replica, exc)
+            return False
+        replica.down_since = None
+        return True
+
+    def _mark_down(self, replica: _Replica, exc: BaseException) -> None:
+        if replica.down_since is None:
+            logger.warning("Read replica %s unavailable, using primary: %s", replica.name, exc)
+        replica.down_since = time.monotonic()
+        replica.last_error = f"{type(exc).__name__}: {exc}"
+
+    # ───────────────────────── routing ─────────────────────────
+
+    async def _pick(self) -> Optional[_Replica]:
+        if self._cycle is None or in_transaction(self.primary):
+            return None
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.down_since is not None:
+                if time.monotonic() - replica.down_since < self.retry_after:
+                    continue
+                if not replica.database.is_connected and not await self._try_connect(replica):
+                    continue
+                replica.down_since = None
+            if replica.database.is_connected:
+                return replica
+        return None
+
+    async def _run(self, method: str, query, values=None):
+        replica = await self._pick()
+        if replica is not None:
+            try:
+                result = await getattr(replica.database, method)(query, values)
+                replica.served += 1
+                return result
+            except REPLICA_DOWN_ERRORS as exc:
+                self._mark_down(replica, exc)
+        self.primary_reads += 1
+        return await getattr(self.primary, method)(query, values)
+
+    async def fetch_all(self, query, values: Optional[dict] = None):
+        return await self._run("fetch_all", query, values)
+
+    async def fetch_one(self, query, values: Optional[dict] = None):
+        return await self._run("fetch_one", query, values)
+
+    async def fetch_val(self, query, values: Optional[dict] = None):
+        return await self._run("fetch_val", query, values)
+
+    async def iterate(self, query, values: Optional[dict] = None) -> AsyncIterator[Any]:
+        # streaming: no mid-stream failover, only the choice of pool up front
+        replica = await self._pick()
+        if replica is None:
+            self.primary_reads += 1
+        source = replica.database if replica is not None else self.primary
+        async for row in source.iterate(query, values):
+            yield row
+
+    # ───────────────────────── metrics ─────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "replicas": [
+                {
+                    "url": r.name,
+                    "healthy": r.down_since is None and r.database.is_connected,
+                    "down_for_seconds": round(now - r.down_since, 1) if r.down_since is not None else None,
+                    "last_error": r.last_error,
+                    "queries_served": r.served,
+                }
+                for r in self.replicas
+            ],
+            "primary_reads": self.primary_reads,      # no healthy replica, in a transaction, or none configured
+            "retry_after_seconds": self.retry_after,
+        }
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1,
+    0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0,
+)
+QUANTILES = (0.5, 0.95, 0.99)
+UNMATCHED_ROUTE = "<unmatched>"     # 404s on unknown paths share one series (bounded label set)
+
+
+class _Series:
+    """Counters for one (method, route, status): count, sum and per-bucket hits."""
+
+    __slots__ = ("count", "total", "buckets")
+
+    def __init__(self, size: int):
+        self.count = 0
+        self.total = 0.0
+        self.buckets = [0] * size      # preallocated; index len(bounds) is the +Inf bucket
+
+
+def estimate_quantile(bounds: Tuple[float, ...], buckets: List[int], count: int, q: float) -> Optional[float]:
+    """Linear interpolation inside the bucket holding the q-th observation (like histogram_quantile)."""
+    if not count:
+        return None
+    target = q * count
+    seen = 0
+    for i, hits in enumerate(buckets):
+        if hits and seen + hits >= target:
+            lower = bounds[i - 1] if i > 0 else 0.0
+            if i == len(bounds):            # +Inf bucket: best we can say is "above the last bound"
+                return bounds[-1]
+            return lower + (bounds[i] - lower) * (target - seen) / hits
+        seen += hits
+    return bounds[-1]
+
+
+class RequestMetrics:
+    """
+    Request count, error count and latency histogram per route template, method and status.
+
+    Everything runs on the event loop thread, so plain integer increments need no lock;
+    each series allocates its bucket list once and `observe` is a dict lookup, a bisect
+    and three increments. Counts are per worker process (Prometheus sums across targets).
+    """
+
+    def __init__(self, bounds: Iterable[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self._series: Dict[Tuple[str, str, int], _Series] = {}
+        self.errors: Dict[Tuple[str, str], int] = {}
+        self.in_flight = 0
+        self.started_at = time.time()
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        key = (method, route, status)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series(len(self.bounds) + 1)
+        series.count += 1
+        series.total += seconds
+        series.buckets[bisect_left(self.bounds, seconds)] += 1
+        if status >= 500:
+            self.errors[(method, route)] = self.errors.get((method, route), 0) + 1
+
+    def requests_total(self) -> int:
+        return sum(series.count for series in self._series.values())
+
+    # ───────────────────────── export ─────────────────────────
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        le = [_fmt(b) for b in self.bounds] + ["+Inf"]
+        lines = [
+            "# HELP http_requests_total Requests handled, by route template, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        series = sorted(self._series.items(), key=lambda kv: (kv[0][1], kv[0][0], kv[0][2]))
+        for (method, route, status), s in series:
+            lines.append(f"http_requests_total{{{_labels(method, route, status)}}} {s.count}")
+
+        lines += [
+            "# HELP http_request_errors_total Requests that ended in a 5xx or an unhandled exception.",
+            "# TYPE http_request_errors_total counter",
+        ]
+        for (method, route), n in sorted(self.errors.items(), key=lambda kv: (kv[0][1], kv[0][0])):
+            lines.append(f'http_request_errors_total{{method="{method}",route="{_escape(route)}"}} {n}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Request latency, by route template, method and status.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status), s in series:
+            labels = _labels(method, route, status)
+            cumulative = 0
+            for bound, hits in zip(le, s.buckets):
+                cumulative += hits
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {s.total:.6f}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {s.count}")
+
+        lines += [
+            "# HELP http_request_duration_seconds_estimate Quantiles estimated from the histogram buckets.",
+            "# TYPE http_request_duration_seconds_estimate gauge",
+        ]
+        for (method, route, status), s in series:
+            labels = _labels(method, route, status)
+            for q in QUANTILES:
+                value = estimate_quantile(self.bounds, s.buckets, s.count, q)
+                lines.append(f'http_request_duration_seconds_estimate{{{labels},quantile="{q}"}} {value:.6f}')
+
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {self.in_flight}",
+            "# HELP process_start_time_seconds Start time of the process since the epoch.",
+            "# TYPE process_start_time_seconds gauge",
+            f"process_start_time_seconds {self.started_at:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the matched route, e.g. /api/employees/{employeeId}.
+
+    The router leaves the matched route in the (shared) scope. Depending on the FastAPI
+    version its `path` may omit the include_router prefix; the prefix is static here, so
+    it is taken from the leading segments of the actual request path.
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if not template:
+        return UNMATCHED_ROUTE
+    segments = scope["path"].split("/")
+    prefix_len = len(segments) - template.count("/")
+    if prefix_len <= 1:
+        return template
+    return "/".join(segments[:prefix_len]) + template
+
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware (no BaseHTTPMiddleware task/stream overhead) feeding RequestMetrics."""
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        metrics = self.metrics
+        status_code = 500          # stays 500 if the app raises before starting a response
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe(
+                scope["method"],
+                route_template(scope),
+                status_code,
+                time.perf_counter() - started,
+            )
+
+
+def _fmt(bound: float) -> str:
+    return f"{bound:g}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(method: str, route: str, status: int) -> str:
+    return f'method="{method}",route="{_escape(route)}",status="{status}"'
+
+
+request_metrics = RequestMetrics()
@@ -1,14 +1,30 @@
-from fastapi import APIRouter, HTTPException, status
+from datetime import date
+from typing import Optional, Literal
+from fastapi import APIRouter, HTTPException, Query, status
 from curd.dashboard import DashboardCurdOperation
+from conditional import conditional_get
 import logging
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 logger = logging.getLogger(__name__)
 
-@router.get("/summary")
-async def get_dashboard_summary():
+# task_daily_rollup has no updated_at; it changes only with task_monitors
+@router.get("/summary", dependencies=[conditional_get("task_monitors", "employees", "projects", "project_staffing")])
+async def get_dashboard_summary(
+    date_from: Optional[date] = Query(None, description="Only count tasks on or after this date (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="Only count tasks on or before this date (YYYY-MM-DD)"),
+    project_id: Optional[int] = Query(None, description="Restrict the summary to one project"),
+    project_status: Optional[Literal['0', '1']] = Query(None, alias="status", description="Project status: '1' active, '0' inactive"),
+):
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="date_from must be on or before date_to")
     try:
-        data = await DashboardCurdOperation.get_dashboard_summary()
+        data = await DashboardCurdOperation.get_dashboard_summary(
+            date_from=date_from,
+            date_to=date_to,
+            project_id=project_id,
+            status=project_status,
+        )
         return data
     except HTTPException as he:
         # Preserve original FastAPI HTTP errors (e.g., 404/400 you may raise inside the CRUD)
@@ -21,4 +37,4 @@ async def get_dashboard_summary():
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to load dashboard summary: {exc}"
-        ) from exc
\ No newline at end of file
+        ) from exc
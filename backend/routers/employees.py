@@ -1,17 +1,25 @@
-from schema.employees import EmployeesList,EmployeesUpdate, EmployeesEntry
+from schema.employees import EmployeesList,EmployeesUpdate, EmployeesEntry, EmployeeSearchHit, EmployeeImportResult
 from curd.employees import EmployeesCurdOperation
-from fastapi import APIRouter, HTTPException, status
+from pagination import NEXT_CURSOR_HEADER
+from fast_json import fast_rows
+from conditional import conditional_get
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Literal
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/employees", tags=["Employees"])
 
-# Get all employees names and ids
-@router.get("/names")
-async def find_all_employees_name():
+EMPLOYEE_TABLES = ("employees", "roles")
+
+# Get active employees names and ids (typeahead: served from memory)
+@router.get("/names", dependencies=[conditional_get(*EMPLOYEE_TABLES)])
+async def find_all_employees_name(
+    prefix: str = Query("", max_length=100, description="Start of the first or last name, or of the employee id"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="At most this many (default: all matches)"),
+):
     try:
-        return await EmployeesCurdOperation.find_all_employees_name()
+        return await EmployeesCurdOperation.find_employee_names(prefix, limit)
     except HTTPException as he:
         logger.warning("find_all_employees_name HTTPException: %s", he.detail)
         raise
@@ -22,11 +30,43 @@ async def find_all_employees_name():
             detail={"message": "Failed to list employee names", "error": str(exc)},
         )
 
+# Search employees by name / email, best match first
+@router.get("/search", response_model=List[EmployeeSearchHit], dependencies=[conditional_get(*EMPLOYEE_TABLES)])
+async def search_employees(
+    response: Response,
+    q: str = Query(..., min_length=3, max_length=100, description="Name or email fragment; typos are tolerated"),
+    status_flag: Optional[Literal["0", "1"]] = Query(None, description="'1' active, '0' inactive"),
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} response header"),
+):
+    try:
+        rows = await EmployeesCurdOperation.search_employees(q, status_flag=status_flag, limit=limit, cursor=cursor)
+        next_cursor = EmployeesCurdOperation.next_search_cursor(rows, limit)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return fast_rows(rows, EmployeeSearchHit, response)
+    except HTTPException as he:
+        logger.warning("search_employees HTTPException: %s", he.detail)
+        raise
+    except Exception as exc:
+        logger.exception("Failed to search employees")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"message": "Failed to search employees", "error": str(exc)},
+        )
+
 # Get all employees
-@router.get("", response_model=List[EmployeesList])
-async def find_all_employees():
+@router.get("", response_model=List[EmployeesList], dependencies=[conditional_get(*EMPLOYEE_TABLES)])
+async def find_all_employees(
+    response: Response,
+    q: Optional[str] = Query(None, max_length=100, description="Substring of first name, last name or email"),
+    status_flag: Optional[Literal["0", "1"]] = Query(None, description="'1' active, '0' inactive"),
+    limit: int = Query(50, ge=1, le=1000, description="Page size"),
+    offset: int = Query(0, ge=0, description="Rows to skip"),
+):
     try:
-        return await EmployeesCurdOperation.find_all_employees()
+        rows = await EmployeesCurdOperation.find_all_employees(q=q, status_flag=status_flag, limit=limit, offset=offset)
+        return fast_rows(rows, EmployeesList, response)
     except HTTPException as he:
         logger.warning("find_all_employees HTTPException: %s", he.detail)
         raise
@@ -52,8 +92,44 @@ async def register_employee(employee: EmployeesEntry):
             detail={"message": "Failed to create employee", "error": str(exc)},
         )
 
+# Bulk onboarding: CSV upload (multipart field "file", or a raw text/csv body); header = employee field names
+@router.post("/import", response_model=EmployeeImportResult)
+async def import_employees(
+    request: Request,
+    report: Literal["json", "csv"] = Query("json", description="json, or csv for a downloadable per-row report"),
+):
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload a CSV file in form field 'file'")
+        data = await upload.read()
+    elif content_type.startswith(("text/csv", "application/csv")):
+        data = await request.body()
+    else:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Send a CSV file (multipart field 'file' or text/csv)")
+    try:
+        result = await EmployeesCurdOperation.import_employees(data)
+    except HTTPException as he:
+        logger.warning("import_employees HTTPException: %s", he.detail)
+        raise
+    except Exception as exc:
+        logger.exception("Failed to import employees")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"message": "Failed to import employees", "error": str(exc)},
+        )
+    if report == "csv":
+        return Response(
+            EmployeesCurdOperation.import_report_csv(result),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="employees_import_report.csv"'},
+        )
+    return result
+
 # Get employee by ID
-@router.get("/{employeeId}", response_model=EmployeesList)
+@router.get("/{employeeId}", response_model=EmployeesList, dependencies=[conditional_get(*EMPLOYEE_TABLES)])
 async def find_employee_by_id(employeeId: str):
     try:
         result = await EmployeesCurdOperation.find_employees_by_id(employeeId)
@@ -0,0 +1,68 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from cache import response_cache
+from conditional import table_versions
+from config import settings
+from pool_metrics import pool_metrics
+from passwords import password_hasher
+from auth import require_internal, token_authority
+from typeahead import employee_names
+from pg_db import read_database
+from query_stats import query_stats
+
+# Operational endpoints; mounted without the /api prefix. They expose SQL text and plans and
+# can reset stats, so they need INTERNAL_TOKEN (or a loopback caller)
+router = APIRouter(prefix="/internal", tags=["Internal"], dependencies=[Depends(require_internal)])
+
+# Read-cache hit/miss counters
+@router.get("/cache")
+async def cache_stats():
+    return response_cache.stats()
+
+# Conditional GETs: table versions behind the ETags (per worker process)
+@router.get("/versions")
+async def table_version_stats():
+    return table_versions.stats()
+
+# Connection pool: in-use / idle / waiting and acquire latency (per worker process)
+@router.get("/pool")
+async def pool_stats():
+    return {
+        **pool_metrics.snapshot(),
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "max_inactive_connection_lifetime": settings.DB_POOL_MAX_INACTIVE_LIFETIME,
+        "max_queries": settings.DB_POOL_MAX_QUERIES,
+    }
+
+# Password hashing pool: running / waiting (queue depth), rejections, wait and bcrypt time
+@router.get("/passwords")
+async def password_hasher_stats():
+    return password_hasher.stats()
+
+# Session tokens: verification cache hits / misses, rejections by reason, revocation list age
+@router.get("/auth")
+async def auth_stats():
+    return token_authority.stats()
+
+# Employee name typeahead: size, memory footprint, rebuilds and incremental updates (per worker process)
+@router.get("/typeahead")
+async def typeahead_stats():
+    return {"enabled": settings.TYPEAHEAD_ENABLED, **employee_names.stats()}
+
+# Read replicas: health and how many reads each served
+@router.get("/replicas")
+async def replica_stats():
+    return read_database.stats()
+
+# Per-statement timings: fingerprint, calls, latency, rows, calling CRUD method, sampled EXPLAIN ANALYZE
+@router.get("/queries")
+async def query_statistics(
+    order_by: Literal["total", "mean", "max", "calls", "slow"] = Query("total"),
+    limit: int = Query(50, ge=1, le=1000),
+):
+    return query_stats.snapshot(order_by=order_by, limit=limit)
+
+@router.delete("/queries")
+async def reset_query_statistics():
+    query_stats.reset()
+    return {"ok": True}
@@ -1,15 +1,19 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
 from typing import List
 from schema.projects import TrainerProjectUpdate, ProjectStaffingAdd, ProjectWithStaffingAdd, ProjectsWithTrainer
 from curd.projects import ProjectsCurdOperation
+from fast_json import fast_rows
+from conditional import conditional_get
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/projects", tags=["Project Details"])
 
+PROJECT_TABLES = ("projects", "project_staffing", "employees")
+
 # Get projects by Trainer ID
-@router.get("/trainer/{trainer_id}")
+@router.get("/trainer/{trainer_id}", dependencies=[conditional_get(*PROJECT_TABLES)])
 async def get_projects_by_trainer(trainer_id: str):
     try:
         return await ProjectsCurdOperation.get_projects_for_trainer(trainer_id)
@@ -23,10 +27,10 @@ async def get_projects_by_trainer(trainer_id: str):
         ) from exc
 
 # Get all projects
-@router.get("", response_model=List[ProjectsWithTrainer])
-async def find_all_projects():
+@router.get("", response_model=List[ProjectsWithTrainer], dependencies=[conditional_get(*PROJECT_TABLES)])
+async def find_all_projects(response: Response):
     try:
-        return await ProjectsCurdOperation.find_all_projects_with_trainer()
+        return fast_rows(await ProjectsCurdOperation.find_all_projects_with_trainer(), ProjectsWithTrainer, response)
     except HTTPException:
         raise
     except Exception as exc:
@@ -65,7 +69,7 @@ async def assign_trainer_to_project(project: ProjectStaffingAdd):
         ) from exc
 
 # Get project by ID
-@router.get("/{project_Id}", response_model=ProjectsWithTrainer)
+@router.get("/{project_Id}", response_model=ProjectsWithTrainer, dependencies=[conditional_get(*PROJECT_TABLES)])
 async def find_project_by_id(project_Id: int):
     try:
         return await ProjectsCurdOperation.find_project_by_id(project_Id)
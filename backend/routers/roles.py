@@ -2,13 +2,14 @@ from fastapi import APIRouter, HTTPException, status
 import logging
 from schema.roles import RolesList, RolesUpdate, RolesEntry
 from curd.roles import RolesCurdOperation
+from conditional import conditional_get
 from typing import List
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/roles", tags=["Roles"])
 
 # Get all roles
-@router.get("", response_model=List[RolesList])
+@router.get("", response_model=List[RolesList], dependencies=[conditional_get("roles")])
 async def find_all_roles():
     try:
         return await RolesCurdOperation.find_all_roles()
@@ -1,18 +1,47 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 import logging
-from typing import List, Dict, Any
-from schema.tasks_monitor import TaskMonitorBase, TaskMonitorCreate, TaskMonitorUpdate
+from datetime import date
+from typing import List, Dict, Any, Optional, Literal
+from schema.tasks_monitor import TaskMonitorBase, TaskMonitorCreate, TaskMonitorUpdate, TaskBulkResult, TaskTimeSeries
 from curd.tasks_monitor import TaskMonitorsCurd
+from pagination import NEXT_CURSOR_HEADER
+from fast_json import fast_rows
+from conditional import conditional_get
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
+# tables behind the task reads (names come from employees / projects / staffing; the rollup from tasks)
+TASK_TABLES = ("task_monitors", "employees", "projects", "project_staffing")
+
 # Get all Tasks
-@router.get("", response_model=List[TaskMonitorBase])
-async def find_all_task():
+@router.get("", response_model=List[TaskMonitorBase], dependencies=[conditional_get(*TASK_TABLES)])
+async def find_all_task(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000, description="Page size"),
+    offset: int = Query(0, ge=0, description="Rows to skip (ignored when cursor is given; prefer cursor)"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} response header"),
+    employees_id: Optional[str] = Query(None, description="Filter by employee"),
+    project_id: Optional[int] = Query(None, description="Filter by project"),
+    date_from: Optional[date] = Query(None, description="Tasks on or after this date (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="Tasks on or before this date (YYYY-MM-DD)"),
+):
     try:
-        return await TaskMonitorsCurd.find_all_task()
+        rows = await TaskMonitorsCurd.find_all_task(
+            limit=limit,
+            offset=offset,
+            employees_id=employees_id,
+            project_id=project_id,
+            date_from=date_from,
+            date_to=date_to,
+            cursor=cursor,
+        )
+        next_cursor = TaskMonitorsCurd.next_cursor(rows, limit)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return fast_rows(rows, TaskMonitorBase, response)
     except HTTPException as he:
         logger.warning("find_all_task HTTPException: %s", he.detail)
         raise
@@ -38,8 +67,108 @@ async def register_task(task: TaskMonitorCreate):
             detail={"message": "Failed to create task", "error": str(exc)},
         )
 
+# Create or replace the entry for (employees_id, project_id, task_date); safe to retry
+@router.put("/daily", response_model=TaskMonitorBase)
+async def upsert_daily_task(task: TaskMonitorCreate, response: Response):
+    try:
+        row, created = await TaskMonitorsCurd.upsert_daily_task(task)
+        response.status_code = status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        return row
+    except HTTPException as he:
+        logger.warning("upsert_daily_task HTTPException: %s", he.detail)
+        raise
+    except Exception as exc:
+        logger.exception("Failed to upsert daily task")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"message": "Failed to save daily task entry", "error": str(exc)},
+        )
+
+# Bucketed productivity time series
+@router.get("/timeseries", response_model=TaskTimeSeries, dependencies=[conditional_get(*TASK_TABLES)])
+async def find_task_timeseries(
+    group_by: Literal["employee", "project"] = Query("employee", description="One series per employee or per project"),
+    bucket: Literal["day", "week", "month"] = Query("day", description="Bucket size"),
+    date_from: Optional[date] = Query(None, description="Start of the window (default depends on bucket)"),
+    date_to: Optional[date] = Query(None, description="End of the window (default today)"),
+    employees_id: Optional[str] = Query(None, description="Filter by employee"),
+    project_id: Optional[int] = Query(None, description="Filter by project"),
+):
+    try:
+        return await TaskMonitorsCurd.find_task_timeseries(
+            group_by=group_by,
+            bucket=bucket,
+            date_from=date_from,
+            date_to=date_to,
+            employees_id=employees_id,
+            project_id=project_id,
+        )
+    except HTTPException as he:
+        logger.warning("find_task_timeseries HTTPException: %s", he.detail)
+        raise
+    except Exception as exc:
+        logger.exception("Failed to build task time series")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"message": "Failed to build task time series", "error": str(exc)},
+        )
+
+# Export Tasks (streamed; same filters as the listing)
+@router.get("/export")
+async def export_tasks(
+    export_format: Literal["csv", "ndjson"] = Query("ndjson", alias="format", description="csv or ndjson"),
+    employees_id: Optional[str] = Query(None, description="Filter by employee"),
+    project_id: Optional[int] = Query(None, description="Filter by project"),
+    date_from: Optional[date] = Query(None, description="Tasks on or after this date (YYYY-MM-DD)"),
+    date_to: Optional[date] = Query(None, description="Tasks on or before this date (YYYY-MM-DD)"),
+):
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+    stream = TaskMonitorsCurd.export_tasks(
+        export_format=export_format,
+        employees_id=employees_id,
+        project_id=project_id,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    return StreamingResponse(
+        stream,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{export_format}"'},
+    )
+
+# Bulk register Tasks (JSON array body, raw text/csv body, or multipart CSV upload in field "file")
+@router.post("/bulk", response_model=TaskBulkResult)
+async def bulk_register_tasks(request: Request):
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Upload a CSV file in form field 'file'")
+        rows = TaskMonitorsCurd.rows_from_csv(await upload.read())
+    elif content_type.startswith(("text/csv", "application/csv")):
+        rows = TaskMonitorsCurd.rows_from_csv(await request.body())
+    else:
+        try:
+            rows = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array of tasks")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array of tasks")
+    try:
+        return await TaskMonitorsCurd.bulk_register_tasks(rows)
+    except HTTPException as he:
+        logger.warning("bulk_register_tasks HTTPException: %s", he.detail)
+        raise
+    except Exception as exc:
+        logger.exception("Failed to bulk create tasks")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"message": "Failed to bulk create tasks", "error": str(exc)},
+        )
+
 # Get Task by ID
-@router.get("/{task_id}", response_model=TaskMonitorBase)
+@router.get("/{task_id}", response_model=TaskMonitorBase, dependencies=[conditional_get(*TASK_TABLES)])
 async def find_task_by_id(task_id: int):
     try:
         result = await TaskMonitorsCurd.find_task_by_id(task_id)
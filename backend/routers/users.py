@@ -1,9 +1,10 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
 import logging
 
 from schema.users import UserList, UserEntry, UserUpdate, UserLogin
 from curd.users import UserCurdOperation
+from auth import TokenClaims, current_user
 
 router = APIRouter(prefix="/users", tags=["Users"])
 logger = logging.getLogger(__name__)
@@ -114,3 +115,18 @@ async def login(user: UserLogin):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error during login: {exc}"
         ) from exc
+
+# Logout (revokes the bearer token used for this request)
+@router.post("/logout")
+async def logout(claims: TokenClaims = Depends(current_user)):
+    try:
+        return await UserCurdOperation.logout(claims)
+    except HTTPException as he:
+        logger.warning("logout HTTPException: %s", he.detail)
+        raise
+    except Exception as exc:
+        logger.exception("Logout failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error during logout"
+        ) from exc
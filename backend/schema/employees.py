@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Optional, Literal
+from typing import Dict, List, Optional, Literal
 from pydantic import BaseModel, Field, EmailStr, condecimal, constr
 from datetime import date, datetime
 from decimal import Decimal
@@ -33,6 +33,9 @@ class EmployeesList(BaseModel):
     created_at    : Optional[datetime] = Field(..., description="Timestamp when the employee record was created")
     updated_at    : Optional[datetime] = Field(..., description="Timestamp when the employee record was last updated")
 
+class EmployeeSearchHit(EmployeesList):
+    score         : float = Field(..., description="Best pg_trgm word similarity of the query to the name or email (0-1)")
+
 class EmployeesEntry(BaseModel):
     employees_id  : EmployeeId
     first_name    : constr(strip_whitespace=True, min_length=1, max_length=100) = Field(..., description="First name of the employee")  
@@ -68,3 +71,20 @@ class EmployeesUpdate(BaseModel):
     active_at     : Optional[date] = Field(default_factory=date.today, description="Date when the employee became active")
     inactive_at   : Optional[date] = Field(None, description="Date when the employee became inactive")
     status        : Optional[StatusFlag] = Field('1', description="Active='1', Inactive='0'")
+
+
+class EmployeeImportRowResult(BaseModel):
+    """Outcome of one data row of a CSV import"""
+    row           : int = Field(..., description="1-based data row in the CSV (the header is row 0)")
+    status        : Literal["inserted", "error"] = Field(..., description="Stored, or rejected")
+    employees_id  : Optional[str] = Field(None, description="employees_id as given in the row")
+    email         : Optional[str] = Field(None, description="email as given in the row")
+    errors        : List[Dict[str, str]] = Field(default_factory=list, description="Field-level problems for rejected rows")
+
+
+class EmployeeImportResult(BaseModel):
+    """Per-row report returned by POST /employees/import"""
+    received      : int = Field(..., description="Data rows in the CSV")
+    inserted      : int = Field(..., description="Employees created")
+    failed        : int = Field(..., description="Rows rejected")
+    results       : List[EmployeeImportRowResult] = Field(..., description="One entry per data row, in order")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel,Field
-from typing import Optional, Annotated
+from typing import Optional, Annotated, List, Dict, Literal
 from datetime import date, datetime
 from decimal import Decimal
 
@@ -62,3 +62,46 @@ class TaskMonitorUpdate(BaseModel):
     task_reviewed   : Optional[NonNegativeInt] = Field(0, description="Number of tasks reviewed")
     hours_logged    : Optional[HoursLogged] = Field(0.00, description="Hours logged")
     description     : Optional[str] = Field(None, description="Description of the tasks")
+
+
+class TaskSeriesPoint(BaseModel):
+    """Sums for one time bucket"""
+    bucket          : date = Field(..., description="First day of the bucket")
+    task_completed  : int = Field(0, description="Tasks completed in the bucket")
+    task_inprogress : int = Field(0, description="Tasks in progress in the bucket")
+    task_reworked   : int = Field(0, description="Tasks reworked in the bucket")
+    task_approved   : int = Field(0, description="Tasks approved in the bucket")
+    task_rejected   : int = Field(0, description="Tasks rejected in the bucket")
+    task_reviewed   : int = Field(0, description="Tasks reviewed in the bucket")
+    hours_logged    : Decimal = Field(0, description="Hours logged in the bucket")
+
+
+class TaskSeries(BaseModel):
+    """One employee's or project's series"""
+    key             : str = Field(..., description="employees_id or project_id")
+    label           : Optional[str] = Field(None, description="Employee full name or project name")
+    points          : List[TaskSeriesPoint] = Field(..., description="One point per bucket, gaps filled with zeros")
+
+
+class TaskTimeSeries(BaseModel):
+    """Response of GET /tasks/timeseries"""
+    group_by        : Literal["employee", "project"]
+    bucket          : Literal["day", "week", "month"]
+    date_from       : date
+    date_to         : date
+    series          : List[TaskSeries]
+
+
+class TaskBulkRowResult(BaseModel):
+    """Outcome of one row of a bulk submission"""
+    row             : int = Field(..., description="1-based position of the row in the submitted batch")
+    status          : Literal["inserted", "error"] = Field(..., description="Whether the row was stored")
+    errors          : List[Dict[str, str]] = Field(default_factory=list, description="Field-level problems for rejected rows; \"code\": \"409\" marks an entry that already exists for that day")
+
+
+class TaskBulkResult(BaseModel):
+    """Per-row report returned by POST /tasks/bulk"""
+    received        : int = Field(..., description="Rows in the submission")
+    inserted        : int = Field(..., description="Rows stored as new daily entries")
+    failed          : int = Field(..., description="Rows rejected")
+    results         : List[TaskBulkRowResult] = Field(..., description="One entry per submitted row, in order")
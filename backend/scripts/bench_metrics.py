@@ -0,0 +1,60 @@
+# scripts/bench_metrics.py
+#
+# Per-request cost of the /metrics middleware: a trivial ASGI app called directly,
+# with and without RequestMetricsMiddleware around it. No database needed.
+#
+#   python -m scripts.bench_metrics [--requests 200000]
+import argparse
+import asyncio
+import time
+
+from request_metrics import RequestMetrics, RequestMetricsMiddleware
+
+
+class _Route:
+    path = "/employees/{employeeId}"
+
+
+async def _app(scope, receive, send):
+    scope["route"] = _Route
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message):
+    pass
+
+
+async def _run(app, n: int) -> float:
+    started = time.perf_counter()
+    for i in range(n):
+        scope = {"type": "http", "method": "GET", "path": f"/api/employees/E{i % 100}"}
+        await app(scope, _receive, _send)
+    return time.perf_counter() - started
+
+
+async def main(n: int) -> None:
+    metrics = RequestMetrics()
+    bare = await _run(_app, n)
+    wrapped = await _run(RequestMetricsMiddleware(_app, metrics=metrics), n)
+    started = time.perf_counter()
+    body = metrics.prometheus()
+    render_ms = (time.perf_counter() - started) * 1000
+
+    overhead_us = (wrapped - bare) / n * 1e6
+    print(f"requests            {n}")
+    print(f"bare app            {bare / n * 1e6:8.2f} µs/request")
+    print(f"with metrics        {wrapped / n * 1e6:8.2f} µs/request")
+    print(f"overhead            {overhead_us:8.2f} µs/request  (~{1e6 / overhead_us:,.0f} req/s of one core)"
+          if overhead_us > 0 else "overhead            below timer noise")
+    print(f"/metrics render     {render_ms:8.2f} ms ({len(body)} bytes)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Overhead of the request metrics middleware")
+    parser.add_argument("--requests", type=int, default=200_000)
+    asyncio.run(main(parser.parse_args().requests))
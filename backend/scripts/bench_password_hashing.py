@@ -0,0 +1,69 @@
+# scripts/bench_password_hashing.py
+#
+# What a login burst does to everything else on the worker: runs --logins concurrent
+# bcrypt verifies while a ticker measures event-loop lag (the delay any other request,
+# e.g. GET /api/tasks, would see before it gets to run). Compares verifying inline on the
+# loop with passwords.PasswordHasher (dedicated thread pool). No database needed.
+#
+#   python -m scripts.bench_password_hashing [--logins 20] [--threads 2]
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+from passwords import PasswordHasher, pwd_context
+from pool_metrics import percentile
+
+TICK_SECONDS = 0.005
+
+
+async def ticker(lags: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        expected = time.perf_counter() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def burst(mode: str, logins: int, stored: str, threads: int) -> Dict[str, float]:
+    hasher = PasswordHasher(threads=threads, max_pending=logins)
+    lags: List[float] = []
+    stop = asyncio.Event()
+    tick = asyncio.create_task(ticker(lags, stop))
+    await asyncio.sleep(0.05)
+
+    async def login_inline():
+        pwd_context().verify("S3cureP@ss", stored)    # what an un-offloaded login does
+
+    async def login_pooled():
+        await hasher.verify_and_update("S3cureP@ss", stored)
+
+    started = time.perf_counter()
+    await asyncio.gather(*((login_inline if mode == "inline" else login_pooled)() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await tick
+    lags.sort()
+    return {
+        "elapsed_s": elapsed,
+        "lag_p50_ms": percentile(lags, 50) * 1000,
+        "lag_p99_ms": percentile(lags, 99) * 1000,
+        "lag_max_ms": lags[-1] * 1000,
+    }
+
+
+async def main(logins: int, threads: int) -> None:
+    stored = pwd_context().hash("S3cureP@ss")         # also loads the bcrypt backend up front
+    print(f"{logins} concurrent logins, {pwd_context().identify(stored)} ({pwd_context().handler().default_rounds} rounds)")
+    print(f"{'mode':<16}{'burst s':>9}{'loop lag p50':>14}{'p99':>9}{'max':>9}  (ms)")
+    for mode in ("inline", "pooled"):
+        r = await burst(mode, logins, stored, threads)
+        label = mode if mode == "inline" else f"pooled ({threads} thr)"
+        print(f"{label:<16}{r['elapsed_s']:>9.2f}{r['lag_p50_ms']:>14.1f}{r['lag_p99_ms']:>9.1f}{r['lag_max_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Event-loop lag during a login burst: inline vs thread pool")
+    parser.add_argument("--logins", type=int, default=20)
+    parser.add_argument("--threads", type=int, default=2)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.threads))
@@ -0,0 +1,73 @@
+# scripts/bench_query_templates.py
+#
+# CPU per call of the hot read statements: building a select() and compiling it the way
+# `databases` does on every call, versus a precompiled QueryTemplate (bind-argument list
+# only). No database needed; process CPU time is measured.
+#
+#   python -m scripts.bench_query_templates [--calls 2000]
+import argparse
+import time
+from datetime import date
+
+from sqlalchemy import tuple_
+
+from pg_db import database, projects, task_monitors
+from curd.employees import EmployeesCurdOperation
+from curd.projects import ProjectsCurdOperation
+from curd.tasks_monitor import TaskMonitorsCurd
+
+
+def _cases():
+    """(name, per-call build of the old statement, template, bind values)"""
+    day, emp = date(2026, 5, 1), "EMP000001"
+    return [
+        ("tasks: by id",
+         lambda: TaskMonitorsCurd._joined_select().where(task_monitors.c.task_id == 42),
+         TaskMonitorsCurd.by_id_template, {"task_id": 42}),
+        ("tasks: first page",
+         lambda: TaskMonitorsCurd._list_query().limit(100),
+         TaskMonitorsCurd._list_template(False, False, False, False, "first"), {"limit": 100}),
+        ("tasks: employee + window, keyset",
+         lambda: TaskMonitorsCurd._list_query(emp, None, day, day).limit(100).where(
+             tuple_(task_monitors.c.task_date, task_monitors.c.task_id) < tuple_(day, 1000)),
+         TaskMonitorsCurd._list_template(True, False, True, True, "cursor"),
+         {"employees_id": emp, "date_from": day, "date_to": day, "after_date": day, "after_id": 1000, "limit": 100}),
+        ("employees: by id",
+         lambda: EmployeesCurdOperation._by_id_select().params(employees_id=emp),
+         EmployeesCurdOperation.by_id_template, {"employees_id": emp}),
+        ("projects: by id + trainer",
+         lambda: ProjectsCurdOperation._by_id_with_trainer_select().params(project_id=101, trainer_id=emp),
+         ProjectsCurdOperation.by_id_with_trainer_template, {"project_id": 101, "trainer_id": emp}),
+        ("projects: for trainer",
+         lambda: ProjectsCurdOperation._for_trainer_template(False)._build().params(trainer_id=emp, limit=500, offset=0),
+         ProjectsCurdOperation._for_trainer_template(False), {"trainer_id": emp, "limit": 500, "offset": 0}),
+        ("projects: list",
+         lambda: projects.select().order_by(projects.c.project_id.desc()).limit(500).offset(0),
+         ProjectsCurdOperation._list_template(False), {"limit": 500, "offset": 0}),
+    ]
+
+
+def _cpu_us(fn, calls: int) -> float:
+    started = time.process_time()
+    for _ in range(calls):
+        fn()
+    return (time.process_time() - started) / calls * 1e6
+
+
+def main(calls: int) -> None:
+    backend = database._backend
+    connection = backend.connection()          # only its _compile() is used; nothing connects
+    dialect = backend._dialect
+
+    print(f"{'statement':<36}{'build+compile':>15}{'template':>11}{'saved':>10}   (µs CPU per call)")
+    for name, build, template, values in _cases():
+        template.compiled(dialect)             # first use compiles once, outside the timing
+        before = _cpu_us(lambda: connection._compile(build()), calls)
+        after = _cpu_us(lambda: template.compiled(dialect).args(values), calls)
+        print(f"{name:<36}{before:>15.1f}{after:>11.1f}{before - after:>10.1f}  ({before / after:,.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-call CPU: select() build + compile vs precompiled template")
+    parser.add_argument("--calls", type=int, default=2000)
+    main(parser.parse_args().calls)
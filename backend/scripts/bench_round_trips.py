@@ -0,0 +1,167 @@
+# scripts/bench_round_trips.py
+#
+# Counts database round trips and wall time per CRUD write against a seeded database.
+# Every write runs inside a transaction that is rolled back, so the data is left untouched.
+#
+#   python -m scripts.bench_round_trips [--repeat 20]
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import timedelta
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+
+from pg_db import database
+from curd.employees import EmployeesCurdOperation
+from curd.projects import ProjectsCurdOperation
+from curd.roles import RolesCurdOperation
+from curd.tasks_monitor import TaskMonitorsCurd
+from curd.users import UserCurdOperation
+from schema.employees import EmployeesEntry, EmployeesUpdate
+from schema.projects import ProjectStaffingAdd, ProjectWithStaffingAdd, TrainerProjectUpdate
+from schema.roles import RolesEntry, RolesUpdate
+from schema.tasks_monitor import TaskMonitorCreate, TaskMonitorUpdate
+from schema.users import UserEntry, UserUpdate
+
+# Round trips per call before the writes became single statements (check-then-write-then-refetch)
+BASELINE = {
+    "task: register": 2,
+    "task: update": 3,
+    "task: delete": 2,
+    "employee: register": 4,
+    "employee: update": 4,
+    "employee: delete": 2,
+    "role: register": 3,
+    "role: update": 4,
+    "role: delete": 2,
+    "project: add staffing": 4,
+    "project: add with staff": 6,
+    "project: update": 4,
+    "project: delete": 2,
+    "user: register": 1,
+    "user: update": 2,
+    "user: delete": 2,
+}
+
+
+class RoundTripCounter:
+    """Counts statements sent through the `databases` query API."""
+
+    def __init__(self):
+        self.count = 0
+        self._names = ("fetch_all", "fetch_one", "fetch_val", "execute", "execute_many")
+
+    def install(self) -> None:
+        for name in self._names:
+            original = getattr(database, name)
+
+            async def wrapper(*args, _original=original, **kwargs):
+                self.count += 1
+                return await _original(*args, **kwargs)
+
+            setattr(database, name, wrapper)
+
+    def uninstall(self) -> None:
+        for name in self._names:
+            delattr(database, name)
+
+
+async def _sample() -> Dict[str, Any]:
+    row = await database.fetch_one(text(
+        "SELECT tm.task_id, tm.employees_id, tm.project_id, tm.task_date, e.email, e.role "
+        "FROM task_monitors tm "
+        "JOIN employees e ON e.employees_id = tm.employees_id "
+        "JOIN project_staffing ps ON ps.project_id = tm.project_id AND ps.employees_id = tm.employees_id "
+        "LIMIT 1"
+    ))
+    if row is None:
+        sys.exit("No staffed task rows found; seed the database first (python -m scripts.seed)")
+    role_id = await database.fetch_val(text("SELECT role_id FROM roles LIMIT 1"))
+    user_id = await database.fetch_val(text("SELECT id FROM users LIMIT 1"))
+    unstaffed = await database.fetch_val(text(
+        "SELECT employees_id FROM employees e WHERE NOT EXISTS ("
+        " SELECT 1 FROM project_staffing ps WHERE ps.project_id = :p AND ps.employees_id = e.employees_id"
+        ") LIMIT 1"
+    ).bindparams(p=row["project_id"]))
+    return {**dict(row), "role_id": role_id, "user_id": user_id, "unstaffed": unstaffed}
+
+
+def _cases(s: Dict[str, Any]):
+    emp, proj, task = s["employees_id"], s["project_id"], s["task_id"]
+    fresh_day = s["task_date"] + timedelta(days=3650)        # no entry exists that far out
+    tag = uuid.uuid4().hex[:8]
+    new_emp = EmployeesEntry(
+        employees_id=f"bench-{tag}", first_name="Bench", last_name="Mark",
+        email=f"bench-{tag}@example.com", role=s["role_id"],
+    )
+    cases = {
+        "task: register": lambda: TaskMonitorsCurd.register_task(
+            TaskMonitorCreate(employees_id=emp, project_id=proj, task_date=fresh_day, task_completed=1)),
+        "task: update": lambda: TaskMonitorsCurd.update_task(
+            task, TaskMonitorUpdate(employees_id=emp, project_id=proj, task_completed=2)),
+        "task: delete": lambda: TaskMonitorsCurd.delete_task(task),
+        "employee: register": lambda: EmployeesCurdOperation.register_employee(new_emp),
+        "employee: update": lambda: EmployeesCurdOperation.update_employees(
+            emp, EmployeesUpdate(first_name="Bench", email=s["email"])),
+        "employee: delete": lambda: EmployeesCurdOperation.delete_employee(emp),
+        "role: register": lambda: RolesCurdOperation.register_role(RolesEntry(role_name=f"bench-{tag}")),
+        "project: add staffing": lambda: ProjectsCurdOperation.add_project_staffing(
+            ProjectStaffingAdd(project_id=proj, employees_id=s["unstaffed"] or new_emp.employees_id)),
+        "project: add with staff": lambda: ProjectsCurdOperation.add_project_with_staff(
+            ProjectWithStaffingAdd(project_name=f"bench-{tag}", active_at=s["task_date"], status="1", employees_id=emp)),
+        "project: update": lambda: ProjectsCurdOperation.update_project(
+            proj, emp, TrainerProjectUpdate(project_name=f"bench-{tag}", pod_lead="Bench")),
+        "project: delete": lambda: ProjectsCurdOperation.delete_project(proj, emp),
+        "user: register": lambda: UserCurdOperation.register_user(
+            UserEntry(username=f"bench-{tag}", password="x", first_name="B", last_name="M", gender="M")),
+    }
+    if s["role_id"]:
+        cases["role: update"] = lambda: RolesCurdOperation.update_role(s["role_id"], RolesUpdate(role_name=f"bench-{tag}"))
+        cases["role: delete"] = lambda: RolesCurdOperation.delete_role(s["role_id"])
+    if s["user_id"]:
+        cases["user: update"] = lambda: UserCurdOperation.update_user(
+            s["user_id"], UserUpdate(id=s["user_id"], first_name="B", last_name="M", gender="M", status="1"))
+        cases["user: delete"] = lambda: UserCurdOperation.delete_user(s["user_id"])
+    return cases
+
+
+async def main(repeat: int) -> None:
+    await database.connect()
+    counter = RoundTripCounter()
+    report: List[tuple] = []
+    try:
+        sample = await _sample()
+        names = list(_cases(sample))
+        counter.install()
+        for name in names:
+            trips, timings, error = 0, [], None
+            for _ in range(repeat):
+                call = _cases(sample)[name]     # fresh ids per run
+                counter.count = 0
+                started = time.perf_counter()
+                try:
+                    async with database.transaction(force_rollback=True):
+                        await call()
+                except Exception as exc:
+                    error = f"{type(exc).__name__}: {getattr(exc, 'detail', exc)}"
+                timings.append((time.perf_counter() - started) * 1000)
+                trips = counter.count
+            report.append((name, BASELINE.get(name), trips, statistics.median(timings), error))
+    finally:
+        counter.uninstall()
+        await database.disconnect()
+
+    print(f"{'operation':<26}{'before':>8}{'after':>8}{'median ms':>12}")
+    for name, before, after, median_ms, error in report:
+        print(f"{name:<26}{before if before is not None else '-':>8}{after:>8}{median_ms:>12.2f}"
+              + (f"  ({error})" if error else ""))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Round trips and latency per CRUD write")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per operation (median latency is reported)")
+    asyncio.run(main(parser.parse_args().repeat))
@@ -0,0 +1,120 @@
+# scripts/bench_serialization.py
+#
+# Response time of the list endpoints' serialization: the response_model path (pydantic
+# validation + stdlib json) versus FAST_JSON (fast_json.dump_rows). Runs a throwaway
+# FastAPI app in-process over ASGI with synthetic rows shaped like our queries' output,
+# and checks both paths produce the same bytes. No database needed.
+#
+#   python -m scripts.bench_serialization [--rows 500] [--requests 50]
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List
+
+import httpx
+from fastapi import FastAPI, Response
+
+import fast_json
+from schema.employees import EmployeesList
+from schema.projects import ProjectsWithTrainer
+from schema.tasks_monitor import TaskMonitorBase
+
+
+def _ts(rng: random.Random) -> datetime:
+    return datetime(2025, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=rng.randint(0, 30_000_000),
+                                                                  microseconds=rng.randint(0, 999_999))
+
+
+def task_rows(n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [{
+        "task_id": i, "employees_id": f"EMP{i % 900:06d}", "project_id": 101 + i % 40,
+        "task_date": date(2025, 1, 1) + timedelta(days=i % 365), "date": date(2025, 1, 1),
+        "task_completed": rng.randint(0, 15), "task_inprogress": rng.randint(0, 4), "task_reworked": rng.randint(0, 2),
+        "task_approved": rng.randint(0, 12), "task_rejected": rng.randint(0, 2), "task_reviewed": rng.randint(0, 12),
+        "hours_logged": Decimal(f"{rng.uniform(1, 9):.2f}"), "description": rng.choice((None, "Worked on batch 12")),
+        "project_name": "Coding SFT 001", "manager": "Priya Sharma", "lead": "Rahul Verma", "pod_lead": None,
+        "first_name": "Aarav", "last_name": "Pathak", "created_at": _ts(rng), "updated_at": _ts(rng),
+    } for i in range(n)]
+
+
+def employee_rows(n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [{
+        "employees_id": f"EMP{i:06d}", "first_name": "Ananya", "last_name": "Iyer", "email": f"ananya.iyer.{i}@example.com",
+        "phone": "+919876543210", "gender": "F", "designation": "Trainer", "role": "8c1e0a3c-5b1f-4d55-9a65-2a7f0c1d9e11",
+        "role_name": "Trainer", "skill": "Python, SQL", "experience": Decimal(f"{rng.uniform(0, 12):.1f}"),
+        "qualification": "B.Tech", "state": "Karnataka", "city": "Bengaluru", "active_at": date(2024, 3, 1),
+        "inactive_at": None, "status": "1", "created_at": _ts(rng), "updated_at": _ts(rng),
+    } for i in range(n)]
+
+
+def project_rows(n: int, rng: random.Random) -> List[Dict[str, Any]]:
+    return [{
+        "project_id": 101 + i // 5, "project_name": f"Reasoning RLHF {i // 5:03d}", "active_at": date(2024, 6, 1),
+        "inactive_at": None, "status": "1", "created_at": _ts(rng), "updated_at": _ts(rng),
+        "staffing_id": i, "employees_id": f"EMP{i:06d}", "employee_first_name": "Kabir", "employee_last_name": "Nair",
+        "gms_manager": "Neha Gupta", "t_manager": "Vikram Rao", "pod_lead": "Meera Das",
+        "staffing_created_at": _ts(rng), "staffing_updated_at": _ts(rng),
+    } for i in range(n)]
+
+
+CASES = (
+    ("tasks", TaskMonitorBase, task_rows),
+    ("employees", EmployeesList, employee_rows),
+    ("projects", ProjectsWithTrainer, project_rows),
+)
+
+
+def _routes(app: FastAPI, name: str, model, rows: List[Dict[str, Any]]) -> None:
+    # closures, not `rows=rows` defaults: FastAPI would treat those as query parameters and
+    # deep-copy the default on every request
+
+    @app.get(f"/standard/{name}", response_model=List[model])
+    async def standard():
+        return rows
+
+    @app.get(f"/fast/{name}")
+    async def fast():
+        return Response(content=fast_json.dump_rows(rows, model), media_type="application/json")
+
+
+def build_app(data: Dict[str, List[Dict[str, Any]]]) -> FastAPI:
+    app = FastAPI()
+    for name, model, _ in CASES:
+        _routes(app, name, model, data[name])
+    return app
+
+
+async def main(n_rows: int, requests: int) -> None:
+    rng = random.Random(7)
+    data = {name: make(n_rows, rng) for name, _, make in CASES}
+    app = build_app(data)
+    print(f"serializer: {'orjson' if fast_json.orjson is not None else 'pydantic TypeAdapter (orjson not installed)'}")
+    print(f"{'endpoint':<12}{'rows':>6}{'standard ms':>14}{'fast ms':>10}{'speedup':>9}  same bytes")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        for name, _, _ in CASES:
+            timings = {}
+            bodies = {}
+            for path in ("standard", "fast"):
+                await client.get(f"/{path}/{name}")                 # warm-up (adapter / schema build)
+                samples = []
+                for _ in range(requests):
+                    started = time.perf_counter()
+                    response = await client.get(f"/{path}/{name}")
+                    samples.append(time.perf_counter() - started)
+                timings[path] = statistics.median(samples) * 1000
+                bodies[path] = response.content
+            same = bodies["standard"] == bodies["fast"]
+            print(f"{name:<12}{n_rows:>6}{timings['standard']:>14.2f}{timings['fast']:>10.2f}"
+                  f"{timings['standard'] / timings['fast']:>8.1f}x  {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="response_model serialization vs FAST_JSON")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.requests))
@@ -0,0 +1,59 @@
+# scripts/bench_startup.py
+#
+# Measures worker start-up: `import main` alone, and process spawn → first 200 from /healthz
+# under uvicorn. Needs the database in DATABASE_URL to be reachable (the lifespan connects).
+#
+#   python -m scripts.bench_startup [--runs 5] [--port 8765]
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+
+
+def time_import() -> float:
+    out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def time_first_healthz(port: int, timeout: float = 30.0) -> float:
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {proc.returncode} before serving /healthz")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/healthz", timeout=1) as resp:
+                    if resp.status == 200:
+                        return time.perf_counter() - started
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError(f"/healthz not ready after {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main(runs: int, port: int) -> None:
+    imports = [time_import() for _ in range(runs)]
+    ready = [time_first_healthz(port) for _ in range(runs)]
+    for label, values in (("import main", imports), ("spawn → /healthz", ready)):
+        print(f"{label:<18} median {statistics.median(values) * 1000:8.1f} ms   "
+              f"max {max(values) * 1000:8.1f} ms   ({runs} runs)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Worker start-up time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    main(args.runs, args.port)
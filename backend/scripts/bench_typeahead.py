@@ -0,0 +1,79 @@
+# scripts/bench_typeahead.py
+#
+# GET /api/employees/names?prefix= served from typeahead.EmployeeNameIndex: build time,
+# memory footprint and lookup latency over a synthetic staff list, next to what the
+# endpoint used to cost the server (serializing every active employee per call) before
+# the client filtered it. No database needed.
+#
+#   python -m scripts.bench_typeahead [--employees 20000] [--lookups 20000]
+import argparse
+import json
+import random
+import string
+import time
+
+from pool_metrics import percentile
+from typeahead import EmployeeNameIndex
+
+FIRST = ["Aarav", "Ananya", "José", "Maria", "John", "Priya", "Rahul", "Sofia", "Wei", "Zoë", "Liam", "Noah",
+         "Olivia", "Emma", "Ravi", "Sneha", "Arjun", "Kavya", "Omar", "Fatima"]
+LAST = ["Sharma", "Pathak", "Pérez", "Smith", "Kumar", "Singh", "García", "Chen", "Müller", "Brown", "Khan",
+        "Gupta", "Iyer", "Nair", "Das", "Patel", "Reddy", "Jones", "Silva", "Rossi"]
+
+
+def staff(n: int):
+    rng = random.Random(7)
+    roles = [{"role_id": f"r{i}", "role_name": f"Role {i}"} for i in range(20)]
+    employees = [
+        {
+            "employees_id": f"EMP{i:06d}",
+            "first_name": rng.choice(FIRST) + rng.choice(["", "a", "e", "n"]),
+            "last_name": rng.choice(LAST) if rng.random() > 0.05 else None,
+            "role": rng.choice(roles)["role_id"],
+            "status": "1",
+        }
+        for i in range(n)
+    ]
+    return employees, roles
+
+
+def main(n: int, lookups: int) -> None:
+    employees, roles = staff(n)
+    index = EmployeeNameIndex()
+    started = time.perf_counter()
+    index.load(employees, roles)
+    build_ms = (time.perf_counter() - started) * 1000
+    stats = index.stats()
+    print(f"{n} employees → {stats['keys']} keys, built in {build_ms:.1f} ms, "
+          f"~{stats['memory_bytes'] / 1024 / 1024:.2f} MiB")
+
+    rng = random.Random(11)
+    prefixes = [rng.choice(FIRST + LAST)[: rng.randint(1, 4)] for _ in range(lookups)]
+    timings = []
+    for prefix in prefixes:
+        t0 = time.perf_counter()
+        index.lookup(prefix, 10)
+        timings.append(time.perf_counter() - t0)
+    timings.sort()
+    print(f"lookup(prefix, limit=10) over {lookups} prefixes: p50 {percentile(timings, 50) * 1e6:.1f} µs, "
+          f"p99 {percentile(timings, 99) * 1e6:.1f} µs")
+
+    t0 = time.perf_counter()
+    everyone = index.lookup("")
+    body = json.dumps(everyone).encode()
+    print(f"full list (old behaviour, before the DB round trip): {len(body) / 1024:.0f} KiB JSON, "
+          f"{(time.perf_counter() - t0) * 1000:.1f} ms to assemble + encode")
+
+    t0 = time.perf_counter()
+    for i in range(1000):
+        emp = dict(employees[i], last_name="".join(rng.choices(string.ascii_letters, k=6)))
+        index.upsert(emp)
+    print(f"incremental upsert: {(time.perf_counter() - t0) * 1000:.2f} µs each (1000 renames)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Typeahead index: build, memory, lookup latency")
+    parser.add_argument("--employees", type=int, default=20000)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.employees, args.lookups)
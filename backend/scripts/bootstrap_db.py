@@ -0,0 +1,13 @@
+# scripts/bootstrap_db.py
+#
+# Creates any missing tables/indexes from pg_db.metadata, then applies the Alembic
+# migrations (triggers, functions, backfills), so a fresh database ends up exactly as
+# `alembic upgrade head` leaves it and stamped at head. Safe to re-run.
+from pg_db import create_schema, SYNC_DATABASE_URL
+
+def main():
+    create_schema()
+    print("✅ Schema ensured on", SYNC_DATABASE_URL.rsplit("@", 1)[-1])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# scripts/explain_guard.py
+#
+# Runs every read path in curd/* against a seeded database, EXPLAINs each statement
+# it issues and exits non-zero when a plan sequentially scans a large table.
+#
+#   python -m scripts.seed                      # or any database with realistic volume
+#   python -m scripts.explain_guard [--min-rows 10000]
+import argparse
+import asyncio
+import json
+import sys
+from datetime import timedelta
+from typing import Any, Dict, List, Set, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import asyncpg as pg_asyncpg
+
+from pg_db import database
+from cache import response_cache
+from query_templates import QueryTemplate
+from curd.dashboard import DashboardCurdOperation
+from curd.employees import EmployeesCurdOperation
+from curd.projects import ProjectsCurdOperation
+from curd.roles import RolesCurdOperation
+from curd.tasks_monitor import TaskMonitorsCurd
+from curd.users import UserCurdOperation
+
+DIALECT = pg_asyncpg.dialect(paramstyle="numeric_dollar")
+
+
+def _compile(query, values=None) -> Tuple[str, List[Any]]:
+    if isinstance(query, QueryTemplate):
+        compiled = query.compiled(DIALECT)
+        return compiled.sql, compiled.args(values)
+    if isinstance(query, str):
+        query = text(query).bindparams(**(values or {}))
+    compiled = query.compile(dialect=DIALECT)
+    params = compiled.construct_params()
+    return str(compiled), [params[name] for name in compiled.positiontup or []]
+
+
+def _seq_scans(plan: Dict[str, Any]) -> Set[str]:
+    found = set()
+    if plan.get("Node Type") == "Seq Scan":
+        found.add(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        found |= _seq_scans(child)
+    return found
+
+
+class PlanRecorder:
+    """Wraps database.fetch_* so each statement is EXPLAINed before it runs."""
+
+    def __init__(self):
+        self.scenario = ""
+        self.plans: List[Tuple[str, str, Set[str]]] = []
+        self._originals = {}
+
+    async def _explain(self, query, values=None) -> None:
+        sql, args = _compile(query, values)
+        async with database.connection() as connection:
+            raw = await connection.raw_connection.fetchval("EXPLAIN (FORMAT JSON) " + sql, *args)
+        plan = json.loads(raw)[0]["Plan"]
+        self.plans.append((self.scenario, sql, _seq_scans(plan)))
+
+    def install(self) -> None:
+        for name in ("fetch_all", "fetch_one", "fetch_val"):
+            original = getattr(database, name)
+            self._originals[name] = original
+
+            async def wrapper(query, values=None, *args, _original=original, **kwargs):
+                await self._explain(query, values)
+                return await _original(query, values, *args, **kwargs)
+
+            setattr(database, name, wrapper)
+
+    def uninstall(self) -> None:
+        for name in self._originals:
+            delattr(database, name)
+
+
+async def _sample() -> Dict[str, Any]:
+    row = await database.fetch_one(text(
+        "SELECT tm.task_id, tm.employees_id, tm.project_id, tm.task_date "
+        "FROM task_monitors tm "
+        "JOIN project_staffing ps ON ps.project_id = tm.project_id AND ps.employees_id = tm.employees_id "
+        "LIMIT 1"
+    ))
+    if row is None:
+        sys.exit("No staffed task rows found; seed the database first (python -m scripts.seed)")
+    email = await database.fetch_val(text("SELECT email FROM employees WHERE employees_id = :e").bindparams(e=row["employees_id"]))
+    user_id = await database.fetch_val(text("SELECT id FROM users LIMIT 1"))
+    return {**dict(row), "email": email, "user_id": user_id}
+
+
+def _scenarios(s: Dict[str, Any]):
+    """(name, coroutine factory, tables whose full scan is expected)"""
+    emp, proj, day, task = s["employees_id"], s["project_id"], s["task_date"], s["task_id"]
+    week_ago = day - timedelta(days=7)
+
+    async def keyset_page():
+        rows = await TaskMonitorsCurd.find_all_task(limit=50)
+        cursor = TaskMonitorsCurd.next_cursor(rows, 50)
+        if cursor:
+            await TaskMonitorsCurd.find_all_task(limit=50, cursor=cursor)
+
+    return [
+        ("tasks: exists check", lambda: TaskMonitorsCurd._task_exists(emp, proj, day), ()),
+        ("tasks: by id", lambda: TaskMonitorsCurd.find_task_by_id(task), ()),
+        ("tasks: first + keyset page", keyset_page, ()),
+        ("tasks: by employee", lambda: TaskMonitorsCurd.find_all_task(employees_id=emp), ()),
+        ("tasks: by project", lambda: TaskMonitorsCurd.find_all_task(project_id=proj), ()),
+        ("tasks: date window", lambda: TaskMonitorsCurd.find_all_task(date_from=week_ago, date_to=day), ()),
+        ("tasks: series per employee",
+         lambda: TaskMonitorsCurd.find_task_timeseries("employee", "day", week_ago, day, employees_id=emp), ()),
+        ("tasks: series per project",
+         lambda: TaskMonitorsCurd.find_task_timeseries("project", "week", week_ago, day, project_id=proj), ()),
+        ("projects: staffing exists", lambda: ProjectsCurdOperation._staffing_exists(proj, emp), ()),
+        ("projects: by id + trainer", lambda: ProjectsCurdOperation.find_project_by_id(proj, emp), ()),
+        ("projects: for trainer", lambda: ProjectsCurdOperation.get_projects_for_trainer(emp), ()),
+        ("projects: with trainers", lambda: ProjectsCurdOperation.find_all_projects_with_trainer(), ()),
+        ("employees: page", lambda: EmployeesCurdOperation.find_all_employees(), ()),
+        ("employees: by id", lambda: EmployeesCurdOperation.find_employees_by_id(emp), ()),
+        ("employees: email taken", lambda: EmployeesCurdOperation._email_exists(s["email"]), ()),
+        ("employees: substring filter",
+         lambda: EmployeesCurdOperation.find_all_employees(q=s["email"].split("@")[0]), ()),
+        ("employees: fuzzy search", lambda: EmployeesCurdOperation.search_employees(s["email"].split("@")[0]), ()),
+        # a full name list / full dashboard necessarily reads every row
+        ("employees: names", lambda: EmployeesCurdOperation.find_all_employees_name(), ("employees",)),
+        ("dashboard: window",
+         lambda: DashboardCurdOperation.get_dashboard_summary(date_from=week_ago, date_to=day),
+         ("projects", "project_staffing")),
+        ("roles: all", lambda: RolesCurdOperation.find_all_roles(), ("roles",)),
+        ("users: by id", lambda: UserCurdOperation.find_user_by_id(s["user_id"]), ()),
+    ]
+
+
+async def main(min_rows: int) -> int:
+    response_cache.enabled = False       # every call must reach the database
+    await database.connect()
+    recorder = PlanRecorder()
+    try:
+        large = {
+            r["relname"] for r in await database.fetch_all(text(
+                "SELECT relname FROM pg_class WHERE relkind = 'r' AND reltuples >= :n"
+            ).bindparams(n=min_rows))
+        }
+        sample = await _sample()
+        recorder.install()
+        allowed_by_scenario = {}
+        for name, call, allowed in _scenarios(sample):
+            recorder.scenario = name
+            allowed_by_scenario[name] = set(allowed)
+            try:
+                await call()
+            except Exception as exc:  # a 404 etc. still leaves its plans recorded
+                print(f"  note: {name}: {type(exc).__name__}: {getattr(exc, 'detail', exc)}")
+    finally:
+        recorder.uninstall()
+        await database.disconnect()
+
+    failures = 0
+    for scenario, sql, scanned in recorder.plans:
+        bad = (scanned & large) - allowed_by_scenario[scenario]
+        print(f"{'FAIL' if bad else 'ok  '} {scenario}" + (f"  seq scan on {', '.join(sorted(bad))}" if bad else ""))
+        if bad:
+            failures += 1
+            print("     " + " ".join(sql.split()))
+    print(f"\n{len(recorder.plans)} statements, {failures} with sequential scans on tables >= {min_rows} rows "
+          f"({', '.join(sorted(large)) or 'none'})")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fail on sequential scans of large tables in curd/* queries")
+    parser.add_argument("--min-rows", type=int, default=10_000, help="tables at least this large must not be seq-scanned")
+    sys.exit(asyncio.run(main(parser.parse_args().min_rows)))
@@ -0,0 +1,238 @@
+# scripts/load_test.py
+#
+# Replays a mixed workload against a running API and reports throughput and latency
+# percentiles per endpoint:
+#   - dashboard pollers: GET /api/dashboard/summary every --poll-interval seconds each
+#   - browsing users:    task pages (following the keyset cursor), filtered task lists,
+#                        time series, employee / project lists, single task lookups
+#   - submission spikes: every --spike-every seconds, --spike-size concurrent
+#                        PUT /api/tasks/daily (writes! use --read-only on shared data)
+#
+#   python -m scripts.seed                                   # realistic data first
+#   uvicorn main:app --port 8000                             # or: --spawn
+#   python -m scripts.load_test [--duration 60] [--users 20] [--pollers 10] [--json out.json]
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from pagination import NEXT_CURSOR_HEADER
+from pool_metrics import percentile
+
+
+class Recorder:
+    """Latencies and failures per endpoint label."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    async def request(self, client: httpx.AsyncClient, label: str, method: str, url: str,
+                      **kwargs) -> Optional[httpx.Response]:
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.latencies[label].append(time.perf_counter() - started)
+            self.errors[label] += 1
+            self.statuses[label][0] += 1          # 0 = transport error / timeout
+            return None
+        self.latencies[label].append(time.perf_counter() - started)
+        self.statuses[label][response.status_code] += 1
+        if response.status_code >= 500:
+            self.errors[label] += 1
+        return response
+
+    def report(self, elapsed: float) -> List[Dict[str, Any]]:
+        rows = []
+        for label in sorted(self.latencies):
+            values = sorted(self.latencies[label])
+            rows.append({
+                "endpoint": label,
+                "requests": len(values),
+                "errors": self.errors[label],
+                "rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+                "statuses": dict(sorted(self.statuses[label].items())),
+            })
+        return rows
+
+
+async def _sleep_until(seconds: float, stop: float) -> None:
+    await asyncio.sleep(max(0.0, min(seconds, stop - time.perf_counter())))
+
+
+async def _sample(client: httpx.AsyncClient) -> Dict[str, Any]:
+    """Ids to hit, taken from the API itself (works against any deployment)."""
+    tasks = (await client.get("/api/tasks", params={"limit": 1000})).json()
+    if not tasks:
+        sys.exit("GET /api/tasks returned no rows; seed the database first (python -m scripts.seed)")
+    return {
+        "pairs": sorted({(t["employees_id"], t["project_id"]) for t in tasks}),
+        "task_ids": [t["task_id"] for t in tasks],
+        "latest": max(date.fromisoformat(t["task_date"]) for t in tasks),
+    }
+
+
+async def dashboard_poller(client, rec: Recorder, s, interval: float, stop: float, rng: random.Random):
+    await asyncio.sleep(rng.uniform(0, interval))       # spread the pollers out
+    while time.perf_counter() < stop:
+        window = rng.choice((7, 30, 90))
+        await rec.request(client, "GET /api/dashboard/summary", "GET", "/api/dashboard/summary", params={
+            "date_from": (s["latest"] - timedelta(days=window)).isoformat(),
+            "date_to": s["latest"].isoformat(),
+        })
+        await _sleep_until(interval * rng.uniform(0.8, 1.2), stop)
+
+
+async def browsing_user(client, rec: Recorder, s, think: float, stop: float, rng: random.Random):
+    while time.perf_counter() < stop:
+        action = rng.choices(
+            ("pages", "by_employee", "by_project", "series", "task", "employees", "projects"),
+            weights=(30, 20, 15, 10, 10, 10, 5),
+        )[0]
+        emp, proj = rng.choice(s["pairs"])
+        if action == "pages":
+            params = {"limit": 50}
+            for _ in range(rng.randint(1, 4)):
+                response = await rec.request(client, "GET /api/tasks (keyset page)", "GET", "/api/tasks", params=params)
+                cursor = response is not None and response.headers.get(NEXT_CURSOR_HEADER)
+                if not cursor:
+                    break
+                params = {"limit": 50, "cursor": cursor}
+        elif action == "by_employee":
+            await rec.request(client, "GET /api/tasks?employees_id", "GET", "/api/tasks",
+                              params={"employees_id": emp, "limit": 100})
+        elif action == "by_project":
+            await rec.request(client, "GET /api/tasks?project_id&date_from", "GET", "/api/tasks", params={
+                "project_id": proj, "limit": 100,
+                "date_from": (s["latest"] - timedelta(days=30)).isoformat(),
+            })
+        elif action == "series":
+            await rec.request(client, "GET /api/tasks/timeseries", "GET", "/api/tasks/timeseries", params={
+                "group_by": rng.choice(("employee", "project")), "bucket": "week", "project_id": proj,
+                "date_from": (s["latest"] - timedelta(days=90)).isoformat(), "date_to": s["latest"].isoformat(),
+            })
+        elif action == "task":
+            await rec.request(client, "GET /api/tasks/{task_id}", "GET", f"/api/tasks/{rng.choice(s['task_ids'])}")
+        elif action == "employees":
+            await rec.request(client, "GET /api/employees", "GET", "/api/employees")
+        else:
+            await rec.request(client, "GET /api/projects", "GET", "/api/projects")
+        await _sleep_until(rng.expovariate(1 / think) if think else 0, stop)
+
+
+async def submission_spikes(client, rec: Recorder, s, every: float, size: int, stop: float, rng: random.Random):
+    # end-of-shift pattern: many trainers submit their day at once
+    while time.perf_counter() + every < stop:
+        await asyncio.sleep(every)
+        day = s["latest"] - timedelta(days=rng.randint(0, 6))
+
+        async def submit():
+            emp, proj = rng.choice(s["pairs"])
+            await rec.request(client, "PUT /api/tasks/daily", "PUT", "/api/tasks/daily", json={
+                "employees_id": emp, "project_id": proj, "task_date": day.isoformat(),
+                "task_completed": rng.randint(0, 15), "task_inprogress": rng.randint(0, 4),
+                "task_reviewed": rng.randint(0, 10), "hours_logged": f"{rng.uniform(4, 9):.2f}",
+                "description": "load test",
+            })
+
+        await asyncio.gather(*(submit() for _ in range(size)))
+
+
+def _spawn(port: int, timeout: float = 30.0) -> subprocess.Popen:
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        env=os.environ.copy(),
+    )
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if proc.poll() is not None:
+            sys.exit(f"uvicorn exited with {proc.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/healthz", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            time.sleep(0.05)
+    proc.terminate()
+    sys.exit(f"/healthz not ready after {timeout}s")
+
+
+async def main(args) -> None:
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=args.users + args.pollers + args.spike_size)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        sample = await _sample(client)
+        rec = Recorder()
+        started = time.perf_counter()
+        stop = started + args.duration
+        jobs = [dashboard_poller(client, rec, sample, args.poll_interval, stop, random.Random(rng.random()))
+                for _ in range(args.pollers)]
+        jobs += [browsing_user(client, rec, sample, args.think, stop, random.Random(rng.random()))
+                 for _ in range(args.users)]
+        if not args.read_only and args.spike_size:
+            jobs.append(submission_spikes(client, rec, sample, args.spike_every, args.spike_size, stop,
+                                          random.Random(rng.random())))
+        await asyncio.gather(*jobs)
+        elapsed = time.perf_counter() - started
+
+    rows = rec.report(elapsed)
+    total = sum(r["requests"] for r in rows)
+    all_latencies = sorted(v for values in rec.latencies.values() for v in values)
+    print(f"{'endpoint':<38}{'reqs':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+    for r in rows:
+        print(f"{r['endpoint']:<38}{r['requests']:>8}{r['errors']:>6}{r['rps']:>9.1f}"
+              f"{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}{r['max_ms']:>9.1f}")
+    if all_latencies:
+        print(f"{'all':<38}{total:>8}{sum(r['errors'] for r in rows):>6}{total / elapsed:>9.1f}"
+              f"{percentile(all_latencies, 50) * 1000:>9.1f}{percentile(all_latencies, 95) * 1000:>9.1f}"
+              f"{percentile(all_latencies, 99) * 1000:>9.1f}{all_latencies[-1] * 1000:>9.1f}")
+        print(f"\n{elapsed:.1f}s, mean {statistics.fmean(all_latencies) * 1000:.1f} ms")
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"args": vars(args), "elapsed_seconds": round(elapsed, 2), "endpoints": rows}, fh, indent=2)
+        print(f"wrote {args.json}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mixed-workload load test with per-endpoint percentiles")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--spawn", action="store_true", help="start `uvicorn main:app` on --port for the run")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds")
+    parser.add_argument("--users", type=int, default=20, help="concurrent browsing users")
+    parser.add_argument("--think", type=float, default=0.2, help="mean think time between a user's requests (s)")
+    parser.add_argument("--pollers", type=int, default=10, help="open dashboards")
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument("--spike-every", type=float, default=15.0)
+    parser.add_argument("--spike-size", type=int, default=50, help="concurrent submissions per spike")
+    parser.add_argument("--read-only", action="store_true", help="skip the PUT /api/tasks/daily spikes")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the results here (compare runs before/after a change)")
+    args = parser.parse_args()
+
+    server = None
+    if args.spawn:
+        server = _spawn(args.port)
+        args.base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        asyncio.run(main(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
@@ -0,0 +1,15 @@
+# scripts/rebuild_rollup.py
+import asyncio
+from pg_db import database
+from curd.dashboard import DashboardCurdOperation
+
+async def main():
+    await database.connect()
+    try:
+        rows = await DashboardCurdOperation.rebuild_daily_rollup()
+        print("✅ task_daily_rollup rebuilt:", rows, "rows")
+    finally:
+        await database.disconnect()
+
+if __name__ == "__main__":
+    asyncio.run(main())
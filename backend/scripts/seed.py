@@ -1,15 +1,30 @@
 # scripts/seed.py
+#
+#   python -m scripts.seed [--employees 5000] [--projects 60] [--days 730] [--seed 42] [--truncate]
+import argparse
 import asyncio
 from pg_db import database  # <- your Database(...) instance
-from seeder.seed_dummy_data import seed_dummy_data  # <- import the function you pasted
+from seeder.seed_dummy_data import seed_dummy_data
 
-async def main():
+async def main(args):
     await database.connect()
     try:
-        summary = await seed_dummy_data()
+        summary = await seed_dummy_data(
+            employees_count=args.employees,
+            projects_count=args.projects,
+            days=args.days,
+            seed=args.seed,
+            truncate=args.truncate,
+        )
         print("✅ Seed done:", summary)
     finally:
         await database.disconnect()
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Load reproducible, production-shaped dummy data with COPY")
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--projects", type=int, default=60)
+    parser.add_argument("--days", type=int, default=730, help="days of task history ending today")
+    parser.add_argument("--seed", type=int, default=42, help="same seed, same rows")
+    parser.add_argument("--truncate", action="store_true", help="empty the seeded tables first (users are kept)")
+    asyncio.run(main(parser.parse_args()))
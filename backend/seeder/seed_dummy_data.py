@@ -0,0 +1,311 @@
+# seeder/seed_dummy_data.py
+#
+# Production-shaped synthetic data: roles, employees, projects, staffing and one
+# task_monitors entry per employee/project/working day, loaded with COPY.
+# The same `seed` always produces the same rows.
+from __future__ import annotations
+
+import math
+import random
+import time
+import uuid
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+
+from pg_db import (
+    database, copy_records,
+    roles, employees, projects, project_staffing, task_monitors,
+)
+from curd.dashboard import DashboardCurdOperation
+
+# (role name, share of the workforce, gets staffed on projects)
+ROLES = (
+    ("Trainer", 0.78, True),
+    ("Pod Lead", 0.07, True),
+    ("QA Reviewer", 0.05, True),
+    ("Team Lead", 0.05, False),
+    ("Manager", 0.03, False),
+    ("Admin", 0.02, False),
+)
+
+FIRST_NAMES = (
+    "Aarav", "Vivaan", "Aditya", "Arjun", "Sai", "Reyansh", "Krishna", "Ishaan", "Rohan", "Kabir",
+    "Ananya", "Diya", "Aadhya", "Saanvi", "Pari", "Anika", "Navya", "Meera", "Riya", "Kavya",
+    "Rahul", "Priya", "Amit", "Neha", "Vikram", "Pooja", "Suresh", "Sneha", "Manish", "Shreya",
+    "Raushan", "Nikhil", "Tanvi", "Harsh", "Ishita", "Karan", "Aisha", "Dev", "Nisha", "Yash",
+)
+LAST_NAMES = (
+    "Sharma", "Verma", "Gupta", "Singh", "Kumar", "Pathak", "Mishra", "Patel", "Reddy", "Nair",
+    "Iyer", "Das", "Chatterjee", "Banerjee", "Joshi", "Mehta", "Shah", "Yadav", "Jha", "Rao",
+    "Pandey", "Tiwari", "Saxena", "Agarwal", "Kapoor", "Malhotra", "Bose", "Menon", "Pillai", "Sinha",
+)
+STATES_CITIES = (
+    ("Karnataka", ("Bengaluru", "Mysuru"), 0.22),
+    ("Maharashtra", ("Mumbai", "Pune", "Nagpur"), 0.18),
+    ("Telangana", ("Hyderabad",), 0.14),
+    ("Tamil Nadu", ("Chennai", "Coimbatore"), 0.10),
+    ("Delhi", ("New Delhi",), 0.09),
+    ("Uttar Pradesh", ("Noida", "Lucknow"), 0.08),
+    ("Bihar", ("Patna",), 0.06),
+    ("West Bengal", ("Kolkata",), 0.05),
+    ("Kerala", ("Kochi", "Thiruvananthapuram"), 0.04),
+    ("Haryana", ("Gurugram",), 0.04),
+)
+SKILLS = ("Python", "Java", "SQL", "Data Annotation", "NLP", "Computer Vision", "Math", "Physics",
+          "Chemistry", "Biology", "Creative Writing", "Code Review", "JavaScript", "C++")
+QUALIFICATIONS = (("B.Tech", 0.38), ("B.Sc", 0.16), ("M.Tech", 0.12), ("M.Sc", 0.12),
+                  ("BCA", 0.08), ("MCA", 0.07), ("Ph.D", 0.04), ("B.A", 0.03))
+PROJECT_TOPICS = ("Reasoning", "Coding", "Math", "STEM", "Safety", "Multilingual", "Vision",
+                  "Agents", "Summarization", "Dialogue", "Search", "Evaluation")
+PROJECT_KINDS = ("SFT", "RLHF", "Evals", "Red Teaming", "Annotation", "Review")
+
+WEEKDAY_ATTENDANCE = 0.92
+WEEKEND_ATTENDANCE = 0.04
+SECONDARY_PROJECT_SHARE = 0.3       # chance an employee also logs on a secondary project that day
+
+
+def _weighted(rng: random.Random, items: Sequence[Tuple[Any, float]]) -> Any:
+    return rng.choices([i for i, _ in items], weights=[w for _, w in items])[0]
+
+
+def _poisson(rng: random.Random, lam: float) -> int:
+    # Knuth; lam stays small here (≤ ~30), normal approximation above that
+    if lam > 30:
+        return max(0, round(rng.gauss(lam, math.sqrt(lam))))
+    limit, k, p = math.exp(-lam), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _at(day: date, rng: random.Random) -> datetime:
+    return datetime.combine(day, dt_time(9, 0), tzinfo=timezone.utc) + timedelta(minutes=rng.randint(0, 600))
+
+
+class _Plan:
+    """Everything except task rows, generated up front (small); task rows are streamed."""
+
+    def __init__(self, rng: random.Random, employees_count: int, projects_count: int, start: date, end: date):
+        span = (end - start).days
+        self.roles = [(_uuid(rng), name, staffed) for name, _, staffed in ROLES]
+        role_weights = [(r, share) for r, (_, share, _) in zip(self.roles, ROLES)]
+
+        # employees: ~60% hired before the window, the rest ramp in; ~10% have left
+        self.employees: List[Dict[str, Any]] = []
+        for n in range(1, employees_count + 1):
+            role_id, role_name, staffed = _weighted(rng, role_weights)
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            state, cities, _ = _weighted(rng, [(s, s[2]) for s in STATES_CITIES])
+            active_at = start - timedelta(days=rng.randint(0, 720)) if rng.random() < 0.6 \
+                else start + timedelta(days=int(span * rng.random() ** 1.5))
+            left = rng.random() < 0.10 and active_at + timedelta(days=60) < end
+            inactive_at = active_at + timedelta(days=rng.randint(60, max(61, (end - active_at).days))) if left else None
+            self.employees.append({
+                "employees_id": f"EMP{n:06d}",
+                "first_name": first,
+                "last_name": last,
+                "email": f"{first}.{last}.{n}@example.com".lower(),
+                "phone": f"+91{rng.randint(6_000_000_000, 9_999_999_999)}",
+                "gender": _weighted(rng, (("M", 0.55), ("F", 0.44), ("O", 0.01))),
+                "designation": role_name,
+                "role": role_id,
+                "skill": ", ".join(rng.sample(SKILLS, rng.randint(1, 3))),
+                "experience": Decimal(str(round(min(25.0, rng.gammavariate(2.0, 2.0)), 1))),
+                "qualification": _weighted(rng, QUALIFICATIONS),
+                "state": state,
+                "city": rng.choice(cities),
+                "active_at": active_at,
+                "inactive_at": inactive_at,
+                "status": "0" if inactive_at and inactive_at <= end else "1",
+                "created_at": _at(active_at, rng),
+                # per-employee throughput multiplier (long right tail)
+                "_productivity": rng.lognormvariate(0.0, 0.35),
+                "_staffed": staffed,
+            })
+
+        # projects: a few large long-running ones, a long tail of small/short ones
+        self.projects: List[Dict[str, Any]] = []
+        for n in range(projects_count):
+            active_at = start - timedelta(days=rng.randint(0, 365)) if rng.random() < 0.4 \
+                else start + timedelta(days=rng.randint(0, max(0, span - 30)))
+            closed = rng.random() < 0.15 and active_at + timedelta(days=45) < end
+            inactive_at = active_at + timedelta(days=rng.randint(45, max(46, (end - active_at).days))) if closed else None
+            self.projects.append({
+                "project_id": 101 + n,
+                "project_name": f"{rng.choice(PROJECT_TOPICS)} {rng.choice(PROJECT_KINDS)} {n + 1:03d}",
+                "active_at": active_at,
+                "status": "0" if inactive_at else "1",
+                "inactive_at": inactive_at,
+                "created_at": _at(active_at, rng),
+            })
+        project_weights = [(p, 1.0 / (rank + 1) ** 1.1) for rank, p in enumerate(self.projects)]
+
+        # manager / lead / pod lead named on staffing rows are employees holding those roles
+        names = {role: [f"{e['first_name']} {e['last_name']}" for e in self.employees if e["designation"] == role]
+                 for role in ("Manager", "Team Lead", "Pod Lead")}
+        leads = {
+            p["project_id"]: tuple(rng.choice(names[role]) if names[role] else None
+                                   for role in ("Manager", "Team Lead", "Pod Lead"))
+            for p in self.projects
+        }
+
+        # staffing: 70% one project, 25% two, 5% three; first one is the primary
+        self.staffing: List[Dict[str, Any]] = []
+        self.assignments: Dict[str, List[Dict[str, Any]]] = {}
+        for e in self.employees:
+            if not e["_staffed"] or not self.projects:
+                continue
+            k = min(len(self.projects), _weighted(rng, ((1, 0.70), (2, 0.25), (3, 0.05))))
+            chosen: List[Dict[str, Any]] = []
+            while len(chosen) < k:
+                p = _weighted(rng, project_weights)
+                if p not in chosen:
+                    chosen.append(p)
+            self.assignments[e["employees_id"]] = chosen
+            for p in chosen:
+                manager, lead, pod_lead = leads[p["project_id"]]
+                self.staffing.append({
+                    "project_id": p["project_id"],
+                    "employees_id": e["employees_id"],
+                    "gms_manager": manager,
+                    "t_manager": lead,
+                    "pod_lead": pod_lead,
+                    "created_at": _at(max(p["active_at"], e["active_at"]), rng),
+                })
+
+    def task_rows(self, rng: random.Random, start: date, end: date) -> Iterator[tuple]:
+        """Day by day (so task_id follows task_date, as in production)."""
+        staffed = [e for e in self.employees if e["employees_id"] in self.assignments]
+        day = start
+        while day <= end:
+            attendance = WEEKEND_ATTENDANCE if day.weekday() >= 5 else WEEKDAY_ATTENDANCE
+            for e in staffed:
+                if day < e["active_at"] or (e["inactive_at"] and day >= e["inactive_at"]):
+                    continue
+                if rng.random() >= attendance:
+                    continue
+                for i, p in enumerate(self.assignments[e["employees_id"]]):
+                    if day < p["active_at"] or (p["inactive_at"] and day >= p["inactive_at"]):
+                        continue
+                    if i and rng.random() >= SECONDARY_PROJECT_SHARE:
+                        continue
+                    yield self._task(rng, e, p, day, secondary=bool(i))
+            day += timedelta(days=1)
+
+    @staticmethod
+    def _task(rng: random.Random, e: Dict[str, Any], p: Dict[str, Any], day: date, secondary: bool) -> tuple:
+        share = 0.35 if secondary else 1.0
+        completed = _poisson(rng, 6.0 * e["_productivity"] * share)
+        reviewed = sum(rng.random() < 0.8 for _ in range(completed))
+        rejected = sum(rng.random() < 0.08 for _ in range(reviewed))
+        hours = min(12.0, max(0.5, rng.gauss(7.5 * share, 1.2 * share)))
+        created = _at(day, rng) + timedelta(hours=8)
+        return (
+            e["employees_id"], p["project_id"], day,
+            completed,
+            _poisson(rng, 1.5 * share),
+            sum(rng.random() < 0.1 for _ in range(completed)),
+            reviewed - rejected,
+            rejected,
+            reviewed,
+            Decimal(f"{hours:.2f}"),
+            None if rng.random() < 0.7 else f"Worked on {p['project_name']} batch {rng.randint(1, 400)}",
+            created,
+            created,
+        )
+
+
+TASK_COLUMNS = (
+    "employees_id", "project_id", "task_date",
+    "task_completed", "task_inprogress", "task_reworked",
+    "task_approved", "task_rejected", "task_reviewed",
+    "hours_logged", "description", "created_at", "updated_at",
+)
+SEEDED_TABLES = ("task_daily_rollup", "task_monitors", "project_staffing", "projects", "employees", "roles")
+ROLLUP_TRIGGERS = ("trg_task_monitors_rollup_ins", "trg_task_monitors_rollup_upd", "trg_task_monitors_rollup_del")
+
+
+def _rows(items: List[Dict[str, Any]], columns: Sequence[str]) -> List[tuple]:
+    return [tuple(item.get(c) for c in columns) for item in items]
+
+
+async def seed_dummy_data(
+    employees_count: int = 5000,
+    projects_count: int = 60,
+    days: int = 730,
+    seed: int = 42,
+    end_date: Optional[date] = None,
+    truncate: bool = False,
+    chunk_size: int = 50_000,
+) -> Dict[str, Any]:
+    """
+    Load a reproducible data set; ~1.1M task rows with the defaults (more: raise employees_count or days).
+    Refuses to run on a non-empty database unless `truncate` is set (which empties the
+    seeded tables first; users are left alone). task_daily_rollup is rebuilt once at the
+    end instead of row by row through its triggers.
+    """
+    rng = random.Random(seed)
+    end = end_date or date.today()
+    start = end - timedelta(days=days - 1)
+    started = time.perf_counter()
+    plan = _Plan(rng, employees_count, projects_count, start, end)
+
+    employee_columns = [c.name for c in employees.columns if c.name != "updated_at"]
+    project_columns = [c.name for c in projects.columns if c.name != "updated_at"]
+    staffing_columns = [c.name for c in project_staffing.columns if c.name not in ("id", "updated_at")]
+    tasks = 0
+
+    async with database.transaction():
+        if truncate:
+            await database.execute(text(f"TRUNCATE {', '.join(SEEDED_TABLES)} RESTART IDENTITY CASCADE"))
+        elif await database.fetch_val(text("SELECT EXISTS (SELECT 1 FROM employees)")):
+            raise RuntimeError("employees is not empty; pass truncate=True (--truncate) to replace the data")
+
+        await copy_records(roles, ("role_id", "role_name"), [(r[0], r[1]) for r in plan.roles])
+        await copy_records(employees, employee_columns, _rows(plan.employees, employee_columns))
+        await copy_records(projects, project_columns, _rows(plan.projects, project_columns))
+        # explicit ids were copied in: move the identity past them
+        await database.execute(text(
+            "SELECT setval(pg_get_serial_sequence('projects', 'project_id'), "
+            "(SELECT coalesce(max(project_id), 100) FROM projects))"
+        ))
+        await copy_records(project_staffing, staffing_columns, _rows(plan.staffing, staffing_columns))
+
+        for trigger in ROLLUP_TRIGGERS:
+            await database.execute(text(f"ALTER TABLE task_monitors DISABLE TRIGGER {trigger}"))
+        chunk: List[tuple] = []
+        for row in plan.task_rows(rng, start, end):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                await copy_records(task_monitors, TASK_COLUMNS, chunk)
+                tasks += len(chunk)
+                chunk = []
+        if chunk:
+            await copy_records(task_monitors, TASK_COLUMNS, chunk)
+            tasks += len(chunk)
+        for trigger in ROLLUP_TRIGGERS:
+            await database.execute(text(f"ALTER TABLE task_monitors ENABLE TRIGGER {trigger}"))
+
+    rollup_rows = await DashboardCurdOperation.rebuild_daily_rollup()
+    await database.execute(text(f"ANALYZE {', '.join(SEEDED_TABLES)}"))
+
+    return {
+        "seed": seed,
+        "date_range": f"{start.isoformat()}..{end.isoformat()}",
+        "roles": len(plan.roles),
+        "employees": len(plan.employees),
+        "projects": len(plan.projects),
+        "project_staffing": len(plan.staffing),
+        "task_monitors": tasks,
+        "task_daily_rollup": rollup_rows,
+        "seconds": round(time.perf_counter() - started, 1),
+    }
@@ -0,0 +1,240 @@
+# serve.py
+#
+# Multi-process server: imports the app once, binds the listening socket once, then forks
+# N uvicorn workers that accept on the shared socket.
+#
+#   python -m serve [--workers 8] [--port 8000] [--db-connections 80]
+#
+#   SIGHUP           rolling restart: each replacement must be ready before its predecessor
+#                    drains (in-flight requests finish, up to --graceful-timeout)
+#   SIGTERM / ^C     graceful stop of every worker, then exit
+#
+# Workers that die are respawned (with backoff if they die during start-up). The preloaded
+# app is re-forked on restart, so code changes need a full stop/start of the master.
+import argparse
+import logging
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Dict, Optional
+
+import uvicorn
+
+import worker_status
+from config import settings
+
+logger = logging.getLogger("serve")
+
+READY_TIMEOUT_SECONDS = 60.0          # a replacement worker must connect to the DB within this
+CRASH_WINDOW_SECONDS = 10.0           # dying sooner than this after spawn counts as a boot failure
+MAX_BACKOFF_SECONDS = 30.0
+
+
+def split_pool_budget(workers: int, budget: Optional[int]) -> int:
+    """Per-worker DB_POOL_MAX_SIZE so that workers × pool size stays within `budget`."""
+    if budget is None:
+        return settings.DB_POOL_MAX_SIZE
+    per_worker = budget // workers
+    if per_worker < 1:
+        raise SystemExit(f"DB connection budget {budget} is smaller than the worker count {workers}")
+    return per_worker
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class Master:
+    def __init__(self, app, sock: socket.socket, workers: int, graceful_timeout: float, log_level: str):
+        self.app = app
+        self.sock = sock
+        self.workers = workers
+        self.graceful_timeout = graceful_timeout
+        self.log_level = log_level
+        self.table = worker_status.WorkerTable(workers)
+        self.children: Dict[int, int] = {}            # pid -> slot (includes draining predecessors)
+        self.respawn_at: Dict[int, float] = {}        # slot -> monotonic time
+        self.backoff: Dict[int, float] = {}
+        self.generation = 0
+        self._stop: Optional[int] = None
+        self._reload = False
+
+    # ───────────────────────── workers ─────────────────────────
+
+    def spawn(self, slot: int) -> int:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                code = self._run_worker(slot)
+            except SystemExit as exc:
+                code = exc.code if isinstance(exc.code, int) else 1
+            except BaseException:
+                logger.exception("worker %d crashed", slot)
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+        self.children[pid] = slot
+        self.table.set(slot, pid=pid, generation=self.generation, spawned_at=time.time(),
+                       ready_at=0, heartbeat=0, requests=0, in_flight=0, pool_size=0, pool_in_use=0)
+        logger.info("worker %d started (pid %d, generation %d)", slot, pid, self.generation)
+        return pid
+
+    def _run_worker(self, slot: int) -> int:
+        for sig in (signal.SIGHUP, signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, signal.SIG_DFL)        # uvicorn installs its own TERM / INT handlers
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)  # restarts are the master's business
+        random.seed()                                 # forked children would share the master's sequence
+        worker_status.attach(self.table, slot)
+        config = uvicorn.Config(
+            self.app,
+            lifespan="on",
+            log_level=self.log_level,
+            timeout_graceful_shutdown=self.graceful_timeout,
+        )
+        server = uvicorn.Server(config)
+        server.run(sockets=[self.sock])
+        return 0 if server.started else 3
+
+    def _current_pid(self, slot: int) -> int:
+        return int(self.table.get(slot, "pid"))
+
+    def _ready(self, slot: int, pid: int) -> bool:
+        return self._current_pid(slot) == pid and self.table.get(slot, "ready_at") > 0
+
+    def reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            slot = self.children.pop(pid, None)
+            if slot is None or self._current_pid(slot) != pid:
+                continue                              # a drained predecessor
+            code = os.waitstatus_to_exitcode(status)
+            if self._stop is not None:
+                continue
+            lived = time.time() - self.table.get(slot, "spawned_at")
+            if lived < CRASH_WINDOW_SECONDS:
+                self.backoff[slot] = min(MAX_BACKOFF_SECONDS, max(1.0, self.backoff.get(slot, 0.5) * 2))
+            else:
+                self.backoff[slot] = 0.0
+            logger.warning("worker %d (pid %d) exited with %s after %.1fs; respawning in %.1fs",
+                           slot, pid, code, lived, self.backoff[slot])
+            self.table.set(slot, pid=0, restarts=self.table.get(slot, "restarts") + 1)
+            self.respawn_at[slot] = time.monotonic() + self.backoff[slot]
+
+    def respawn_due(self) -> None:
+        now = time.monotonic()
+        for slot, at in list(self.respawn_at.items()):
+            if at <= now:
+                del self.respawn_at[slot]
+                self.spawn(slot)
+
+    def rolling_restart(self) -> None:
+        self.generation += 1
+        logger.info("rolling restart to generation %d", self.generation)
+        for slot in range(self.workers):
+            old = self._current_pid(slot)
+            previous = {field: self.table.get(slot, field) for field in ("generation", "spawned_at", "ready_at")}
+            new = self.spawn(slot)
+            deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+            while not self._ready(slot, new):
+                self.reap()
+                if self._stop is not None:
+                    return
+                if new not in self.children or time.monotonic() > deadline:
+                    logger.error("worker %d replacement (pid %d) did not become ready; keeping pid %d", slot, new, old)
+                    if new in self.children:
+                        os.kill(new, signal.SIGKILL)
+                    if old:
+                        self.table.set(slot, pid=old, **previous)
+                        self.respawn_at.pop(slot, None)
+                    return
+                time.sleep(0.1)
+            if old:
+                os.kill(old, signal.SIGTERM)          # stops accepting; drains in-flight requests
+        logger.info("rolling restart done")
+
+    # ───────────────────────── master loop ─────────────────────────
+
+    def _on_stop(self, sig, frame) -> None:
+        self._stop = sig
+
+    def _on_reload(self, sig, frame) -> None:
+        self._reload = True
+
+    def run(self) -> int:
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_reload)
+        for slot in range(self.workers):
+            self.spawn(slot)
+        while self._stop is None:
+            self.reap()
+            self.respawn_due()
+            if self._reload:
+                self._reload = False
+                self.rolling_restart()
+            time.sleep(0.2)
+        return self.shutdown()
+
+    def shutdown(self) -> int:
+        logger.info("stopping %d worker(s)", len(self.children))
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + self.graceful_timeout + 5
+        while self.children and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in list(self.children):
+            logger.error("worker pid %d did not stop in time; killing", pid)
+            os.kill(pid, signal.SIGKILL)
+        while self.children:
+            pid, _ = os.waitpid(-1, 0)
+            self.children.pop(pid, None)
+        self.sock.close()
+        return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Preforking multi-worker server for main:app")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.WORKERS or os.cpu_count() or 1)
+    parser.add_argument("--db-connections", type=int, default=settings.DB_CONNECTION_BUDGET,
+                        help="total primary-DB connections across all workers (divided evenly)")
+    parser.add_argument("--graceful-timeout", type=float, default=settings.GRACEFUL_TIMEOUT_SECONDS)
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s [serve] %(levelname)s %(message)s")
+
+    # pool options are read from Settings when pg_db is imported: size them before the app import
+    settings.DB_POOL_MAX_SIZE = split_pool_budget(args.workers, args.db_connections)
+    settings.DB_POOL_MIN_SIZE = min(settings.DB_POOL_MIN_SIZE, settings.DB_POOL_MAX_SIZE)
+    from main import app                              # preloaded once, shared copy-on-write by the workers
+
+    sock = bind_socket(args.host, args.port, args.backlog)
+    logger.info("listening on %s:%d with %d worker(s), DB pool %d-%d per worker",
+                args.host, args.port, args.workers, settings.DB_POOL_MIN_SIZE, settings.DB_POOL_MAX_SIZE)
+    return Master(app, sock, args.workers, args.graceful_timeout, args.log_level).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import time
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+
+from sqlalchemy import select
+
+from conditional import table_versions
+from pg_db import database, employees, roles
+
+logger = logging.getLogger(__name__)
+
+# a change to either shows up in the names list
+SOURCE_TABLES = ("employees", "roles")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Case- and accent-insensitive form used for keys and prefixes ("  José  Pérez" → "jose perez")."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+class NameEntry(NamedTuple):
+    employees_id: str
+    full_name: str
+    role: Optional[str]                       # role_id; the name is looked up at read time
+
+
+class EmployeeNameIndex:
+    """
+    Active employees in memory for /api/employees/names, searchable by prefix.
+
+    Each employee is reachable under three normalized keys: "first last", "last first" and
+    the employee id. The keys live in one sorted list with a parallel list of employee ids,
+    so a lookup is a bisect to the first key >= prefix and a walk while keys still start
+    with it. Role names stay in their own dict, so a role rename is a single assignment.
+
+    Writes on this worker apply immediately (upsert / remove / set_role / drop_role). Writes
+    on other workers are caught by run_refresher(), which rebuilds when the employees / roles
+    table versions change.
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._key_ids: List[str] = []
+        self._entries: Dict[str, NameEntry] = {}
+        self._entry_keys: Dict[str, Tuple[str, ...]] = {}
+        self._role_names: Dict[str, str] = {}
+        self._versions: Optional[Dict[str, Any]] = None
+        self._replay: Optional[List[Tuple[str, tuple]]] = None   # local writes seen while a rebuild runs
+        self._rebuilding = asyncio.Lock()
+        self.ready = False
+        self.built_at: Optional[float] = None
+        self.build_ms: Optional[float] = None
+        self.rebuilds = 0
+        self.updates = 0
+        self.lookups = 0
+
+    # ───────────────────────── keys ─────────────────────────
+
+    @staticmethod
+    def _keys_for(entry: NameEntry, first_name: str, last_name: Optional[str]) -> Tuple[str, ...]:
+        first, last = normalize(first_name), normalize(last_name)
+        keys = {normalize(entry.employees_id), f"{first} {last}".strip(), f"{last} {first}".strip()}
+        return tuple(key for key in keys if key)
+
+    def _add_keys(self, employees_id: str, keys: Iterable[str]) -> None:
+        for key in keys:
+            i = bisect_left(self._keys, key)
+            while i < len(self._keys) and self._keys[i] == key and self._key_ids[i] < employees_id:
+                i += 1
+            self._keys.insert(i, key)
+            self._key_ids.insert(i, employees_id)
+
+    def _drop_keys(self, employees_id: str, keys: Iterable[str]) -> None:
+        for key in keys:
+            i = bisect_left(self._keys, key)
+            while i < len(self._keys) and self._keys[i] == key:
+                if self._key_ids[i] == employees_id:
+                    del self._keys[i]
+                    del self._key_ids[i]
+                    break
+                i += 1
+
+    # ───────────────────────── writes ─────────────────────────
+
+    def _apply(self, op: str, *args: Any) -> None:
+        if self._replay is not None:
+            self._replay.append((op, args))
+        getattr(self, f"_{op}")(*args)
+        self.updates += 1
+
+    def upsert(self, row: Mapping[str, Any]) -> None:
+        """Apply an employee row (employees columns); inactive employees are dropped."""
+        self._apply("upsert", dict(row))
+
+    def upsert_many(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """upsert() for a batch (bulk import): one merge and sort instead of a list insert per key."""
+        self._apply("upsert_many", [dict(row) for row in rows])
+
+    def remove(self, employees_id: str) -> None:
+        self._apply("remove", employees_id)
+
+    def set_role(self, role_id: str, role_name: str) -> None:
+        self._apply("set_role", role_id, role_name)
+
+    def drop_role(self, role_id: str) -> None:
+        # employees.role is ON DELETE SET NULL; an unknown role_id reads as no role
+        self._apply("drop_role", role_id)
+
+    @staticmethod
+    def _entry(row: Mapping[str, Any]) -> Tuple[NameEntry, Tuple[str, ...]]:
+        first_name, last_name = row["first_name"], row.get("last_name")
+        full_name = " ".join(part for part in (first_name, last_name) if part)
+        entry = NameEntry(row["employees_id"], full_name, row.get("role"))
+        return entry, EmployeeNameIndex._keys_for(entry, first_name, last_name)
+
+    def _upsert(self, row: Mapping[str, Any]) -> None:
+        self._remove(row["employees_id"])
+        if row.get("status", "1") != "1":
+            return
+        entry, keys = self._entry(row)
+        self._entries[entry.employees_id] = entry
+        self._entry_keys[entry.employees_id] = keys
+        self._add_keys(entry.employees_id, keys)
+
+    def _upsert_many(self, rows: List[Dict[str, Any]]) -> None:
+        changed = {row["employees_id"] for row in rows}
+        pairs = [(key, employees_id) for key, employees_id in zip(self._keys, self._key_ids)
+                 if employees_id not in changed]
+        for employees_id in changed:
+            self._entries.pop(employees_id, None)
+            self._entry_keys.pop(employees_id, None)
+        for row in {row["employees_id"]: row for row in rows}.values():   # last one wins
+            if row.get("status", "1") != "1":
+                continue
+            entry, keys = self._entry(row)
+            self._entries[entry.employees_id] = entry
+            self._entry_keys[entry.employees_id] = keys
+            pairs.extend((key, entry.employees_id) for key in keys)
+        pairs.sort()
+        self._keys = [key for key, _ in pairs]
+        self._key_ids = [employees_id for _, employees_id in pairs]
+
+    def _remove(self, employees_id: str) -> None:
+        if self._entries.pop(employees_id, None) is not None:
+            self._drop_keys(employees_id, self._entry_keys.pop(employees_id, ()))
+
+    def _set_role(self, role_id: str, role_name: str) -> None:
+        self._role_names[role_id] = role_name
+
+    def _drop_role(self, role_id: str) -> None:
+        self._role_names.pop(role_id, None)
+
+    # ───────────────────────── reads ─────────────────────────
+
+    def _item(self, entry: NameEntry) -> Dict[str, Any]:
+        return {
+            "employees_id": entry.employees_id,
+            "full_name": entry.full_name,
+            "role_name": self._role_names.get(entry.role) if entry.role else None,
+        }
+
+    def lookup(self, prefix: str = "", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Employees with a key starting with `prefix`, in key order, each once."""
+        self.lookups += 1
+        prefix = normalize(prefix)
+        keys, key_ids = self._keys, self._key_ids
+        seen = set()
+        out: List[Dict[str, Any]] = []
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            employees_id = key_ids[i]
+            if employees_id not in seen:
+                seen.add(employees_id)
+                out.append(self._item(self._entries[employees_id]))
+                if limit is not None and len(out) >= limit:
+                    break
+            i += 1
+        return out
+
+    # ───────────────────────── loading ─────────────────────────
+
+    async def rebuild(self) -> None:
+        """Reload every active employee and role; local writes made meanwhile are replayed."""
+        async with self._rebuilding:
+            started = time.perf_counter()
+            self._replay = []
+            try:
+                # rows from the primary, like the versions: a lagging replica would pin an old index
+                # under the new versions until the next write
+                versions = await table_versions.get(SOURCE_TABLES)
+                employee_rows = await database.fetch_all(
+                    select(employees.c.employees_id, employees.c.first_name, employees.c.last_name,
+                           employees.c.role, employees.c.status)
+                    .where(employees.c.status == "1")
+                )
+                role_rows = await database.fetch_all(select(roles.c.role_id, roles.c.role_name))
+            finally:
+                replay, self._replay = self._replay, None
+
+            self.load(employee_rows, role_rows)
+            for op, args in replay:
+                getattr(self, f"_{op}")(*args)
+            self._versions = versions
+            self.build_ms = (time.perf_counter() - started) * 1000
+
+    def load(self, employee_rows: Iterable[Mapping[str, Any]], role_rows: Iterable[Mapping[str, Any]]) -> None:
+        """Replace the whole index (synchronously, so readers never see it half-built)."""
+        entries: Dict[str, NameEntry] = {}
+        entry_keys: Dict[str, Tuple[str, ...]] = {}
+        pairs: List[Tuple[str, str]] = []
+        for row in employee_rows:
+            entry, keys = self._entry(dict(row))
+            entries[entry.employees_id] = entry
+            entry_keys[entry.employees_id] = keys
+            pairs.extend((key, entry.employees_id) for key in keys)
+        pairs.sort()
+        self._keys = [key for key, _ in pairs]
+        self._key_ids = [employees_id for _, employees_id in pairs]
+        self._entries, self._entry_keys = entries, entry_keys
+        self._role_names = {row["role_id"]: row["role_name"] for row in role_rows}
+        self.ready = True
+        self.rebuilds += 1
+        self.built_at = time.time()
+
+    async def run_refresher(self, interval: float) -> None:
+        """Build now, then rebuild whenever employees / roles change, checking every `interval` seconds."""
+        while True:
+            try:
+                if not self.ready or await table_versions.get(SOURCE_TABLES) != self._versions:
+                    await self.rebuild()
+            except Exception:
+                logger.exception("Employee name index refresh failed; serving the previous index")
+            await asyncio.sleep(interval)
+
+    # ───────────────────────── metrics ─────────────────────────
+
+    def memory_bytes(self) -> int:
+        """Approximate footprint: the lists and dicts plus every key, id, name and entry they hold."""
+        size = sys.getsizeof
+        total = size(self._keys) + size(self._key_ids) + size(self._entries)
+        total += size(self._entry_keys) + size(self._role_names)
+        total += sum(size(key) for key in self._keys)      # ids in _key_ids are shared with _entries
+        for employees_id, entry in self._entries.items():
+            total += size(employees_id) + size(entry) + size(entry.full_name)
+        total += sum(size(keys) for keys in self._entry_keys.values())
+        total += sum(size(k) + size(v) for k, v in self._role_names.items())
+        return total
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "employees": len(self._entries),
+            "keys": len(self._keys),
+            "roles": len(self._role_names),
+            "memory_bytes": self.memory_bytes(),
+            "rebuilds": self.rebuilds,
+            "build_ms": round(self.build_ms, 2) if self.build_ms is not None else None,
+            "built_seconds_ago": round(time.time() - self.built_at, 1) if self.built_at else None,
+            "incremental_updates": self.updates,
+            "lookups": self.lookups,
+        }
+
+
+employee_names = EmployeeNameIndex()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from multiprocessing.sharedctypes import RawArray
+from typing import Any, Dict, List, Optional
+
+# one row of doubles per worker slot; written by the serve master (pid, generation, restarts)
+# and by the worker itself (everything else)
+FIELDS = ("pid", "generation", "restarts", "spawned_at", "ready_at", "heartbeat",
+          "requests", "in_flight", "pool_size", "pool_in_use")
+HEARTBEAT_SECONDS = 1.0
+STALE_AFTER_SECONDS = 3 * HEARTBEAT_SECONDS
+
+
+class WorkerTable:
+    """
+    Per-worker status in anonymous shared memory, created by `python -m serve` before it
+    forks, so every worker's /healthz can report on all of them. No locking: each field has
+    a single writer and readers only need a recent value.
+    """
+
+    def __init__(self, slots: int):
+        self.slots = slots
+        self._data = RawArray("d", slots * len(FIELDS))
+        self._index = {name: i for i, name in enumerate(FIELDS)}
+
+    def get(self, slot: int, field: str) -> float:
+        return self._data[slot * len(FIELDS) + self._index[field]]
+
+    def set(self, slot: int, **values: float) -> None:
+        base = slot * len(FIELDS)
+        for field, value in values.items():
+            self._data[base + self._index[field]] = value
+
+    def rows(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        rows = []
+        for slot in range(self.slots):
+            row = {field: self.get(slot, field) for field in FIELDS}
+            ready = row["ready_at"] > 0
+            rows.append({
+                "slot": slot,
+                "pid": int(row["pid"]),
+                "generation": int(row["generation"]),
+                "restarts": int(row["restarts"]),
+                "ready": ready,
+                "alive": ready and now - row["heartbeat"] <= STALE_AFTER_SECONDS,
+                "uptime_seconds": round(now - row["ready_at"], 1) if ready else None,
+                "heartbeat_age_seconds": round(now - row["heartbeat"], 1) if ready else None,
+                "requests": int(row["requests"]),
+                "in_flight": int(row["in_flight"]),
+                "pool": {"size": int(row["pool_size"]), "in_use": int(row["pool_in_use"])},
+            })
+        return rows
+
+
+# set in each forked worker by serve.py; None under a plain `uvicorn main:app`
+table: Optional[WorkerTable] = None
+slot: Optional[int] = None
+
+
+def attach(worker_table: WorkerTable, worker_slot: int) -> None:
+    global table, slot
+    table, slot = worker_table, worker_slot
+
+
+async def heartbeat(request_metrics, pool_metrics) -> None:
+    """Publish this worker's counters every HEARTBEAT_SECONDS until cancelled."""
+    pid = os.getpid()
+    table.set(slot, ready_at=time.time())
+    while True:
+        if table.get(slot, "pid") == pid:         # during a rolling restart the slot belongs to the new pid
+            pool = pool_metrics.snapshot()
+            table.set(
+                slot,
+                heartbeat=time.time(),
+                requests=request_metrics.requests_total(),
+                in_flight=request_metrics.in_flight,
+                pool_size=pool.get("size", 0),
+                pool_in_use=pool.get("in_use", 0),
+            )
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+
+
+def snapshot(pool_max_size: int) -> Dict[str, Any]:
+    if table is None:
+        return {}
+    workers = table.rows()
+    return {
+        "worker": {"slot": slot, "pid": os.getpid(), "pool_max_size": pool_max_size},
+        "workers_alive": sum(w["alive"] for w in workers),
+        "workers": workers,
+    }